@@ -42,6 +42,9 @@ hiddenimports = [
     'PIL.Image',
     'jose',
     'dotenv',
+    'orjson',
+    'brotli',
+    'openpyxl',
     # psycopg2 e supabase são opcionais (só necessários se usar PostgreSQL/Supabase)
     # 'psycopg2',
     # 'supabase',
@@ -55,13 +58,30 @@ a = Analysis(
     hiddenimports=hiddenimports + [
         'main',  # Módulo principal da API
         'config',
+        'server',
         'database.database',
         'database.crud',
+        'database.profiler',
         'models.participant',
         'models.event_setting',
+        'models.sync',
         'services.pdf_service',
+        'services.pdf_profiler',
         'services.storage_service',
+        'services.logo_cache',
+        'services.settings_service',
+        'services.import_service',
+        'services.export_service',
+        'services.stats_service',
+        'services.events_service',
+        'services.metrics_service',
         'utils.db_maintenance',
+        'utils.log',
+        'utils.responses',
+        'utils.static_files',
+        'middleware.compression',
+        'middleware.query_profiler',
+        'middleware.timing',
     ],
     hookspath=[],
     hooksconfig={},
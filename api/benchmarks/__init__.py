@@ -0,0 +1 @@
+"""Benchmarks da API (executar a partir de api/: python -m benchmarks.<nome>)"""
@@ -0,0 +1,164 @@
+"""Gerador de participantes sintéticos (com fotos) para benchmarks e testes de carga.
+
+Os dados imitam os reais: nomes e sobrenomes brasileiros, telefones e e-mails
+únicos, bairros repetidos, sacramentos em vários estados, parte com restrições,
+observações e ECC, e ~80% com foto. As fotos são JPEGs gerados (retrato com
+ruído, tamanho parecido com o de uma foto de celular reduzida) e vários
+participantes compartilham o mesmo arquivo. A mesma semente gera os mesmos dados.
+
+Uso (a partir de api/), para popular um banco de desenvolvimento:
+    python -m benchmarks.datagen --count 10000
+    python -m benchmarks.datagen --count 1000 --database-url sqlite:///./dev.db --photos-dir ../data/photos
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+FIRST_NAMES = [
+    "Ana", "Beatriz", "Camila", "Daniela", "Eduarda", "Fernanda", "Gabriela", "Helena", "Isabela", "Júlia",
+    "Larissa", "Maria", "Natália", "Rafaela", "Sofia", "Vitória", "André", "Bruno", "Carlos", "Daniel",
+    "Eduardo", "Felipe", "Gabriel", "Gustavo", "João", "Lucas", "Mateus", "Pedro", "Rafael", "Thiago",
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+]
+NEIGHBORHOODS = [
+    "Centro", "Jardim América", "Vila Nova", "São José", "Boa Vista", "Santa Rita",
+    "Parque das Flores", "Jardim Europa", "Vila Maria", "Santo Antônio",
+]
+CHURCH_MOVEMENTS = ["Pastoral da Juventude", "RCC", "Legião de Maria", "Coroinhas", "Ministério de Música"]
+SACRAMENT_STATUSES = ["Concluído", "Concluído", "Concluído", "Em Processo", "Não Iniciado"]
+RESTRICTIONS = ["Intolerância à lactose", "Alergia a amendoim", "Vegetariano", "Doença celíaca (sem glúten)", "Diabetes"]
+STREETS = ["Rua das Flores", "Av. Brasil", "Rua São Paulo", "Rua XV de Novembro", "Av. Getúlio Vargas", "Rua Sete de Setembro"]
+
+# Tamanho das fotos geradas (px) e quantas fotos distintas
+PHOTO_SIZE = (600, 800)
+DEFAULT_PHOTO_COUNT = 30
+PHOTO_SHARE = 0.8  # fração de participantes com foto
+
+
+def make_photos(directory: Path, count: int = DEFAULT_PHOTO_COUNT, seed: int = 42) -> List[str]:
+    """Grava ``count`` fotos JPEG em ``directory`` e retorna os nomes dos arquivos."""
+    from PIL import Image, ImageDraw
+
+    rnd = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    names = []
+    for _ in range(count):
+        background = tuple(rnd.randint(60, 200) for _ in range(3))
+        img = Image.new("RGB", PHOTO_SIZE, background)
+        draw = ImageDraw.Draw(img)
+        width, height = PHOTO_SIZE
+        skin = tuple(rnd.randint(120, 230) for _ in range(3))
+        draw.ellipse((width * 0.3, height * 0.15, width * 0.7, height * 0.5), fill=skin)
+        draw.ellipse((width * 0.1, height * 0.55, width * 0.9, height * 1.2), fill=tuple(rnd.randint(0, 255) for _ in range(3)))
+        # Ruído: sem ele o JPEG fica pequeno demais para representar uma foto real
+        noise = Image.effect_noise(PHOTO_SIZE, 40).convert("RGB")
+        img = Image.blend(img, noise, 0.25)
+        name = f"{uuid.UUID(int=rnd.getrandbits(128)).hex}.jpg"
+        img.save(directory / name, format="JPEG", quality=85)
+        names.append(name)
+    return names
+
+
+def make_rows(count: int, seed: int = 42, photos: Sequence[str] = (), start: int = 0) -> Iterator[dict]:
+    """Gera ``count`` participantes (dicts no formato de ParticipantCreate) a partir do índice ``start``.
+
+    E-mail e telefone derivam do índice, então continuam únicos entre chamadas com ``start`` diferente.
+    """
+    rnd = random.Random(seed * 1_000_003 + start)
+    for i in range(start, start + count):
+        first, last, other = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES), rnd.choice(LAST_NAMES)
+        statuses = [rnd.choice(SACRAMENT_STATUSES) for _ in range(3)]
+        movement = rnd.choice(CHURCH_MOVEMENTS) if rnd.random() < 0.35 else None
+        restricted = rnd.random() < 0.12
+        ecc = rnd.random() < 0.25
+        yield {
+            "name": f"{first} {other} {last}",
+            "common_name": first if rnd.random() < 0.7 else f"{first[:3]}",
+            "birth_date": date(rnd.randint(1998, 2010), rnd.randint(1, 12), rnd.randint(1, 28)),
+            "instagram": f"@{first.lower()}.{last.lower()}{i}" if rnd.random() < 0.6 else None,
+            "address": f"{rnd.choice(STREETS)}, {rnd.randint(1, 2500)}",
+            "neighborhood": rnd.choice(NEIGHBORHOODS),
+            "email": f"{first.lower()}.{last.lower()}.{i}@example.com",
+            "phone": f"(11) 9{i // 10000 % 10000:04d}-{i % 10000:04d}",
+            "sacraments": f"Batismo: {statuses[0]}, Primeira Eucaristia: {statuses[1]}, Crisma: {statuses[2]}",
+            "church_movement": movement,
+            "church_movement_info": f"Participa há {rnd.randint(1, 6)} anos" if movement else None,
+            "father_name": f"{rnd.choice(FIRST_NAMES[16:])} {last}",
+            "father_contact": f"(11) 9{rnd.randint(1000, 9999)}-{rnd.randint(1000, 9999)}",
+            "mother_name": f"{rnd.choice(FIRST_NAMES[:16])} {last}",
+            "mother_contact": f"(11) 9{rnd.randint(1000, 9999)}-{rnd.randint(1000, 9999)}",
+            "ecc_participant": ecc,
+            "ecc_info": "Pais fizeram o ECC" if ecc else None,
+            "has_restrictions": restricted,
+            "restrictions_info": rnd.choice(RESTRICTIONS) if restricted else None,
+            "observations": "Chega no sábado à tarde" if rnd.random() < 0.1 else None,
+            "photo_path": rnd.choice(photos) if photos and rnd.random() < PHOTO_SHARE else None,
+        }
+
+
+def populate(session_factory, count: int, seed: int = 42, photos: Sequence[str] = (), start: int = 0,
+             chunk_size: int = 2000) -> int:
+    """Insere ``count`` participantes sintéticos (crud.bulk_create_participants, em lotes)."""
+    from database import crud
+
+    rows = make_rows(count, seed=seed, photos=photos, start=start)
+    inserted = 0
+    while True:
+        chunk = [row for _, row in zip(range(chunk_size), rows)]
+        if not chunk:
+            return inserted
+        db = session_factory()
+        try:
+            inserted += crud.bulk_create_participants(db, chunk)
+        finally:
+            db.close()
+
+
+def _next_index(session_factory) -> int:
+    """Índice inicial que não repete e-mail/telefone de participantes já existentes no banco."""
+    from sqlalchemy import func
+    from models.participant import Participant
+
+    db = session_factory()
+    try:
+        return (db.query(func.max(Participant.id)).scalar() or 0) + 1
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=None, help="padrão: DATABASE_URL / .env da aplicação")
+    parser.add_argument("--photos-dir", type=Path, default=None, help="padrão: PHOTOS_DIR da aplicação")
+    parser.add_argument("--photos", type=int, default=DEFAULT_PHOTO_COUNT, help="fotos distintas (0 = sem fotos)")
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from config import settings
+        from database.database import SessionLocal, engine, init_db
+        init_db()
+
+    photos = make_photos(args.photos_dir or settings.PHOTOS_DIR, args.photos, args.seed) if args.photos else []
+    start = _next_index(SessionLocal)
+    inserted = populate(SessionLocal, args.count, seed=args.seed, photos=photos, start=start)
+    print(f"✓ {inserted} participante(s) e {len(photos)} foto(s) gerados em {engine.url.render_as_string(hide_password=True)}")
+
+
+if __name__ == "__main__":
+    main()
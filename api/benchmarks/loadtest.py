@@ -0,0 +1,309 @@
+"""Teste de carga: quantas estações de check-in simultâneas um servidor aguenta.
+
+Sobe a API num processo separado (uvicorn, com --workers), popula o banco com
+participantes sintéticos (benchmarks.datagen) e simula ``--stations`` estações:
+cada uma repete ações sorteadas na proporção de uso de um check-in, com uma pausa
+aleatória entre elas (``--think-time``, média em segundos; 0 = sem pausa):
+
+    list 25, search 25, get 10, create 8, update 5, photo 20, pdf 5, pdf_complete 0
+
+(``--mix "search=50,pdf=10"`` muda os pesos). Ao final mostra, por ação,
+requisições, erros, requisições/s e latência p50/p95/p99, e grava o JSON com o
+número de workers e o banco usados. Os clientes rodam num único processo
+(httpx assíncrono, já instalado como dependência do supabase); se a CPU dele
+chegar a 100%, o limite medido é o do cliente.
+
+Sem --url, o servidor usa um SQLite temporário (ou --database-url, ex: um
+PostgreSQL local de testes) e pastas de dados temporárias. Com --url, testa um
+servidor já em execução (sem popular nem criar nada além das ações do teste).
+
+Uso (a partir de api/):
+    python -m benchmarks.loadtest --stations 10 --duration 30
+    python -m benchmarks.loadtest --stations 50 --workers 4 --participants 10000 --output carga.json
+    python -m benchmarks.loadtest --url http://localhost:8000 --stations 5
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from benchmarks.datagen import NEIGHBORHOODS, make_rows
+from benchmarks.suite import latency_stats
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_MIX = {
+    "list": 25,
+    "search": 25,
+    "get": 10,
+    "create": 8,
+    "update": 5,
+    "photo": 20,
+    "pdf": 5,
+    "pdf_complete": 0,
+}
+SEARCH_TERMS = ["silva", "santos", "ana", "lucas", "centro", "jardim", "9000", "@example.com", "rua"]
+# Índice inicial dos participantes criados no teste (e-mails/telefones não colidem com os populados)
+CREATE_INDEX_START = 50_000_000
+
+
+def _parse_mix(text: str) -> dict:
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, (p.strip() for p in (text or "").split(","))):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Ação desconhecida em --mix: {name} (use {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, default=10, help="estações (clientes) simultâneas")
+    parser.add_argument("--duration", type=float, default=30, help="segundos de teste")
+    parser.add_argument("--ramp-up", type=float, default=2, help="segundos para todas as estações começarem")
+    parser.add_argument("--think-time", type=float, default=0.5, help="pausa média entre ações (s)")
+    parser.add_argument("--mix", default="", help='pesos das ações, ex: "search=50,pdf=10"')
+    parser.add_argument("--workers", type=int, default=1, help="processos do servidor (uvicorn --workers)")
+    parser.add_argument("--participants", type=int, default=2000, help="participantes gerados antes do teste")
+    parser.add_argument("--database-url", default=None, help="padrão: SQLite temporário")
+    parser.add_argument("--url", default=None, help="servidor já em execução (não sobe nem popula)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="padrão: loadtest_<data>.json")
+    return parser.parse_args()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _prepare_data(env: dict, participants: int, seed: int) -> None:
+    """Cria as tabelas, as fotos e os participantes no banco do servidor (antes de subi-lo)."""
+    os.environ.update(env)
+    sys.path.insert(0, str(API_DIR))
+    with contextlib.redirect_stdout(io.StringIO()):
+        from config import settings
+        from database.database import SessionLocal, engine, init_db
+        init_db()
+    from benchmarks.datagen import make_photos, populate
+
+    photos = make_photos(settings.PHOTOS_DIR, seed=seed)
+    populate(SessionLocal, participants, seed=seed, photos=photos, start=1)
+    engine.dispose()
+
+
+def _start_server(env: dict, port: int, workers: int) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        "--no-access-log", "--log-level", "warning",
+        "--timeout-graceful-shutdown", "5",
+    ]
+    return subprocess.Popen(command, cwd=API_DIR, env={**os.environ, **env}, stdout=subprocess.DEVNULL)
+
+
+def _stop_server(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+async def _wait_ready(client: httpx.AsyncClient, process=None, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"Servidor encerrou ao iniciar (código {process.returncode})")
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("Servidor não respondeu a /api/health a tempo")
+
+
+class Scenario:
+    """Ações de uma estação de check-in e os dados compartilhados entre as estações."""
+
+    def __init__(self, ids, photos, seed: int):
+        self.ids = ids
+        self.photos = photos
+        self.new_rows = make_rows(10**7, seed=seed + 1, photos=photos, start=CREATE_INDEX_START)
+
+    async def list(self, client, rnd):
+        skip = rnd.randrange(0, max(len(self.ids) - 100, 1))
+        return await client.get("/api/participants", params={"skip": skip, "limit": 100})
+
+    async def search(self, client, rnd):
+        return await client.get("/api/participants", params={"search": rnd.choice(SEARCH_TERMS), "limit": 50})
+
+    async def get(self, client, rnd):
+        return await client.get(f"/api/participants/{rnd.choice(self.ids)}")
+
+    async def create(self, client, rnd):
+        row = next(self.new_rows)
+        response = await client.post("/api/participants", json={**row, "birth_date": row["birth_date"].isoformat()})
+        if response.status_code == 201:
+            self.ids.append(response.json()["id"])
+        return response
+
+    async def update(self, client, rnd):
+        return await client.put(f"/api/participants/{rnd.choice(self.ids)}", json={"neighborhood": rnd.choice(NEIGHBORHOODS)})
+
+    async def photo(self, client, rnd):
+        return await client.get(f"/api/photos/{rnd.choice(self.photos)}")
+
+    async def pdf(self, client, rnd):
+        return await client.get(f"/api/pdf/participant/{rnd.choice(self.ids)}")
+
+    async def pdf_complete(self, client, rnd):
+        return await client.get("/api/pdf/complete", params={"neighborhood": "Centro"})
+
+
+async def _station(number, client, scenario, mix, deadline, think_time, delay, seed, samples, errors):
+    rnd = random.Random(seed * 7919 + number)
+    names, weights = list(mix), list(mix.values())
+    await asyncio.sleep(delay)
+    while time.perf_counter() < deadline:
+        name = rnd.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await getattr(scenario, name)(client, rnd)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        samples[name].append(time.perf_counter() - started)
+        if failed:
+            errors[name] += 1
+        if think_time:
+            await asyncio.sleep(rnd.expovariate(1 / think_time))
+
+
+async def _run(args, base_url, process) -> dict:
+    mix = _parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.stations + 2, max_keepalive_connections=args.stations + 2)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        await _wait_ready(client, process)
+        # Participantes e fotos usados nas ações: os primeiros 1000 do servidor
+        participants = (await client.get("/api/participants", params={"limit": 1000})).json()["participants"]
+        ids = [p["id"] for p in participants]
+        photos = sorted({p["photo_path"] for p in participants if p.get("photo_path")})
+        if not ids:
+            raise SystemExit("Nenhum participante no servidor: rode sem --url ou popule com benchmarks.datagen")
+        if not photos:
+            mix.pop("photo", None)
+        scenario = Scenario(ids, photos, args.seed)
+
+        samples, errors = defaultdict(list), defaultdict(int)
+        started = time.perf_counter()
+        deadline = started + args.ramp_up + args.duration
+        await asyncio.gather(*(
+            _station(i, client, scenario, mix, deadline, args.think_time,
+                     args.ramp_up * i / args.stations, args.seed, samples, errors)
+            for i in range(args.stations)
+        ))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in mix:
+        if samples[name]:
+            endpoints[name] = {
+                **latency_stats(samples[name]),
+                "errors": errors[name],
+                "requests_per_s": round(len(samples[name]) / elapsed, 2),
+            }
+    total = sum(len(s) for s in samples.values())
+    return {
+        "elapsed_s": round(elapsed, 1),
+        "requests": total,
+        "errors": sum(errors.values()),
+        "requests_per_s": round(total / elapsed, 1),
+        "all": latency_stats([x for s in samples.values() for x in s]) if total else None,
+        "endpoints": endpoints,
+    }
+
+
+def main():
+    args = _parse_args()
+    tmp_dir = tempfile.TemporaryDirectory()
+    process = None
+    database = "externo"
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            tmp = Path(tmp_dir.name)
+            database_url = args.database_url or f"sqlite:///{tmp / 'loadtest.db'}"
+            env = {
+                "DATABASE_URL": database_url,
+                "DATA_DIR": str(tmp / "data"),
+                "PHOTOS_DIR": str(tmp / "data" / "photos"),
+                "PDFS_DIR": str(tmp / "data" / "pdfs"),
+                "BACKUPS_DIR": str(tmp / "data" / "backups"),
+                "LOGO_DIR": str(tmp / "data" / "logo"),
+                "SUPABASE_URL": "",
+                "LOG_LEVEL": "WARNING",
+            }
+            database = database_url.split(":", 1)[0]
+            print(f"Populando {args.participants} participante(s) ({database})...")
+            _prepare_data(env, args.participants, args.seed)
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            print(f"Subindo servidor em {base_url} com {args.workers} worker(s)...")
+            process = _start_server(env, port, args.workers)
+
+        print(f"{args.stations} estação(ões) por {args.duration:.0f}s (pausa média {args.think_time}s)")
+        result = asyncio.run(_run(args, base_url, process))
+    finally:
+        if process is not None:
+            _stop_server(process)
+        tmp_dir.cleanup()
+
+    print(f"\n{'ação':<14} {'req':>7} {'erros':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, r in result["endpoints"].items():
+        print(f"{name:<14} {r['n']:>7} {r['errors']:>6} {r['requests_per_s']:>8.1f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}")
+    if result["all"]:
+        a = result["all"]
+        print(f"{'total':<14} {result['requests']:>7} {result['errors']:>6} {result['requests_per_s']:>8.1f} {a['p50_ms']:>9.1f} {a['p95_ms']:>9.1f} {a['p99_ms']:>9.1f}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "url": args.url,
+            "workers": None if args.url else args.workers,
+            "database": database,
+            "participants": None if args.url else args.participants,
+            "stations": args.stations,
+            "duration_s": args.duration,
+            "think_time_s": args.think_time,
+            "mix": _parse_mix(args.mix),
+        },
+        **result,
+    }
+    output = args.output or Path(f"loadtest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados em {output}")
+
+
+if __name__ == "__main__":
+    main()
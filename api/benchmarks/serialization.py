@@ -0,0 +1,118 @@
+"""Benchmark de serialização e tamanho na rede de ParticipantsListResponse.
+
+Compara o caminho padrão do FastAPI (modelo Pydantic → jsonable_encoder → json)
+com ORJSONResponse, e mede o tamanho do corpo sem compressão, com GZip e Brotli.
+
+Uso (a partir de api/):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --sizes 100 1000 10000 --repeat 5
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from main import ParticipantsListResponse  # noqa: E402
+from models.participant import Participant  # noqa: E402
+from utils.responses import dumps, participants_to_list  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+NEIGHBORHOODS = ["Centro", "Jardim América", "Vila Nova", "São José", "Boa Vista", "Santa Rita"]
+
+
+def make_participants(count: int, seed: int = 42):
+    """Gera participantes (ORM, não persistidos) com dados realistas."""
+    rnd = random.Random(seed)
+    participants = []
+    for i in range(count):
+        participants.append(Participant(
+            id=i + 1,
+            name=f"Participante {i:05d} da Silva",
+            common_name=f"Part {i}",
+            birth_date=date(rnd.randint(1995, 2010), rnd.randint(1, 12), rnd.randint(1, 28)),
+            instagram=f"@participante{i}",
+            address=f"Rua {rnd.randint(1, 300)}, nº {rnd.randint(1, 2000)}",
+            neighborhood=rnd.choice(NEIGHBORHOODS),
+            email=f"participante{i}@example.com",
+            phone=f"(11) 9{rnd.randint(1000, 9999)}-{rnd.randint(1000, 9999)}",
+            sacraments="Batismo:Concluído,Primeira Eucaristia:Concluído,Crisma:Em Processo",
+            church_movement=rnd.choice([None, "Pastoral da Juventude", "RCC"]),
+            father_name=f"Pai {i}",
+            father_contact="(11) 98888-7777",
+            mother_name=f"Mãe {i}",
+            mother_contact="(11) 97777-6666",
+            ecc_participant=rnd.random() < 0.3,
+            has_restrictions=rnd.random() < 0.1,
+            restrictions_info=None,
+            observations=None,
+            photo_path=f"{i:032x}.jpg",
+        ))
+    return participants
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def default_body(participants, total) -> bytes:
+    """Caminho anterior: modelo Pydantic + jsonable_encoder + json.dumps (JSONResponse)."""
+    model = ParticipantsListResponse(participants=participants, total=total)
+    content = jsonable_encoder(model)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_body(participants, total) -> bytes:
+    return dumps({"participants": participants_to_list(participants), "total": total})
+
+
+def run(sizes, repeat: int) -> list:
+    results = []
+    for size in sizes:
+        participants = make_participants(size)
+        default_s = _best_of(lambda: default_body(participants, size), repeat)
+        orjson_s = _best_of(lambda: orjson_body(participants, size), repeat)
+        body = orjson_body(participants, size)
+        row = {
+            "rows": size,
+            "default_ms": round(default_s * 1000, 2),
+            "orjson_ms": round(orjson_s * 1000, 2),
+            "raw_bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, compresslevel=6)),
+            "br_bytes": len(brotli.compress(body, quality=4)) if brotli else None,
+        }
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    print(f"{'linhas':>7} {'padrão ms':>10} {'orjson ms':>10} {'bruto':>10} {'gzip':>9} {'br':>9}")
+    for r in results:
+        br = r["br_bytes"] if r["br_bytes"] is not None else "-"
+        print(f"{r['rows']:>7} {r['default_ms']:>10} {r['orjson_ms']:>10} {r['raw_bytes']:>10} {r['gzip_bytes']:>9} {br:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """Configurações da API"""
 from pydantic_settings import BaseSettings
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 import os
 import sys
 
@@ -24,6 +24,12 @@ class Settings(BaseSettings):
     PORT: int = 8000
     DEBUG: bool = False  # True apenas se definir DEBUG=1 no .env (desenvolvimento)
     
+    # Logging (utils.log): nível padrão, formato "text" ou "json" e nível por módulo,
+    # ex: LOG_LEVELS='{"database.crud": "DEBUG", "services.pdf_service": "DEBUG"}'
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
+    LOG_LEVELS: Dict[str, str] = {}
+    
     # Detectar ambiente
     IS_VERCEL: bool = os.getenv("VERCEL") == "1"
     IS_PRODUCTION: bool = os.getenv("ENVIRONMENT") == "production" or IS_VERCEL
@@ -59,6 +65,56 @@ class Settings(BaseSettings):
     IS_POSTGRES: bool = "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL
     IS_SQLITE: bool = "sqlite" in DATABASE_URL
     
+    # Compressão das respostas HTTP (Brotli se instalado, senão GZip)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes; respostas menores vão sem compressão
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+    
+    # Cache de event_settings: intervalo (s) para conferir a versão no banco e
+    # recarregar se outro processo/worker alterou alguma configuração (0 = desliga)
+    SETTINGS_SYNC_INTERVAL: float = 5.0
+    
+    # Cache de /api/stats: descartado a cada escrita; o TTL (s) limita o atraso
+    # quando outro processo/worker grava (0 = só invalida nas escritas)
+    STATS_CACHE_TTL: float = 30.0
+    
+    # Sincronização incremental: marcas de exclusão mais antigas que isso são apagadas
+    # na inicialização (clientes sem sincronizar há mais tempo recarregam a lista inteira)
+    TOMBSTONE_RETENTION_DAYS: int = 90
+    
+    # Ao encerrar, espera no máximo isso (s) pelas conexões abertas; o canal de
+    # eventos (/api/events) não termina sozinho e prenderia o desligamento
+    GRACEFUL_SHUTDOWN_TIMEOUT: int = 5
+    
+    # Métricas de desempenho em /api/metrics (formato Prometheus): tempo por rota,
+    # consultas ao banco por requisição, páginas de PDF, Storage e caches
+    METRICS_ENABLED: bool = True
+    
+    # Processos do servidor (server.serve): 0 = um por núcleo da CPU (até 4). Com mais de um,
+    # um PDF pesado não trava as outras requisições. Caches, métricas e clientes de
+    # /api/events são por processo; escritas de outros workers chegam aos clientes
+    # pela checagem da versão no banco a cada EVENTS_POLL_INTERVAL s (0 = desliga)
+    WORKERS: int = 0
+    # Reinicia cada worker depois de tantas requisições (libera memória; 0 = nunca)
+    WORKER_MAX_REQUESTS: int = 0
+    EVENTS_POLL_INTERVAL: float = 2.0
+    
+    # Profiler de SQL (database.profiler), para desenvolvimento: loga comandos acima de
+    # SQL_SLOW_QUERY_MS com o plano (EXPLAIN), avisa requisições com mais de
+    # SQL_MAX_QUERIES_PER_REQUEST comandos ou com o mesmo comando repetido (N+1) e, com
+    # SQL_PROFILE_HEADER, devolve X-DB-Queries/Server-Timing em cada resposta
+    SQL_PROFILE: bool = False
+    SQL_SLOW_QUERY_MS: float = 100.0
+    SQL_EXPLAIN_SLOW: bool = True
+    SQL_MAX_QUERIES_PER_REQUEST: int = 20
+    SQL_REPEATED_QUERY_THRESHOLD: int = 5
+    SQL_PROFILE_HEADER: bool = False
+    
+    # Profiler dos PDFs (services.pdf_profiler) em todas as gerações, não só com ?profile=1;
+    # PDF_PROFILE_PSTATS grava também o cProfile do PDF completo (<pdf>.pstats)
+    PDF_PROFILE: bool = False
+    PDF_PROFILE_PSTATS: bool = False
+    
     # Supabase Storage (fotos e logo) - se definido, imagens vão para o Storage e retornam URL pública
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
@@ -1,10 +1,48 @@
 """Operações CRUD para participantes"""
+import logging
 import re
+import unicodedata
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
-from typing import List, Optional
+from functools import lru_cache
+from sqlalchemy import and_, or_, not_, bindparam, func, insert, select, update, delete
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, List, Optional, Set
 from models.participant import Participant as ParticipantModel
-from models.participant import ParticipantCreate, ParticipantUpdate
+from models.participant import ParticipantCreate, ParticipantUpdate, ParticipantFilters
+from models.participant import SACRAMENT_COLUMNS, SACRAMENT_STATUSES, birthday_key
+from models.sync import ParticipantTombstone, SyncCounter
+
+logger = logging.getLogger(__name__)
+
+# Nomes em sync_counters
+PARTICIPANTS_COUNTER = "participants"
+TOMBSTONES_PRUNED_COUNTER = "participants_tombstones_pruned"  # versão até a qual marcas de exclusão foram apagadas
+
+class VersionConflictError(Exception):
+    """O participante foi alterado depois da versão informada pelo cliente (If-Match)."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Participante alterado por outra pessoa (versão atual {current_version})")
+        self.current_version = current_version
+
+
+# Ouvintes chamados após cada escrita confirmada: listener(action, ids, version),
+# com action em "created", "updated" ou "deleted"
+_change_listeners: List[Callable[[str, List[int], int], None]] = []
+
+
+def add_change_listener(listener: Callable[[str, List[int], int], None]) -> None:
+    """Registra uma função chamada (na thread que gravou) após cada commit de participantes."""
+    if listener not in _change_listeners:
+        _change_listeners.append(listener)
+
+
+def _notify(action: str, ids: List[int], version: int) -> None:
+    for listener in list(_change_listeners):
+        try:
+            listener(action, ids, version)
+        except Exception:
+            logger.exception("Erro ao notificar alteração de participantes (%s)", action)
 
 
 def _normalize_phone(phone: Optional[str]) -> Optional[str]:
@@ -15,23 +53,158 @@ def _normalize_phone(phone: Optional[str]) -> Optional[str]:
     return digits if digits else None
 
 
-def get_participants_count(db: Session, search: Optional[str] = None) -> int:
-    """Retorna o total de participantes (com filtro de busca opcional)."""
-    query = db.query(func.count(ParticipantModel.id))
-    if search:
-        search_filter = f"%{search.lower()}%"
-        query = query.filter(
-            or_(
-                ParticipantModel.name.ilike(search_filter),
-                ParticipantModel.common_name.ilike(search_filter),
-                ParticipantModel.email.ilike(search_filter),
-                ParticipantModel.phone.ilike(search_filter),
-                ParticipantModel.instagram.ilike(search_filter),
-                ParticipantModel.address.ilike(search_filter),
-                ParticipantModel.neighborhood.ilike(search_filter),
-            )
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _read_counter(db: Session, name: str) -> int:
+    value = db.query(SyncCounter.version).filter(SyncCounter.name == name).scalar()
+    return value or 0
+
+
+def _next_version(db: Session) -> int:
+    """Incrementa o contador global e retorna a nova versão (dentro da transação atual).
+    O UPDATE trava a linha até o commit, então versões são visíveis na ordem em que foram geradas.
+    """
+    version = db.execute(
+        update(SyncCounter)
+        .where(SyncCounter.name == PARTICIPANTS_COUNTER)
+        .values(version=SyncCounter.version + 1)
+        .returning(SyncCounter.version)
+    ).scalar()
+    if version is None:
+        db.add(SyncCounter(name=PARTICIPANTS_COUNTER, version=1))
+        db.flush()
+        version = 1
+    return version
+
+
+def current_version(db: Session) -> int:
+    """Versão mais recente das alterações de participantes."""
+    return _read_counter(db, PARTICIPANTS_COUNTER)
+
+
+def _plain(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z]", "", text.lower())
+
+
+_SACRAMENT_KEYS = {_plain(name): name for name in SACRAMENT_COLUMNS}
+_SACRAMENT_KEYS.update({"eucaristia": "Primeira Eucaristia", "primeiracomunhao": "Primeira Eucaristia", "confirmacao": "Crisma"})
+_STATUS_KEYS = {_plain(status): status for status in SACRAMENT_STATUSES}
+# Valores antigos do tipo "Batismo:Sim"
+_STATUS_KEYS.update({"sim": "Concluído", "s": "Concluído", "nao": "Não Concluído", "n": "Não Concluído", "emandamento": "Em Processo"})
+
+
+def _sacrament_values(sacraments: Optional[str]) -> dict:
+    """Converte "Sacramento:Status,..." nas colunas tipadas e na string canônica.
+    Status ausente, desconhecido ou "Não Informado" vira None.
+    """
+    statuses = {name: None for name in SACRAMENT_COLUMNS}
+    for entry in (sacraments or "").split(","):
+        name, _, status = entry.partition(":")
+        name = _SACRAMENT_KEYS.get(_plain(name))
+        status = _STATUS_KEYS.get(_plain(status))
+        if name and status != "Não Informado":
+            statuses[name] = status
+    values = {column: statuses[name] for name, column in SACRAMENT_COLUMNS.items()}
+    values["sacraments"] = ",".join(f"{name}:{status}" for name, status in statuses.items() if status) or None
+    return values
+
+
+def _with_derived_values(changes: dict) -> dict:
+    """Copia as alterações acrescentando as colunas derivadas (telefone, aniversário, sacramentos)."""
+    values = dict(changes)
+    if "phone" in values:
+        values["phone_digits"] = _normalize_phone(values["phone"])
+    if "birth_date" in values:
+        values["birthday"] = birthday_key(values["birth_date"])
+    if "sacraments" in values:
+        values.update(_sacrament_values(values["sacraments"]))
+    return values
+
+
+def _apply_search(query, search: Optional[str]):
+    """Aplica o filtro de busca textual (nome, apelido, e-mail, telefone, instagram, endereço, bairro)."""
+    if not search:
+        return query
+    search_filter = f"%{search.lower()}%"
+    return query.filter(
+        or_(
+            ParticipantModel.name.ilike(search_filter),
+            ParticipantModel.common_name.ilike(search_filter),
+            ParticipantModel.email.ilike(search_filter),
+            ParticipantModel.phone.ilike(search_filter),
+            ParticipantModel.instagram.ilike(search_filter),
+            ParticipantModel.address.ilike(search_filter),
+            ParticipantModel.neighborhood.ilike(search_filter),
         )
-    return query.scalar() or 0
+    )
+
+
+def _years_ago(today: date, years: int) -> date:
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:  # 29/02 em ano não bissexto
+        return today.replace(year=today.year - years, day=28)
+
+
+def _birthday_window_clause(start: date, end: date):
+    """Aniversários entre start e end (inclusive), comparando o MMDD indexado; trata a virada de ano."""
+    if (end - start).days >= 365:
+        return ParticipantModel.birthday.isnot(None)
+    first, last = birthday_key(start), birthday_key(end)
+    if first <= last:
+        return ParticipantModel.birthday.between(first, last)
+    # Ex: 28/12 a 03/01
+    return or_(ParticipantModel.birthday >= first, ParticipantModel.birthday <= last)
+
+
+def _apply_filters(query, filters: Optional[ParticipantFilters]):
+    """Compila os filtros estruturados em predicados SQL (colunas indexadas em init_db)."""
+    if filters is None:
+        return query
+    query = _apply_search(query, filters.search)
+    if filters.neighborhood:
+        wanted = [n.strip().lower() for n in filters.neighborhood if n and n.strip()]
+        if wanted:
+            query = query.filter(func.lower(ParticipantModel.neighborhood).in_(wanted))
+    if filters.min_age is not None or filters.max_age is not None:
+        reference = filters.age_on or date.today()
+        query = query.filter(ParticipantModel.birth_date.isnot(None))
+        if filters.min_age is not None:
+            # idade >= min_age ⇔ nasceu em ou antes de (referência - min_age anos): faixa no índice de birth_date
+            query = query.filter(ParticipantModel.birth_date <= _years_ago(reference, filters.min_age))
+        if filters.max_age is not None:
+            query = query.filter(ParticipantModel.birth_date > _years_ago(reference, filters.max_age + 1))
+    if filters.birthday_from or filters.birthday_to:
+        start = filters.birthday_from or filters.birthday_to
+        end = filters.birthday_to or filters.birthday_from
+        query = query.filter(_birthday_window_clause(start, end))
+    if filters.ecc_participant is not None:
+        query = query.filter(ParticipantModel.ecc_participant == filters.ecc_participant)
+    if filters.has_restrictions is not None:
+        query = query.filter(ParticipantModel.has_restrictions == filters.has_restrictions)
+    if filters.church_movement:
+        query = query.filter(func.lower(ParticipantModel.church_movement) == filters.church_movement.strip().lower())
+    if filters.has_church_movement is not None:
+        has_movement = and_(ParticipantModel.church_movement.isnot(None), ParticipantModel.church_movement != "")
+        query = query.filter(has_movement if filters.has_church_movement else not_(has_movement))
+    if filters.sacrament:
+        column = getattr(ParticipantModel, SACRAMENT_COLUMNS[filters.sacrament])
+        status = filters.sacrament_status or "Concluído"
+        query = query.filter(column.is_(None) if status == "Não Informado" else column == status)
+    return query
+
+
+def get_participants_count(
+    db: Session,
+    search: Optional[str] = None,
+    filters: Optional[ParticipantFilters] = None
+) -> int:
+    """Retorna o total de participantes (com busca e filtros opcionais)."""
+    query = _apply_search(db.query(func.count(ParticipantModel.id)), search)
+    return _apply_filters(query, filters).scalar() or 0
 
 
 def participant_exists_with_email(
@@ -40,7 +213,8 @@ def participant_exists_with_email(
     """Verifica se já existe participante com o e-mail (ignorando exclude_id na edição)."""
     if not email or not str(email).strip():
         return False
-    q = db.query(ParticipantModel).filter(ParticipantModel.email.ilike(str(email).strip()))
+    # lower(email) usa o índice ix_participants_email_lower
+    q = db.query(ParticipantModel.id).filter(func.lower(ParticipantModel.email) == str(email).strip().lower())
     if exclude_id is not None:
         q = q.filter(ParticipantModel.id != exclude_id)
     return q.first() is not None
@@ -53,119 +227,186 @@ def participant_exists_with_phone(
     normalized = _normalize_phone(phone)
     if not normalized:
         return False
-    # Buscar participantes cujo telefone normalizado coincide
-    all_with_phone = db.query(ParticipantModel).filter(
-        ParticipantModel.phone.isnot(None),
-        ParticipantModel.phone != ""
-    ).all()
-    for p in all_with_phone:
-        # Obter o valor real do telefone (não o objeto Column)
-        p_phone_value = getattr(p, 'phone', None)
-        if p_phone_value is None:
-            continue
-        # Converter para string explícita
-        p_phone_str = str(p_phone_value) if p_phone_value else None
-        if not p_phone_str:
-            continue
-        # Normalizar e comparar
-        p_normalized = _normalize_phone(p_phone_str)
-        if p_normalized and p_normalized == normalized:
-            # Verificar exclude_id usando comparação explícita
-            p_id_value = getattr(p, 'id', None)
-            if exclude_id is None:
-                return True
-            # Comparar IDs explicitamente
-            if p_id_value is not None:
-                if p_id_value != exclude_id:
-                    return True
-    return False
+    # phone_digits é indexado: busca direta em vez de varrer todos os telefones
+    q = db.query(ParticipantModel.id).filter(ParticipantModel.phone_digits == normalized)
+    if exclude_id is not None:
+        q = q.filter(ParticipantModel.id != exclude_id)
+    return q.first() is not None
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def existing_emails(db: Session, emails: Iterable[str], chunk_size: int = 500) -> Set[str]:
+    """Retorna (em minúsculas) quais dos e-mails já estão cadastrados, em consultas IN por lote."""
+    wanted = sorted({e.strip().lower() for e in emails if e and e.strip()})
+    found: Set[str] = set()
+    for chunk in _chunks(wanted, chunk_size):
+        rows = db.query(func.lower(ParticipantModel.email)).filter(
+            func.lower(ParticipantModel.email).in_(chunk)
+        ).all()
+        found.update(row[0] for row in rows)
+    return found
+
+
+def existing_phones(db: Session, phones: Iterable[str], chunk_size: int = 500) -> Set[str]:
+    """Retorna quais telefones (só dígitos) já estão cadastrados, em consultas IN por lote."""
+    wanted = sorted({p for p in (_normalize_phone(x) for x in phones) if p})
+    found: Set[str] = set()
+    for chunk in _chunks(wanted, chunk_size):
+        rows = db.query(ParticipantModel.phone_digits).filter(
+            ParticipantModel.phone_digits.in_(chunk)
+        ).all()
+        found.update(row[0] for row in rows)
+    return found
+
+
+def bulk_create_participants(db: Session, rows: List[dict]) -> int:
+    """Insere vários participantes (dicts de ParticipantCreate) em um único executemany e faz commit."""
+    if not rows:
+        return 0
+    version, now = _next_version(db), _utcnow()
+    for row in rows:
+        row["row_version"], row["updated_at"] = version, now
+        row["phone_digits"] = _normalize_phone(row.get("phone"))
+        row["birthday"] = birthday_key(row.get("birth_date"))
+        row.update(_sacrament_values(row.get("sacraments")))
+    is_sqlite = db.bind.dialect.name == "sqlite"
+    if is_sqlite:
+        last_id = db.query(func.max(ParticipantModel.id)).scalar() or 0
+    db.execute(insert(ParticipantModel), rows)
+    if is_sqlite:
+        # Como em create_participant: o SQLite pode reaproveitar ids de excluídos, e os novos ids
+        # ficam logo acima do maior anterior; as marcas de exclusão desses ids não valem mais
+        db.execute(delete(ParticipantTombstone).where(
+            ParticipantTombstone.participant_id > last_id,
+            ParticipantTombstone.participant_id <= db.query(func.max(ParticipantModel.id)).scalar_subquery(),
+        ))
+    db.commit()
+    _notify("created", [], version)
+    return len(rows)
 
 
 def get_participants(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    filters: Optional[ParticipantFilters] = None
 ) -> List[ParticipantModel]:
-    """Lista participantes com paginação e busca"""
-    query = db.query(ParticipantModel)
-    
-    if search:
-        search_filter = f"%{search.lower()}%"
-        query = query.filter(
-            or_(
-                ParticipantModel.name.ilike(search_filter),
-                ParticipantModel.common_name.ilike(search_filter),
-                ParticipantModel.email.ilike(search_filter),
-                ParticipantModel.phone.ilike(search_filter),
-                ParticipantModel.instagram.ilike(search_filter),
-                ParticipantModel.address.ilike(search_filter),
-                ParticipantModel.neighborhood.ilike(search_filter),
-            )
-        )
-    
+    """Lista participantes com paginação, busca e filtros estruturados"""
+    query = _apply_filters(_apply_search(db.query(ParticipantModel), search), filters)
     return query.order_by(ParticipantModel.name).offset(skip).limit(limit).all()
 
 
+def iter_participants(
+    db: Session,
+    search: Optional[str] = None,
+    batch_size: int = 500,
+    filters: Optional[ParticipantFilters] = None
+) -> Iterator[ParticipantModel]:
+    """Percorre todos os participantes (ordenados por nome) em lotes, com cursor no servidor.
+    Memória constante: yield_per busca batch_size linhas por vez (stream_results no PostgreSQL).
+    """
+    stmt = _apply_filters(_apply_search(select(ParticipantModel), search), filters).order_by(ParticipantModel.name, ParticipantModel.id)
+    return iter(db.execute(stmt.execution_options(yield_per=batch_size)).scalars())
+
+
+def get_restrictions_report(db: Session, filters: Optional[ParticipantFilters] = None) -> list:
+    """Participantes com restrição alimentar/alergia (para a cozinha), ordenados por nome.
+    Busca só as colunas do relatório, usando o índice de has_restrictions.
+    """
+    query = db.query(
+        ParticipantModel.id,
+        ParticipantModel.name,
+        ParticipantModel.common_name,
+        ParticipantModel.restrictions_info,
+    ).filter(ParticipantModel.has_restrictions.is_(True))
+    return _apply_filters(query, filters).order_by(ParticipantModel.name, ParticipantModel.id).all()
+
+
 def get_participant(db: Session, participant_id: int) -> Optional[ParticipantModel]:
     """Obtém um participante por ID"""
     return db.query(ParticipantModel).filter(ParticipantModel.id == participant_id).first()
 
 
+@lru_cache(maxsize=1)
+def _insert_returning_stmt():
+    """INSERT ... RETURNING com os valores como parâmetros de execução: o comando é sempre o mesmo
+    e o SQLAlchemy reaproveita a compilação (com .values(**dados) o cache é recalculado a cada escrita).
+    """
+    return insert(ParticipantModel).returning(ParticipantModel)
+
+
+@lru_cache(maxsize=256)
+def _update_returning_stmt(columns: frozenset, check_version: bool):
+    """UPDATE ... WHERE id = :_id [AND row_version IN :_versions] RETURNING, um por conjunto de colunas."""
+    stmt = update(ParticipantModel).where(ParticipantModel.id == bindparam("_id"))
+    if check_version:
+        stmt = stmt.where(ParticipantModel.row_version.in_(bindparam("_versions", expanding=True)))
+    return (
+        stmt.values({column: bindparam(column) for column in sorted(columns)})
+        .returning(ParticipantModel)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _commit_detached(db: Session, db_participant: ParticipantModel) -> None:
+    """Faz commit mantendo os valores devolvidos pelo RETURNING.
+    O objeto sai da sessão antes do commit, que senão expiraria os atributos (e o próximo acesso faria um SELECT).
+    """
+    db.expunge(db_participant)
+    db.commit()
+
+
 def create_participant(db: Session, participant: ParticipantCreate) -> ParticipantModel:
     """Cria um novo participante"""
     data = participant.model_dump()
-    print(f"🔍 Debug - Criando participante com dados:")
-    print(f"   birth_date: {repr(data.get('birth_date'))}")
-    print(f"   email: {repr(data.get('email'))}")
-    print(f"   phone: {repr(data.get('phone'))}")
-    print(f"   father_contact: {repr(data.get('father_contact'))}")
-    print(f"   mother_contact: {repr(data.get('mother_contact'))}")
-    
-    db_participant = ParticipantModel(**data)
-    db.add(db_participant)
-    db.commit()
-    db.refresh(db_participant)
-    
-    print(f"🔍 Debug - Participante criado no banco:")
-    print(f"   birth_date: {repr(db_participant.birth_date)}")
-    print(f"   email: {repr(db_participant.email)}")
-    print(f"   phone: {repr(db_participant.phone)}")
-    
+    values = _with_derived_values(data)
+    values["row_version"], values["updated_at"] = _next_version(db), _utcnow()
+    # INSERT ... RETURNING: a linha gravada (com id) volta no mesmo comando, sem refresh depois
+    db_participant = db.scalar(_insert_returning_stmt(), values)
+    if db.bind.dialect.name == "sqlite":
+        # SQLite pode reaproveitar o id de um participante excluído: a marca de exclusão antiga não vale mais
+        db.query(ParticipantTombstone).filter(ParticipantTombstone.participant_id == db_participant.id).delete()
+    _commit_detached(db, db_participant)
+    _notify("created", [db_participant.id], db_participant.row_version)
+    logger.debug("Participante %s criado (versão %s)", db_participant.id, db_participant.row_version)
     return db_participant
 
 
 def update_participant(
     db: Session,
     participant_id: int,
-    participant: ParticipantUpdate
+    participant: ParticipantUpdate,
+    expected_versions: Optional[Set[int]] = None
 ) -> Optional[ParticipantModel]:
-    """Atualiza um participante"""
-    db_participant = get_participant(db, participant_id)
-    if not db_participant:
-        return None
-    
+    """Atualiza um participante com um único UPDATE ... WHERE id = :id (sem carregar a linha antes).
+
+    Com ``expected_versions`` (If-Match) o UPDATE também exige ``row_version IN (...)``: se outra
+    pessoa gravou antes, nada é alterado e VersionConflictError traz a versão atual.
+    Retorna None se o participante não existe.
+    """
     update_data = participant.model_dump(exclude_unset=True)
-    print(f"🔍 Debug - Atualizando participante {participant_id} com dados:")
-    print(f"   Campos recebidos: {list(update_data.keys())}")
-    print(f"   birth_date: {repr(update_data.get('birth_date'))}")
-    print(f"   email: {repr(update_data.get('email'))}")
-    print(f"   phone: {repr(update_data.get('phone'))}")
-    print(f"   father_contact: {repr(update_data.get('father_contact'))}")
-    print(f"   mother_contact: {repr(update_data.get('mother_contact'))}")
-    
-    for field, value in update_data.items():
-        print(f"   Atualizando {field}: {repr(getattr(db_participant, field, None))} -> {repr(value)}")
-        setattr(db_participant, field, value)
-    
-    db.commit()
-    db.refresh(db_participant)
-    
-    print(f"🔍 Debug - Participante atualizado no banco:")
-    print(f"   birth_date: {repr(db_participant.birth_date)}")
-    print(f"   email: {repr(db_participant.email)}")
-    print(f"   phone: {repr(db_participant.phone)}")
-    
+    values = _with_derived_values(update_data)
+    values["row_version"], values["updated_at"] = _next_version(db), _utcnow()
+    params = dict(values, _id=participant_id)
+    if expected_versions is not None:
+        params["_versions"] = list(expected_versions)
+    # UPDATE ... RETURNING: grava e devolve a linha atualizada em um único comando
+    db_participant = db.scalar(_update_returning_stmt(frozenset(values), expected_versions is not None), params)
+    if db_participant is None:
+        db.rollback()  # desfaz também o incremento do contador de versões
+        current = db.query(ParticipantModel.row_version).filter(ParticipantModel.id == participant_id).scalar()
+        if current is None:
+            return None
+        raise VersionConflictError(current)
+    _commit_detached(db, db_participant)
+    _notify("updated", [participant_id], values["row_version"])
+    # Só os nomes dos campos: os valores são dados pessoais
+    logger.debug("Participante %s atualizado (versão %s): %s", participant_id, values["row_version"], sorted(update_data))
     return db_participant
 
 
@@ -176,5 +417,106 @@ def delete_participant(db: Session, participant_id: int) -> bool:
         return False
     
     db.delete(db_participant)
+    version = _add_tombstones(db, [participant_id])
     db.commit()
+    _notify("deleted", [participant_id], version)
     return True
+
+
+def bulk_update_participants(db: Session, participant_ids: List[int], changes: dict) -> int:
+    """Aplica as mesmas alterações a vários participantes com um único UPDATE ... WHERE id IN.
+    Retorna quantas linhas foram alteradas.
+    """
+    ids = sorted(set(participant_ids))
+    values = _with_derived_values(changes)
+    values["row_version"], values["updated_at"] = _next_version(db), _utcnow()
+    result = db.execute(
+        update(ParticipantModel)
+        .where(ParticipantModel.id.in_(ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if result.rowcount:
+        _notify("updated", ids, values["row_version"])
+    return result.rowcount or 0
+
+
+def bulk_delete_participants(db: Session, participant_ids: List[int]) -> int:
+    """Exclui vários participantes com um único DELETE ... WHERE id IN. Retorna quantos foram excluídos."""
+    ids = sorted(set(participant_ids))
+    existing = [row[0] for row in db.query(ParticipantModel.id).filter(ParticipantModel.id.in_(ids)).all()]
+    if not existing:
+        return 0
+    result = db.execute(
+        delete(ParticipantModel)
+        .where(ParticipantModel.id.in_(existing))
+        .execution_options(synchronize_session=False)
+    )
+    version = _add_tombstones(db, existing)
+    db.commit()
+    _notify("deleted", existing, version)
+    return result.rowcount or 0
+
+
+def _add_tombstones(db: Session, participant_ids: List[int]) -> int:
+    """Registra (ou atualiza) as marcas de exclusão, todas com uma nova versão (retornada)."""
+    version, now = _next_version(db), _utcnow()
+    db.execute(delete(ParticipantTombstone).where(ParticipantTombstone.participant_id.in_(participant_ids)))
+    db.execute(
+        insert(ParticipantTombstone),
+        [{"participant_id": pid, "row_version": version, "deleted_at": now} for pid in participant_ids],
+    )
+    return version
+
+
+def get_changes(db: Session, since: int, limit: int = 500) -> dict:
+    """Alterações com versão maior que ``since``: participantes criados/alterados e ids excluídos.
+
+    Retorna ``version`` (cursor para a próxima chamada) e ``has_more``. Uma versão nunca é dividida
+    entre páginas (ex: importação em lote), então a página pode passar de ``limit``.
+    ``reset`` indica que marcas de exclusão posteriores a ``since`` já foram apagadas: o cliente
+    deve recarregar a lista inteira.
+    """
+    latest = current_version(db)
+    query = db.query(ParticipantModel).filter(ParticipantModel.row_version > since)
+    rows = query.order_by(ParticipantModel.row_version, ParticipantModel.id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    cursor = latest
+    if has_more:
+        boundary = rows[limit].row_version
+        rows = [row for row in rows[:limit] if row.row_version < boundary]
+        if not rows:
+            rows = query.filter(ParticipantModel.row_version == boundary).order_by(ParticipantModel.id).all()
+        cursor = rows[-1].row_version
+    deleted = [
+        row[0] for row in db.query(ParticipantTombstone.participant_id)
+        .filter(ParticipantTombstone.row_version > since, ParticipantTombstone.row_version <= cursor)
+        .order_by(ParticipantTombstone.row_version)
+        .all()
+    ]
+    return {
+        "version": cursor,
+        "participants": rows,
+        "deleted": deleted,
+        "has_more": has_more,
+        "reset": since < _read_counter(db, TOMBSTONES_PRUNED_COUNTER),
+    }
+
+
+def prune_tombstones(db: Session, older_than_days: int) -> int:
+    """Apaga marcas de exclusão antigas e registra até qual versão elas foram apagadas."""
+    cutoff = _utcnow() - timedelta(days=older_than_days)
+    pruned_version = db.query(func.max(ParticipantTombstone.row_version)).filter(
+        ParticipantTombstone.deleted_at < cutoff
+    ).scalar()
+    if not pruned_version:
+        return 0
+    result = db.execute(delete(ParticipantTombstone).where(ParticipantTombstone.row_version <= pruned_version))
+    counter = db.get(SyncCounter, TOMBSTONES_PRUNED_COUNTER)
+    if counter is None:
+        db.add(SyncCounter(name=TOMBSTONES_PRUNED_COUNTER, version=pruned_version))
+    else:
+        counter.version = max(counter.version, pruned_version)
+    db.commit()
+    return result.rowcount or 0
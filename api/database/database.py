@@ -53,6 +53,16 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
         cursor.execute("PRAGMA mmap_size=268435456")  # Memory-mapped I/O (256MB)
         cursor.close()
 
+# Índices criados em init_db: (nome, expressão). lower(...) casa com os filtros sem diferenciar maiúsculas
+PARTICIPANT_INDEXES = [
+    ("ix_participants_email_lower", "lower(email)"),
+    ("ix_participants_neighborhood_lower", "lower(neighborhood)"),
+    ("ix_participants_church_movement_lower", "lower(church_movement)"),
+    ("ix_participants_birth_date", "birth_date"),
+    ("ix_participants_ecc_participant", "ecc_participant"),
+    ("ix_participants_has_restrictions", "has_restrictions"),
+]
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -87,10 +97,23 @@ def optimize_database():
         print(f"⚠ Aviso ao otimizar banco de dados: {e}")
 
 
+def checkpoint_wal():
+    """Incorpora o WAL ao arquivo do banco (SQLite); chamado ao encerrar o servidor."""
+    if not IS_SQLITE:
+        return
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        engine.dispose()
+    except Exception as e:
+        print(f"⚠ Aviso ao consolidar o WAL do SQLite: {e}")
+
+
 def init_db():
     """Inicializa o banco de dados criando as tabelas e aplicando migrações"""
     from models.participant import Participant
     from models.event_setting import EventSetting
+    from models.sync import SyncCounter, ParticipantTombstone
     
     # Criar todas as tabelas se não existirem
     Base.metadata.create_all(bind=engine)
@@ -115,6 +138,105 @@ def init_db():
             except Exception as e:
                 print(f"⚠ Aviso ao adicionar coluna 'church_movement_info': {e}")
         
+        # Migração: coluna phone_digits (telefone só com dígitos, indexada) para checar duplicados
+        if 'phone_digits' not in columns:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("ALTER TABLE participants ADD COLUMN phone_digits VARCHAR"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_participants_phone_digits ON participants (phone_digits)"))
+                    rows = conn.execute(text("SELECT id, phone FROM participants WHERE phone IS NOT NULL AND phone != ''")).fetchall()
+                    from database.crud import _normalize_phone
+                    updates = [{"id": row[0], "digits": _normalize_phone(row[1])} for row in rows]
+                    if updates:
+                        conn.execute(text("UPDATE participants SET phone_digits = :digits WHERE id = :id"), updates)
+                    conn.commit()
+                    print(f"✓ Coluna 'phone_digits' adicionada ({len(updates)} telefone(s) normalizado(s))")
+            except Exception as e:
+                print(f"⚠ Aviso ao adicionar coluna 'phone_digits': {e}")
+        
+        # Migração: status de cada sacramento em colunas próprias (indexadas), extraídos da string antiga
+        sacrament_columns = ["baptism_status", "first_communion_status", "confirmation_status"]
+        missing = [column for column in sacrament_columns if column not in columns]
+        if missing:
+            try:
+                with engine.connect() as conn:
+                    for column in missing:
+                        conn.execute(text(f"ALTER TABLE participants ADD COLUMN {column} VARCHAR"))
+                        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_participants_{column} ON participants ({column})"))
+                    rows = conn.execute(text("SELECT id, sacraments FROM participants WHERE sacraments IS NOT NULL AND sacraments != ''")).fetchall()
+                    from database.crud import _sacrament_values
+                    updates = [{"id": row[0], **_sacrament_values(row[1])} for row in rows]
+                    if updates:
+                        conn.execute(
+                            text(
+                                "UPDATE participants SET sacraments = :sacraments, baptism_status = :baptism_status, "
+                                "first_communion_status = :first_communion_status, confirmation_status = :confirmation_status "
+                                "WHERE id = :id"
+                            ),
+                            updates,
+                        )
+                    conn.commit()
+                    print(f"✓ Colunas de sacramentos adicionadas ({len(updates)} participante(s) convertido(s))")
+            except Exception as e:
+                print(f"⚠ Aviso ao adicionar colunas de sacramentos: {e}")
+        
+        # Migração: birth_date como data nativa + coluna birthday (MMDD) para aniversariantes por período
+        if 'birthday' not in columns:
+            try:
+                from models.participant import parse_birth_date, birthday_key
+                with engine.connect() as conn:
+                    rows = conn.execute(text("SELECT id, birth_date FROM participants WHERE birth_date IS NOT NULL")).fetchall()
+                    updates, invalid = [], 0
+                    for row in rows:
+                        try:
+                            value = parse_birth_date(row[1])
+                        except ValueError:
+                            value = None
+                            invalid += 1
+                        updates.append({"id": row[0], "birth_date": value, "birthday": birthday_key(value)})
+                    conn.execute(text("ALTER TABLE participants ADD COLUMN birthday INTEGER"))
+                    if updates:
+                        # Datas inválidas viram NULL; no SQLite a data fica como texto ISO (o formato do tipo Date)
+                        conn.execute(
+                            text("UPDATE participants SET birth_date = :birth_date, birthday = :birthday WHERE id = :id"),
+                            [{**u, "birth_date": u["birth_date"].isoformat() if u["birth_date"] else None} for u in updates],
+                        )
+                    if IS_POSTGRES:
+                        conn.execute(text("ALTER TABLE participants ALTER COLUMN birth_date TYPE DATE USING birth_date::date"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_participants_birthday ON participants (birthday)"))
+                    conn.commit()
+                    converted = sum(1 for u in updates if u["birth_date"])
+                    print(f"✓ Datas de nascimento convertidas ({converted} válida(s), {invalid} inválida(s) removida(s))")
+            except Exception as e:
+                print(f"⚠ Aviso ao converter datas de nascimento: {e}")
+        
+        # Migração: updated_at/row_version para a sincronização incremental (/api/participants/changes)
+        if 'row_version' not in columns:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("ALTER TABLE participants ADD COLUMN updated_at TIMESTAMP"))
+                    conn.execute(text("ALTER TABLE participants ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_participants_row_version ON participants (row_version)"))
+                    # Registros existentes ficam na versão 1: clientes com since=0 recebem todos
+                    conn.execute(text("UPDATE participants SET updated_at = CURRENT_TIMESTAMP"))
+                    conn.execute(text(
+                        "INSERT INTO sync_counters (name, version) SELECT 'participants', 1 "
+                        "WHERE NOT EXISTS (SELECT 1 FROM sync_counters WHERE name = 'participants')"
+                    ))
+                    conn.commit()
+                    print("✓ Colunas de sincronização (updated_at, row_version) adicionadas")
+            except Exception as e:
+                print(f"⚠ Aviso ao adicionar colunas de sincronização: {e}")
+        
+        # Índices de duplicados e dos filtros estruturados (SQLite e PostgreSQL)
+        for index_name, expression in PARTICIPANT_INDEXES:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON participants ({expression})"))
+                    conn.commit()
+            except Exception as e:
+                print(f"⚠ Aviso ao criar índice '{index_name}': {e}")
+        
         # Executar análise inicial para melhorar performance
         try:
             with engine.connect() as conn:
@@ -0,0 +1,179 @@
+"""Profiler de SQL: consultas lentas com plano de execução e detecção de N+1.
+
+``instrument_engine`` liga eventos before/after_cursor_execute ao engine e cada
+comando é atribuído à requisição atual (``start_request``, chamado pelo
+middleware.query_profiler). Com o profiler ligado (SQL_PROFILE=1):
+
+- comandos acima de SQL_SLOW_QUERY_MS vão para o log com o plano
+  (EXPLAIN QUERY PLAN no SQLite, EXPLAIN no PostgreSQL), sem os parâmetros;
+- requisições com mais de SQL_MAX_QUERIES_PER_REQUEST comandos, ou com o mesmo
+  comando repetido SQL_REPEATED_QUERY_THRESHOLD vezes (padrão N+1: uma consulta
+  por item de uma lista), geram um aviso com os comandos mais repetidos;
+- com SQL_PROFILE_HEADER=1 cada resposta leva X-DB-Queries e Server-Timing
+  (aparece na aba Rede do navegador).
+
+O plano é obtido num cursor novo da mesma conexão (mesma transação, o resultado
+do comando original não é afetado). Desligado, nada disso roda.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Comandos que aceitam EXPLAIN sem executar nada
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+class RequestProfile:
+    """Comandos SQL de uma requisição: total, tempo, repetições e consultas lentas."""
+
+    def __init__(self, method: str = "", path: str = ""):
+        self.method = method
+        self.path = path
+        self.count = 0
+        self.seconds = 0.0
+        self.slow = 0
+        self.statements: Counter = Counter()
+
+    def add(self, statement: str, seconds: float, slow: bool) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+        if slow:
+            self.slow += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Comandos executados ``threshold`` vezes ou mais, do mais repetido ao menos."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        """Resumo para o cabeçalho da resposta."""
+        ms = self.seconds * 1000
+        return [
+            (b"x-db-queries", f"count={self.count}; time_ms={ms:.1f}; slow={self.slow}".encode()),
+            (b"server-timing", f'db;dur={ms:.1f};desc="{self.count} SQL"'.encode()),
+        ]
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+def start_request(method: str = "", path: str = "") -> Tuple[RequestProfile, object]:
+    """Começa a registrar os comandos da requisição (o contexto é herdado pelo threadpool)."""
+    profile = RequestProfile(method, path)
+    return profile, _current.set(profile)
+
+
+def end_request(profile: RequestProfile, token) -> None:
+    """Encerra a requisição e avisa se ela fez consultas demais ou repetidas."""
+    _current.reset(token)
+    repeated = profile.repeated(settings.SQL_REPEATED_QUERY_THRESHOLD)
+    if profile.count <= settings.SQL_MAX_QUERIES_PER_REQUEST and not repeated:
+        return
+    top = repeated or profile.statements.most_common(3)
+    details = "\n".join(f"  {n}x {_shorten(sql)}" for sql, n in top[:5])
+    logger.warning(
+        "%s %s: %d comando(s) SQL em %.1f ms%s\n%s",
+        profile.method,
+        profile.path,
+        profile.count,
+        profile.seconds * 1000,
+        " (possível N+1)" if repeated else "",
+        details,
+        extra={"db_queries": profile.count, "db_ms": round(profile.seconds * 1000, 1)},
+    )
+
+
+def _shorten(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def explain(dbapi_connection, dialect_name: str, statement: str, parameters) -> Optional[str]:
+    """Plano de execução do comando, ou None se não for possível obtê-lo."""
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if dialect_name == "sqlite" else "EXPLAIN "
+    # No PostgreSQL um erro aborta a transação da requisição: o EXPLAIN roda num SAVEPOINT
+    # (o SQLite não aborta a transação por um comando com erro)
+    savepoint = dialect_name != "sqlite" and not getattr(dbapi_connection, "autocommit", False)
+    cursor = dbapi_connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT sql_profiler_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception as e:
+            logger.debug("EXPLAIN falhou: %s", e)
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT sql_profiler_explain")
+            return None
+        finally:
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT sql_profiler_explain")
+    except Exception as e:
+        logger.debug("SAVEPOINT do EXPLAIN falhou: %s", e)
+        return None
+    finally:
+        cursor.close()
+    if dialect_name == "sqlite":
+        # (id, parent, notused, detail)
+        return "\n".join(f"  {row[-1]}" for row in rows)
+    return "\n".join(f"  {row[0]}" for row in rows)
+
+
+def _log_slow(conn, statement: str, parameters, executemany: bool, seconds: float) -> None:
+    profile = _current.get()
+    where = f"{profile.method} {profile.path}" if profile is not None else "fora de requisição"
+    plan = None
+    if settings.SQL_EXPLAIN_SLOW and not executemany:
+        plan = explain(conn.connection.dbapi_connection, conn.dialect.name, statement, parameters)
+    logger.warning(
+        "Consulta lenta (%.1f ms, %s): %s%s",
+        seconds * 1000,
+        where,
+        _shorten(statement, 1000),
+        f"\nPlano:\n{plan}" if plan else "",
+        extra={"db_ms": round(seconds * 1000, 1)},
+    )
+
+
+def instrument_engine(engine) -> None:
+    """Mede cada comando SQL do engine para o profiler (eventos before/after_cursor_execute)."""
+    from sqlalchemy import event
+
+    slow_seconds = settings.SQL_SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_profiler_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("_profiler_started")
+        if not started:
+            return
+        seconds = time.perf_counter() - started.pop()
+        slow = seconds >= slow_seconds
+        profile = _current.get()
+        if profile is not None:
+            profile.add(statement, seconds, slow)
+        if slow:
+            try:
+                _log_slow(conn, statement, parameters, executemany, seconds)
+            except Exception:
+                logger.exception("Erro ao registrar consulta lenta")
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("_profiler_started") if context.connection is not None else None
+        if started:
+            started.pop()
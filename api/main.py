@@ -1,19 +1,31 @@
 """API FastAPI para o Sistema EJC"""
-from fastapi import FastAPI, HTTPException, Depends, Request, status, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, Request, status, UploadFile, File, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import uvicorn
+import asyncio
+import os
 import shutil
 from pathlib import Path
 import sys
 import uuid
-
-from database.database import get_db, init_db
-from models.participant import ParticipantResponse, ParticipantCreate, ParticipantUpdate
+from datetime import date, datetime
+
+from database.database import get_db, SessionLocal, engine
+from database.crud import add_change_listener
+from database import profiler
+from models.participant import (
+    ParticipantResponse,
+    ParticipantCreate,
+    ParticipantUpdate,
+    ParticipantBulkUpdate,
+    ParticipantBulkDelete,
+    ParticipantFilters,
+)
 
 
 class ParticipantsListResponse(BaseModel):
@@ -26,12 +38,21 @@ from services.storage_service import (
     upload_photo as storage_upload_photo,
     upload_logo as storage_upload_logo,
     delete_logo_storage,
-    get_logo_path_from_db,
     set_logo_path_in_db,
     BUCKET_PHOTOS,
-    BUCKET_LOGO,
 )
+from services.logo_cache import get_logo as get_cached_logo, get_logo_signed_url, invalidate_logo_cache
+from services.settings_service import touch_settings
+from services.stats_service import get_stats, invalidate_stats_cache
+from services import events_service, metrics_service
+from middleware import CompressionMiddleware, QueryProfilerMiddleware, TimingMiddleware
+from utils.responses import ORJSONResponse, etag_versions, participant_etag, participant_to_dict, participants_to_list
+from utils.static_files import PrecompressedStaticFiles
 from config import settings
+from server import DATABASE_READY_ENV, prepare_database, serve
+from utils.log import setup_logging
+
+setup_logging()
 
 app = FastAPI(
     title="EJC Sistema API",
@@ -45,7 +66,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     """Retorna detalhes dos erros de validação"""
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={"detail": exc.errors(), "body": exc.body},
+        # jsonable_encoder: erros podem trazer date/exceções no input e no contexto
+        content=jsonable_encoder({"detail": exc.errors(), "body": exc.body}),
     )
 
 # CORS
@@ -55,12 +77,66 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-DB-Queries", "Server-Timing", "X-PDF-Profile"],
 )
 
-# Inicializar banco de dados
+# Compressão (Brotli/GZip) para respostas acima do limite configurado
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+
+# Profiler de SQL (SQL_PROFILE): consultas lentas com EXPLAIN, N+1 e cabeçalho X-DB-Queries
+if settings.SQL_PROFILE:
+    profiler.instrument_engine(engine)
+    app.add_middleware(QueryProfilerMiddleware, add_header=settings.SQL_PROFILE_HEADER)
+    print(f"✓ Profiler de SQL ativo (consultas lentas: >{settings.SQL_SLOW_QUERY_MS:.0f} ms)")
+
+# Métricas: tempo por rota e consultas SQL por requisição (adicionado por último = mais externo)
+if settings.METRICS_ENABLED:
+    metrics_service.instrument_engine(engine)
+    app.add_middleware(TimingMiddleware)
+
+# Escritas de participantes: descartar estatísticas em cache e avisar os clientes conectados (SSE)
+def _on_participants_changed(action: str, ids: List[int], version: int) -> None:
+    invalidate_stats_cache()
+    events_service.publish(action, ids, version)
+
+add_change_listener(_on_participants_changed)
+
+def _read_participants_version() -> int:
+    from database import crud
+    db = SessionLocal()
+    try:
+        return crud.current_version(db)
+    finally:
+        db.close()
+
+# Escritas feitas em outro worker (server.py): mesmo tratamento, mas sem os ids → "reset"
+def _on_remote_change(version: int) -> None:
+    invalidate_stats_cache()
+    events_service.publish("reset", [], version)
+
+_background_tasks: List[asyncio.Task] = []
+
+# Inicializar banco de dados (com vários workers o processo principal já fez isso)
 @app.on_event("startup")
 async def startup_event():
-    init_db()
+    if not os.environ.get(DATABASE_READY_ENV):
+        prepare_database()
+    events_service.install_shutdown_hook()
+    if settings.EVENTS_POLL_INTERVAL > 0:
+        _background_tasks.append(asyncio.create_task(events_service.watch_versions(
+            _read_participants_version, _on_remote_change, settings.EVENTS_POLL_INTERVAL,
+        )))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
 
 def _dist_dir() -> Path:
     """Pasta dist: dentro do .exe (PyInstaller) ou ao lado de api/."""
@@ -69,43 +145,218 @@ def _dist_dir() -> Path:
     return Path(__file__).resolve().parent.parent / "dist"
 
 
+# Frontend estático (dist): variantes .br/.gz pré-comprimidas e cache immutable nos assets com hash
+_dist = _dist_dir()
+static_files = PrecompressedStaticFiles(directory=str(_dist), html=True, check_dir=False)
+
+
 @app.get("/")
-async def root():
-    _root_dist = _dist_dir()
-    if _root_dist.exists() and (_root_dist / "index.html").exists():
-        return FileResponse(_root_dist / "index.html", media_type="text/html")
+async def root(request: Request):
+    _index = _dist / "index.html"
+    if _index.exists():
+        # index.html sempre revalidado (no-cache + ETag) para pegar novos builds
+        return static_files.file_response(_index, None, request.scope)
     return {"message": "EJC Sistema API", "version": "1.0.0"}
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Métricas do processo no formato texto do Prometheus (latência por rota, banco, PDFs, Storage, caches)."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Métricas desabilitadas (METRICS_ENABLED)")
+    return Response(metrics_service.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Rotas de participantes
-@app.get("/api/participants", response_model=ParticipantsListResponse)
+def get_participant_filters(
+    search: Optional[str] = None,
+    neighborhood: List[str] = Query(default=[]),
+    min_age: Optional[int] = Query(default=None, ge=0, le=120),
+    max_age: Optional[int] = Query(default=None, ge=0, le=120),
+    age_on: Optional[date] = None,
+    birthday_from: Optional[date] = None,
+    birthday_to: Optional[date] = None,
+    ecc_participant: Optional[bool] = None,
+    has_restrictions: Optional[bool] = None,
+    church_movement: Optional[str] = None,
+    has_church_movement: Optional[bool] = None,
+    sacrament: Optional[str] = None,
+    sacrament_status: Optional[str] = None,
+) -> ParticipantFilters:
+    """Dependency: monta os filtros estruturados a partir da query string."""
+    try:
+        return ParticipantFilters(
+            search=search,
+            neighborhood=neighborhood,
+            min_age=min_age,
+            max_age=max_age,
+            age_on=age_on,
+            birthday_from=birthday_from,
+            birthday_to=birthday_to,
+            ecc_participant=ecc_participant,
+            has_restrictions=has_restrictions,
+            church_movement=church_movement,
+            has_church_movement=has_church_movement,
+            sacrament=sacrament,
+            sacrament_status=sacrament_status,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+@app.get("/api/participants", response_model=ParticipantsListResponse, response_class=ORJSONResponse)
 async def get_participants(
     skip: int = 0,
     limit: int = 100,
-    search: Optional[str] = None,
+    filters: ParticipantFilters = Depends(get_participant_filters),
     db: Session = Depends(get_db)
 ):
-    """Lista todos os participantes com paginação e busca. Retorna total para paginação."""
+    """Lista participantes com paginação, busca e filtros estruturados. Retorna total para paginação."""
     from database import crud
 
-    participants = crud.get_participants(db, skip=skip, limit=limit, search=search)
-    total = crud.get_participants_count(db, search=search)
-    return ParticipantsListResponse(participants=participants, total=total)
+    participants = crud.get_participants(db, skip=skip, limit=limit, filters=filters)
+    total = crud.get_participants_count(db, filters=filters)
+    return ORJSONResponse({"participants": participants_to_list(participants), "total": total})
 
-@app.get("/api/participants/{participant_id}", response_model=ParticipantResponse)
-async def get_participant(participant_id: int, db: Session = Depends(get_db)):
-    """Obtém um participante específico"""
+@app.post("/api/participants/import")
+def import_participants(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Importa participantes de uma planilha (CSV ou XLSX, ex: exportada do Google Forms).
+    Valida cada linha, ignora e-mails/telefones duplicados e retorna o relatório por linha.
+    Com dry_run=true apenas valida, sem gravar. (Função síncrona: roda no threadpool.)
+    """
+    from services.import_service import import_participants as run_import
+
+    try:
+        report = run_import(db, file.file, file.filename or "", dry_run=dry_run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ORJSONResponse(report)
+
+@app.patch("/api/participants/bulk")
+async def bulk_update_participants(payload: ParticipantBulkUpdate, db: Session = Depends(get_db)):
+    """Aplica as mesmas alterações a vários participantes (ex: marcar restrições, definir movimento)
+    em um único UPDATE. E-mail/telefone só podem ser alterados em lote para um participante.
+    """
+    from database import crud
+
+    changes = payload.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="Nenhuma alteração informada.")
+    if "name" in changes and not changes["name"]:
+        raise HTTPException(status_code=400, detail="O nome não pode ficar vazio.")
+    ids = sorted(set(payload.ids))
+    for field, label in (("email", "e-mail"), ("phone", "telefone")):
+        if changes.get(field) is None:
+            continue
+        if len(ids) > 1:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Não é possível definir o mesmo {label} para vários participantes.",
+            )
+    if changes.get("email") is not None and crud.participant_exists_with_email(db, changes["email"], exclude_id=ids[0]):
+        raise HTTPException(
+            status_code=409,
+            detail="Já existe um participante cadastrado com este e-mail.",
+        )
+    if changes.get("phone") is not None and crud.participant_exists_with_phone(db, changes["phone"], exclude_id=ids[0]):
+        raise HTTPException(
+            status_code=409,
+            detail="Já existe um participante cadastrado com este telefone.",
+        )
+    updated = crud.bulk_update_participants(db, ids, changes)
+    return {"updated": updated, "requested": len(ids)}
+
+@app.post("/api/participants/bulk-delete")
+async def bulk_delete_participants(payload: ParticipantBulkDelete, db: Session = Depends(get_db)):
+    """Exclui vários participantes em um único DELETE."""
+    from database import crud
+
+    ids = sorted(set(payload.ids))
+    deleted = crud.bulk_delete_participants(db, ids)
+    return {"deleted": deleted, "requested": len(ids)}
+
+@app.get("/api/participants/export")
+async def export_participants(
+    format: str = "csv",
+    filters: ParticipantFilters = Depends(get_participant_filters),
+):
+    """Exporta todos os participantes (mesmos filtros da listagem) em CSV, XLSX ou NDJSON.
+    A resposta é enviada em streaming, lendo o banco em lotes.
+    """
+    from services.export_service import get_exporter, EXPORT_MEDIA_TYPES
+
+    export_format = format.lower()
+    try:
+        exporter = get_exporter(export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    filename = f"participantes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    return StreamingResponse(
+        exporter(SessionLocal, filters=filters),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@app.get("/api/stats", response_class=ORJSONResponse)
+def get_participants_stats(db: Session = Depends(get_db)):
+    """Estatísticas agregadas (bairros, ECC, restrições, sacramentos, faixas etárias) para o painel.
+    Calculadas com GROUP BY e guardadas em cache até a próxima alteração de participantes.
+    """
+    return ORJSONResponse(get_stats(db))
+
+@app.get("/api/participants/changes", response_class=ORJSONResponse)
+async def get_participant_changes(
+    since: int = Query(default=0, ge=0),
+    limit: int = Query(default=500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Sincronização incremental: participantes criados/alterados e ids excluídos depois da versão ``since``.
+    O cliente guarda ``version`` e envia como ``since`` na próxima chamada (repetindo enquanto ``has_more``).
+    Com ``reset`` o cliente deve recarregar a lista completa.
+    """
+    from database import crud
+
+    changes = crud.get_changes(db, since=since, limit=limit)
+    changes["participants"] = participants_to_list(changes["participants"])
+    return ORJSONResponse(changes)
+
+@app.get("/api/events")
+async def participant_events(request: Request, db: Session = Depends(get_db)):
+    """Canal Server-Sent Events com as alterações de participantes (created, updated, deleted).
+    O primeiro evento (hello) traz a versão atual; cada alteração traz ids e versão, e o cliente
+    busca os dados em /api/participants/changes. ``reset`` pede para recarregar tudo.
+    """
+    from database import crud
+
+    version = crud.current_version(db)
+    db.close()  # a conexão não fica presa enquanto o cliente estiver conectado
+    subscriber = events_service.subscribe(version)
+    return StreamingResponse(
+        events_service.stream(subscriber, version, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/participants/{participant_id}", response_model=ParticipantResponse, response_class=ORJSONResponse)
+async def get_participant(participant_id: int, request: Request, db: Session = Depends(get_db)):
+    """Obtém um participante específico. ETag = versão da linha; If-None-Match igual → 304."""
     from database import crud
     
     participant = crud.get_participant(db, participant_id=participant_id)
     if participant is None:
         raise HTTPException(status_code=404, detail="Participante não encontrado")
-    return participant
+    headers = {"ETag": participant_etag(participant), "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or participant.row_version in etag_versions(if_none_match)):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(participant_to_dict(participant), headers=headers)
 
-@app.post("/api/participants", response_model=ParticipantResponse, status_code=201)
+@app.post("/api/participants", response_model=ParticipantResponse, status_code=201, response_class=ORJSONResponse)
 async def create_participant(
     participant: ParticipantCreate,
     db: Session = Depends(get_db)
@@ -123,17 +374,28 @@ async def create_participant(
             status_code=409,
             detail="Já existe um participante cadastrado com este telefone.",
         )
-    return crud.create_participant(db=db, participant=participant)
+    db_participant = crud.create_participant(db=db, participant=participant)
+    return ORJSONResponse(
+        participant_to_dict(db_participant), status_code=201, headers={"ETag": participant_etag(db_participant)}
+    )
 
-@app.put("/api/participants/{participant_id}", response_model=ParticipantResponse)
+@app.put("/api/participants/{participant_id}", response_model=ParticipantResponse, response_class=ORJSONResponse)
 async def update_participant(
     participant_id: int,
     participant: ParticipantUpdate,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """Atualiza um participante. Rejeita e-mail ou telefone duplicados."""
+    """Atualiza um participante. Rejeita e-mail ou telefone duplicados.
+    Com If-Match (ETag do GET) só grava se ninguém alterou o participante depois: senão 412.
+    """
     from database import crud
 
+    if_match = request.headers.get("if-match")
+    expected_versions = None
+    if if_match and if_match.strip() != "*":
+        expected_versions = etag_versions(if_match)
+
     if participant.email is not None and crud.participant_exists_with_email(db, participant.email, exclude_id=participant_id):
         raise HTTPException(
             status_code=409,
@@ -144,10 +406,19 @@ async def update_participant(
             status_code=409,
             detail="Já existe um participante cadastrado com este telefone.",
         )
-    db_participant = crud.update_participant(db, participant_id=participant_id, participant=participant)
+    try:
+        db_participant = crud.update_participant(
+            db, participant_id=participant_id, participant=participant, expected_versions=expected_versions
+        )
+    except crud.VersionConflictError as e:
+        raise HTTPException(
+            status_code=412,
+            detail="Este participante foi alterado por outra pessoa. Recarregue a ficha antes de salvar.",
+            headers={"ETag": f'"{e.current_version}"'},
+        )
     if db_participant is None:
         raise HTTPException(status_code=404, detail="Participante não encontrado")
-    return db_participant
+    return ORJSONResponse(participant_to_dict(db_participant), headers={"ETag": participant_etag(db_participant)})
 
 @app.delete("/api/participants/{participant_id}", status_code=204)
 async def delete_participant(participant_id: int, db: Session = Depends(get_db)):
@@ -237,6 +508,7 @@ async def upload_logo(file: UploadFile = File(...), db: Session = Depends(get_db
             path = storage_upload_logo(content, content_type, file_extension)
             if path:
                 set_logo_path_in_db(db, path)
+                invalidate_logo_cache()
                 return {"filename": path, "path": path}
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Erro ao enviar logo: {str(e)}")
@@ -254,42 +526,35 @@ async def upload_logo(file: UploadFile = File(...), db: Session = Depends(get_db
         return {"filename": logo_filename, "path": str(file_path.relative_to(settings.DATA_DIR))}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao salvar logo: {str(e)}")
+    finally:
+        # Avisa os outros processos (versão das configurações) e recarrega a logo local
+        touch_settings(db)
+        invalidate_logo_cache()
 
 @app.get("/api/logo")
-async def get_logo(db: Session = Depends(get_db)):
+async def get_logo(request: Request, db: Session = Depends(get_db)):
     """Retorna a logo: Supabase = redirect para signed URL; senão serve do disco.
+    A logo fica em cache no processo (sem disco/banco a cada chamada) e é validada por ETag.
     Se não houver logo, retorna 204 No Content em vez de 404 para evitar erros no frontend.
     """
-    if use_supabase_storage():
-        logo_path = get_logo_path_from_db(db)
-        if logo_path:
-            signed_url = get_signed_url(BUCKET_LOGO, logo_path)
-            if signed_url:
-                return RedirectResponse(url=signed_url)
-    
-    # Verificar se o diretório existe antes de listar
-    if not settings.LOGO_DIR.exists():
-        settings.LOGO_DIR.mkdir(parents=True, exist_ok=True)
-    
-    logo_files = list(settings.LOGO_DIR.glob("*"))
-    image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg']
-    for logo_file in logo_files:
-        if logo_file.is_file() and logo_file.suffix.lower() in image_extensions:
-            content_type = "image/png"
-            if logo_file.suffix.lower() in ['.jpg', '.jpeg']:
-                content_type = "image/jpeg"
-            elif logo_file.suffix.lower() == '.gif':
-                content_type = "image/gif"
-            elif logo_file.suffix.lower() == '.webp':
-                content_type = "image/webp"
-            elif logo_file.suffix.lower() == '.svg':
-                content_type = "image/svg+xml"
-            return FileResponse(logo_file, media_type=content_type)
-    
-    # Retornar 204 No Content quando não há logo (em vez de 404)
-    # Isso evita erros nos logs e é mais semântico: "não há conteúdo" vs "não encontrado"
-    from fastapi.responses import Response
-    return Response(status_code=204)
+    logo = get_cached_logo(db)
+    if logo is None:
+        # Retornar 204 No Content quando não há logo (em vez de 404)
+        # Isso evita erros nos logs e é mais semântico: "não há conteúdo" vs "não encontrado"
+        return Response(status_code=204)
+
+    if logo.storage_path:
+        signed_url = get_logo_signed_url(logo)
+        if signed_url:
+            return RedirectResponse(url=signed_url)
+        return Response(status_code=204)
+
+    headers = {"ETag": logo.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == logo.etag:
+        return Response(status_code=304, headers=headers)
+    if logo.content is not None:
+        return Response(content=logo.content, media_type=logo.media_type, headers=headers)
+    return FileResponse(logo.path, media_type=logo.media_type, headers=headers)
 
 @app.delete("/api/logo")
 async def delete_logo(db: Session = Depends(get_db)):
@@ -297,6 +562,7 @@ async def delete_logo(db: Session = Depends(get_db)):
     if use_supabase_storage():
         delete_logo_storage()
         set_logo_path_in_db(db, None)
+        invalidate_logo_cache()
         return {"status": "success", "message": "Logo removida com sucesso"}
     deleted_count = 0
     for logo_file in settings.LOGO_DIR.glob("*"):
@@ -305,13 +571,18 @@ async def delete_logo(db: Session = Depends(get_db)):
             deleted_count += 1
         except Exception as e:
             print(f"⚠ Erro ao remover logo: {e}")
+    touch_settings(db)
+    invalidate_logo_cache()
     if deleted_count > 0:
         return {"status": "success", "message": "Logo removida com sucesso"}
     raise HTTPException(status_code=404, detail="Nenhuma logo encontrada para remover")
 
 # Rotas de PDF
+# ?profile=1 nas rotas de PDF: tempos por etapa no cabeçalho X-PDF-Profile e <pdf>.profile.json (services.pdf_profiler)
+PDF_PROFILE_QUERY = Query(default=False, description="Mede a geração (cabeçalho X-PDF-Profile)")
+
 @app.get("/api/pdf/participant/{participant_id}")
-async def generate_participant_pdf(participant_id: int, db: Session = Depends(get_db)):
+def generate_participant_pdf(participant_id: int, profile: bool = PDF_PROFILE_QUERY, db: Session = Depends(get_db)):
     """Gera PDF individual de um participante"""
     from database import crud
     
@@ -319,7 +590,7 @@ async def generate_participant_pdf(participant_id: int, db: Session = Depends(ge
     if participant is None:
         raise HTTPException(status_code=404, detail="Participante não encontrado")
     
-    pdf_service = PDFService(db=db)
+    pdf_service = PDFService(db=db, profile=profile)
     pdf_path = pdf_service.generate_individual_pdf(participant_id)
     
     if not pdf_path:
@@ -328,12 +599,17 @@ async def generate_participant_pdf(participant_id: int, db: Session = Depends(ge
     return FileResponse(
         pdf_path,
         media_type="application/pdf",
-        filename=f"ficha_{participant.name.replace(' ', '_')}.pdf"
+        filename=f"ficha_{participant.name.replace(' ', '_')}.pdf",
+        headers=pdf_service.profile_headers(),
     )
 
 @app.get("/api/pdf/complete")
-async def generate_complete_pdf(db: Session = Depends(get_db)):
-    """Gera PDF completo com todos os participantes. Desativado na Vercel (timeout 10s)."""
+def generate_complete_pdf(
+    profile: bool = PDF_PROFILE_QUERY,
+    filters: ParticipantFilters = Depends(get_participant_filters),
+    db: Session = Depends(get_db)
+):
+    """Gera PDF completo com os participantes (aceita os filtros da listagem). Desativado na Vercel (timeout 10s)."""
     if getattr(settings, "IS_VERCEL", False):
         raise HTTPException(
             status_code=503,
@@ -342,8 +618,8 @@ async def generate_complete_pdf(db: Session = Depends(get_db)):
                 "Use os PDFs individuais ou execute a API localmente para gerar o PDF completo."
             ),
         )
-    pdf_service = PDFService(db=db)
-    pdf_path = pdf_service.generate_complete_pdf()
+    pdf_service = PDFService(db=db, profile=profile)
+    pdf_path = pdf_service.generate_complete_pdf(filters=filters)
 
     if not pdf_path:
         raise HTTPException(status_code=500, detail="Erro ao gerar PDF")
@@ -351,7 +627,65 @@ async def generate_complete_pdf(db: Session = Depends(get_db)):
     return FileResponse(
         pdf_path,
         media_type="application/pdf",
-        filename="fichas_completas.pdf"
+        filename="fichas_completas.pdf",
+        headers=pdf_service.profile_headers(),
+    )
+
+@app.get("/api/pdf/badges")
+def generate_badges_pdf(
+    profile: bool = PDF_PROFILE_QUERY,
+    filters: ParticipantFilters = Depends(get_participant_filters),
+    db: Session = Depends(get_db)
+):
+    """Gera os crachás (várias por página A4) dos participantes (aceita os filtros da listagem)."""
+    pdf_service = PDFService(db=db, profile=profile)
+    pdf_path = pdf_service.generate_badges_pdf(filters=filters)
+    if not pdf_path:
+        raise HTTPException(status_code=404, detail="Nenhum participante encontrado para gerar crachás")
+    return FileResponse(pdf_path, media_type="application/pdf", filename="crachas.pdf", headers=pdf_service.profile_headers())
+
+@app.get("/api/pdf/roster")
+def generate_roster_pdf(
+    title: Optional[str] = Query(default=None, max_length=100),
+    profile: bool = PDF_PROFILE_QUERY,
+    filters: ParticipantFilters = Depends(get_participant_filters),
+    db: Session = Depends(get_db)
+):
+    """Gera a lista de fotos (grade com foto e nome) de um grupo, selecionado pelos filtros da listagem."""
+    pdf_service = PDFService(db=db, profile=profile)
+    pdf_path = pdf_service.generate_roster_pdf(filters=filters, title=title)
+    if not pdf_path:
+        raise HTTPException(status_code=404, detail="Nenhum participante encontrado para a lista de fotos")
+    return FileResponse(pdf_path, media_type="application/pdf", filename="lista_fotos.pdf", headers=pdf_service.profile_headers())
+
+@app.get("/api/reports/restrictions")
+def restrictions_report(
+    format: str = "pdf",
+    profile: bool = PDF_PROFILE_QUERY,
+    filters: ParticipantFilters = Depends(get_participant_filters),
+    db: Session = Depends(get_db)
+):
+    """Relatório da cozinha: participantes com restrições alimentares/alergias, em PDF (tabela) ou CSV.
+    (Função síncrona: o PDF é montado no threadpool, sem travar o event loop.)
+    """
+    report_format = format.lower()
+    date_suffix = datetime.now().strftime('%Y%m%d')
+    if report_format == "csv":
+        from services.export_service import iter_restrictions_csv, EXPORT_MEDIA_TYPES
+        return StreamingResponse(
+            iter_restrictions_csv(SessionLocal, filters=filters),
+            media_type=EXPORT_MEDIA_TYPES["csv"],
+            headers={"Content-Disposition": f'attachment; filename="restricoes_{date_suffix}.csv"'},
+        )
+    if report_format != "pdf":
+        raise HTTPException(status_code=400, detail="Formato inválido: use pdf ou csv")
+    pdf_service = PDFService(db=db, profile=profile)
+    pdf_path = pdf_service.generate_restrictions_pdf(filters=filters)
+    if not pdf_path:
+        raise HTTPException(status_code=500, detail="Erro ao gerar PDF")
+    return FileResponse(
+        pdf_path, media_type="application/pdf", filename=f"restricoes_{date_suffix}.pdf",
+        headers=pdf_service.profile_headers(),
     )
 
 # Rotas de manutenção do banco de dados (opcionais)
@@ -379,15 +713,8 @@ async def optimize_db():
     return {"status": "success", "message": "Banco de dados otimizado"}
 
 # Servir frontend estático (dist) quando a pasta existir (Vercel ou executável local)
-from fastapi.staticfiles import StaticFiles
-_dist = _dist_dir()
 if _dist.exists():
-    app.mount("/", StaticFiles(directory=str(_dist), html=True), name="static")
+    app.mount("/", static_files, name="static")
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host=settings.HOST,
-        port=settings.PORT,
-        reload=settings.DEBUG
-    )
+    serve(reload=settings.DEBUG)
@@ -0,0 +1,6 @@
+"""Middlewares ASGI da API"""
+from .compression import CompressionMiddleware
+from .query_profiler import QueryProfilerMiddleware
+from .timing import TimingMiddleware
+
+__all__ = ["CompressionMiddleware", "QueryProfilerMiddleware", "TimingMiddleware"]
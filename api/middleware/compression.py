@@ -0,0 +1,180 @@
+"""Compressão das respostas HTTP (Brotli quando disponível, senão GZip).
+
+Respostas abaixo de ``minimum_size`` e tipos já comprimidos (imagens, zip/xlsx)
+passam sem alteração. O pacote ``brotli`` é opcional: sem ele só GZip é usado.
+"""
+import zlib
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli é opcional
+    brotli = None
+
+# Tipos de conteúdo que não compensa comprimir (já comprimidos ou streaming de eventos)
+EXCLUDED_MEDIA_TYPE_PREFIXES = (
+    "image/",
+    "video/",
+    "audio/",
+    "text/event-stream",
+    "application/zip",
+    "application/gzip",
+    "application/vnd.openxmlformats",
+)
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits=31 → formato gzip (cabeçalho + CRC)
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def process(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Escolhe a codificação a partir do Accept-Encoding (br tem preferência)."""
+    accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """Comprime respostas com Brotli ou GZip conforme o Accept-Encoding do cliente."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = _choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+            if encoding == "br":
+                factory = lambda: _BrotliCompressor(self.brotli_quality)  # noqa: E731
+            elif encoding == "gzip":
+                factory = lambda: _GzipCompressor(self.gzip_level)  # noqa: E731
+            else:
+                factory = None
+            if factory is not None:
+                responder = _CompressionResponder(self.app, self.minimum_size, encoding, factory)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: str, factory: Callable):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.factory = factory
+        self.compressor = None
+        self.send: Optional[Send] = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _set_headers(self, content_length: Optional[int]) -> None:
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        # ETag forte deixa de valer para o corpo comprimido
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Só envia o início depois de decidir se o corpo será comprimido
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "")
+            self.passthrough = "content-encoding" in headers or media_type.startswith(
+                EXCLUDED_MEDIA_TYPE_PREFIXES
+            )
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if not self.started:
+            self.started = True
+            if len(body) < self.minimum_size and not more_body:
+                # Respostas pequenas vão sem compressão
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            self.compressor = self.factory()
+            if not more_body:
+                body = self.compressor.process(body) + self.compressor.finish()
+                self._set_headers(len(body))
+            else:
+                # Streaming: flush a cada bloco para o cliente receber os dados logo
+                body = self.compressor.process(body) + self.compressor.flush()
+                self._set_headers(None)
+            await self.send(self.initial_message)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        if self.compressor is None:
+            # Resposta pequena já enviada sem compressão
+            await self.send(message)
+            return
+        if more_body:
+            body = self.compressor.process(body) + self.compressor.flush()
+        else:
+            body = self.compressor.process(body) + self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -0,0 +1,36 @@
+"""Atribui os comandos SQL a cada requisição (database.profiler) e, se configurado,
+devolve o resumo nos cabeçalhos X-DB-Queries e Server-Timing.
+
+O cabeçalho é montado no início da resposta: em respostas em streaming (ex:
+/api/events) ele só conta as consultas feitas até ali.
+"""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from database import profiler
+
+
+class QueryProfilerMiddleware:
+    """Abre um perfil de consultas por requisição HTTP."""
+
+    def __init__(self, app: ASGIApp, add_header: bool = False) -> None:
+        self.app = app
+        self.add_header = add_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = profiler.start_request(scope["method"], scope.get("path", ""))
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.extend(profile.headers())
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_header if self.add_header else send)
+        finally:
+            profiler.end_request(profile, token)
@@ -0,0 +1,70 @@
+"""Tempo de resposta por rota, requisições em andamento e contagem por status.
+
+As métricas ficam em services.metrics_service (expostas em /api/metrics). A rota
+é o modelo do caminho (ex: /api/participants/{participant_id}), não a URL, para
+o número de séries não crescer com ids. Também registra quantas consultas SQL e
+quanto tempo de banco cada requisição usou.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services import metrics_service
+
+_duration = metrics_service.histogram(
+    "http_request_duration_seconds", "Tempo de resposta por rota", ("method", "route")
+)
+_responses = metrics_service.counter(
+    "http_responses_total", "Respostas por rota e status", ("method", "route", "status")
+)
+_in_flight = metrics_service.gauge("http_requests_in_flight", "Requisições em andamento")
+_db_queries = metrics_service.histogram(
+    "http_request_db_queries", "Consultas SQL por requisição", ("method", "route"), buckets=metrics_service.COUNT_BUCKETS
+)
+_db_seconds = metrics_service.histogram(
+    "http_request_db_seconds", "Tempo de banco por requisição", ("method", "route")
+)
+
+
+def route_label(scope: Scope) -> str:
+    """Modelo da rota atendida (preenchido pelo roteador do FastAPI) ou um rótulo fixo."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    return "unmatched" if scope.get("path", "").startswith("/api") else "static"
+
+
+class TimingMiddleware:
+    """Mede cada requisição HTTP (inclusive o tempo dos middlewares internos)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        _in_flight.inc()
+        db_stats, token = metrics_service.start_request_db_stats()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics_service.end_request_db_stats(token)
+            _in_flight.dec()
+            method, route = scope["method"], route_label(scope)
+            _duration.observe(elapsed, method=method, route=route)
+            _responses.inc(method=method, route=route, status=status)
+            _db_queries.observe(db_stats[0], method=method, route=route)
+            _db_seconds.observe(db_stats[1], method=method, route=route)
@@ -1,4 +1,24 @@
-from .participant import Participant, ParticipantCreate, ParticipantUpdate, ParticipantResponse
+from .participant import (
+    Participant,
+    ParticipantCreate,
+    ParticipantUpdate,
+    ParticipantResponse,
+    ParticipantBulkUpdate,
+    ParticipantBulkDelete,
+    ParticipantFilters,
+)
 from .event_setting import EventSetting
+from .sync import SyncCounter, ParticipantTombstone
 
-__all__ = ["Participant", "ParticipantCreate", "ParticipantUpdate", "ParticipantResponse", "EventSetting"]
+__all__ = [
+    "Participant",
+    "ParticipantCreate",
+    "ParticipantUpdate",
+    "ParticipantResponse",
+    "ParticipantBulkUpdate",
+    "ParticipantBulkDelete",
+    "ParticipantFilters",
+    "EventSetting",
+    "SyncCounter",
+    "ParticipantTombstone",
+]
@@ -1,11 +1,31 @@
 """Modelos Pydantic e SQLAlchemy para participantes"""
-from sqlalchemy import Column, Integer, String, Boolean, Text
+from sqlalchemy import Column, Integer, String, Boolean, Text, Date, DateTime
 from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional
-from datetime import date
+from typing import List, Literal, Optional
+from datetime import date, datetime
 from database.database import Base
 
 
+def parse_birth_date(value):
+    """Converte texto YYYY-MM-DD (ou DD/MM/YYYY) em date; vazio vira None."""
+    if value is None or isinstance(value, date):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError("Data deve estar no formato YYYY-MM-DD")
+
+
+def birthday_key(value: Optional[date]) -> Optional[int]:
+    """Aniversário como inteiro MMDD (ex: 3 de março → 303), usado nas buscas por período."""
+    return value.month * 100 + value.day if value else None
+
+
 # SQLAlchemy Model
 class Participant(Base):
     __tablename__ = "participants"
@@ -13,13 +33,18 @@ class Participant(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
     common_name = Column(String, nullable=True)
-    birth_date = Column(String, nullable=True)  # ISO format YYYY-MM-DD
+    birth_date = Column(Date, nullable=True, index=True)
+    birthday = Column(Integer, nullable=True, index=True)  # MMDD de birth_date (aniversariantes por período)
     instagram = Column(String, nullable=True)
     address = Column(String, nullable=True)
     neighborhood = Column(String, nullable=True)
     email = Column(String, nullable=True)
     phone = Column(String, nullable=True)
-    sacraments = Column(Text, nullable=True)  # JSON string
+    phone_digits = Column(String, nullable=True, index=True)  # só dígitos do telefone (busca de duplicados)
+    sacraments = Column(Text, nullable=True)  # "Sacramento:Status,..." (forma canônica, mantida pelo crud)
+    baptism_status = Column(String, nullable=True, index=True)  # status de cada sacramento (None = Não Informado)
+    first_communion_status = Column(String, nullable=True, index=True)
+    confirmation_status = Column(String, nullable=True, index=True)
     church_movement = Column(String, nullable=True)
     church_movement_info = Column(Text, nullable=True)
     father_name = Column(String, nullable=True)
@@ -32,13 +57,15 @@ class Participant(Base):
     restrictions_info = Column(Text, nullable=True)
     observations = Column(Text, nullable=True)
     photo_path = Column(String, nullable=True)
+    updated_at = Column(DateTime, nullable=True)  # UTC da última escrita
+    row_version = Column(Integer, nullable=False, default=1, index=True)  # versão global da última escrita (sync)
 
 
 # Pydantic Models
 class ParticipantBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=200)
     common_name: Optional[str] = Field(default=None, max_length=200)
-    birth_date: Optional[str] = Field(default=None)
+    birth_date: Optional[date] = Field(default=None)
     instagram: Optional[str] = Field(default=None, max_length=100)
     address: Optional[str] = Field(default=None, max_length=500)
     neighborhood: Optional[str] = Field(default=None, max_length=200)
@@ -62,16 +89,10 @@ class ParticipantBase(BaseModel):
         # Permite strings vazias serem convertidas para None
         str_strip_whitespace = True
     
-    @field_validator('birth_date')
+    @field_validator('birth_date', mode='before')
     @classmethod
     def validate_birth_date(cls, v):
-        if v:
-            try:
-                from datetime import datetime
-                datetime.strptime(v, "%Y-%m-%d")
-            except ValueError:
-                raise ValueError("Data deve estar no formato YYYY-MM-DD")
-        return v
+        return parse_birth_date(v)
     
     @model_validator(mode='before')
     @classmethod
@@ -108,7 +129,7 @@ class ParticipantCreate(ParticipantBase):
 class ParticipantUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=200)
     common_name: Optional[str] = Field(None, max_length=200)
-    birth_date: Optional[str] = None
+    birth_date: Optional[date] = None
     instagram: Optional[str] = Field(None, max_length=100)
     address: Optional[str] = Field(None, max_length=500)
     neighborhood: Optional[str] = Field(None, max_length=200)
@@ -128,9 +149,65 @@ class ParticipantUpdate(BaseModel):
     observations: Optional[str] = None
     photo_path: Optional[str] = None
 
+    @field_validator('birth_date', mode='before')
+    @classmethod
+    def validate_birth_date(cls, v):
+        return parse_birth_date(v)
+
+
+SACRAMENT_NAMES = ("Batismo", "Primeira Eucaristia", "Crisma")
+SACRAMENT_STATUSES = ("Concluído", "Não Concluído", "Em Processo", "Não Informado")
+
+# Sacramento → coluna com o status (na ordem de SACRAMENT_NAMES)
+SACRAMENT_COLUMNS = {
+    "Batismo": "baptism_status",
+    "Primeira Eucaristia": "first_communion_status",
+    "Crisma": "confirmation_status",
+}
+
+
+class ParticipantFilters(BaseModel):
+    """Filtros estruturados (query string) da listagem, exportação e PDFs."""
+    search: Optional[str] = None
+    neighborhood: List[str] = Field(default_factory=list)
+    min_age: Optional[int] = Field(default=None, ge=0, le=120)
+    max_age: Optional[int] = Field(default=None, ge=0, le=120)
+    age_on: Optional[date] = None  # data de referência da idade (padrão: hoje), ex: início do retiro
+    birthday_from: Optional[date] = None  # aniversariantes entre birthday_from e birthday_to (ano ignorado)
+    birthday_to: Optional[date] = None
+    ecc_participant: Optional[bool] = None
+    has_restrictions: Optional[bool] = None
+    church_movement: Optional[str] = None
+    has_church_movement: Optional[bool] = None
+    sacrament: Optional[Literal["Batismo", "Primeira Eucaristia", "Crisma"]] = None
+    sacrament_status: Optional[Literal["Concluído", "Não Concluído", "Em Processo", "Não Informado"]] = None
+
+    @model_validator(mode='after')
+    def check_ranges(self):
+        if self.min_age is not None and self.max_age is not None and self.min_age > self.max_age:
+            raise ValueError("min_age deve ser menor ou igual a max_age")
+        if self.birthday_from and self.birthday_to and self.birthday_from > self.birthday_to:
+            raise ValueError("birthday_from deve ser anterior ou igual a birthday_to")
+        return self
+
+
+# Limite de IDs por operação em lote (mantém o IN abaixo do limite de parâmetros do SQLite)
+MAX_BULK_IDS = 5000
+
+
+class ParticipantBulkUpdate(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_IDS)
+    changes: ParticipantUpdate
+
+
+class ParticipantBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_IDS)
+
 
 class ParticipantResponse(ParticipantBase):
     id: int
+    updated_at: Optional[datetime] = None
+    row_version: Optional[int] = None
     
     class Config:
         from_attributes = True
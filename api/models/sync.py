@@ -0,0 +1,20 @@
+"""Modelos de sincronização incremental (clientes de check-in offline)"""
+from sqlalchemy import Column, Integer, String, DateTime
+from database.database import Base
+
+
+class SyncCounter(Base):
+    """Contador global de versões: cada escrita em participantes usa o próximo valor como row_version."""
+    __tablename__ = "sync_counters"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class ParticipantTombstone(Base):
+    """Marca de exclusão: avisa os clientes que o participante foi removido (na versão row_version)."""
+    __tablename__ = "participant_tombstones"
+
+    participant_id = Column(Integer, primary_key=True)
+    row_version = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime, nullable=False)
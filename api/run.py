@@ -9,13 +9,9 @@ trash_dir = Path(__file__).parent / "trash"
 trash_dir.mkdir(exist_ok=True)
 os.environ["PYTHONPYCACHEPREFIX"] = str(trash_dir)
 
-import uvicorn
 from config import settings
+from server import serve
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host=settings.HOST,
-        port=settings.PORT,
-        reload=settings.DEBUG
-    )
+    # DEBUG=1: um processo com reload; senão WORKERS processos (server.py)
+    serve(reload=settings.DEBUG)
@@ -0,0 +1,155 @@
+"""Inicialização do servidor (uvicorn), em um ou vários processos (workers).
+
+Usado por run.py, main.py e ejc_launcher.py. Com WORKERS > 1 cada worker é um
+processo com a aplicação inteira, e o sistema operacional distribui as conexões
+entre eles: um PDF pesado ocupa um worker enquanto os outros continuam atendendo,
+e a geração de PDFs usa todos os núcleos.
+
+- O banco (tabelas, migrações, WAL no SQLite) é preparado uma vez no processo
+  principal, antes dos workers; eles só abrem conexões (DATABASE_READY_ENV).
+- SQLite em WAL é compartilhado entre processos: leituras não esperam escritas e
+  cada escrita espera o lock (timeout de 20 s em database.database). Ao encerrar,
+  o WAL é incorporado ao arquivo .db (checkpoint).
+- Ctrl+C/SIGTERM: cada worker termina as requisições em andamento (até
+  GRACEFUL_SHUTDOWN_TIMEOUT s, fechando os canais de eventos) antes de sair.
+- WORKER_MAX_REQUESTS reinicia o worker depois de N requisições (o processo
+  principal sobe outro no lugar), liberando memória de PDFs/imagens grandes. Só
+  um worker recicla por vez: os outros esperam o substituto começar a atender.
+
+Estado em memória é por processo: caches (estatísticas, logo, configurações),
+métricas de /api/metrics e clientes de /api/events. Configurações e estatísticas
+se sincronizam pelo banco (SETTINGS_SYNC_INTERVAL / STATS_CACHE_TTL) e os
+eventos de escritas feitas em outros workers chegam pela checagem de versão
+(EVENTS_POLL_INTERVAL); /api/metrics mostra só o worker que respondeu.
+"""
+import logging
+import multiprocessing
+import os
+import time
+from typing import Optional
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from config import settings
+
+# Definida pelo processo principal depois de preparar o banco (herdada pelos workers)
+DATABASE_READY_ENV = "EJC_DATABASE_READY"
+
+# Limite do modo automático (WORKERS=0): cada worker carrega a aplicação inteira na memória
+MAX_AUTO_WORKERS = 4
+
+# Vale a vez de reciclar de um worker cujo substituto não começou a atender nesse tempo
+# (ex: o substituto falhou ao iniciar); depois disso outro worker pode reciclar
+RECYCLE_CLAIM_TIMEOUT = 60.0
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class _WorkerServer(uvicorn.Server):
+    """Server do uvicorn de cada worker, com a reciclagem (WORKER_MAX_REQUESTS) coordenada.
+
+    O limite do uvicorn faria cada worker sair sozinho; com a carga dividida por igual
+    todos chegam nele juntos, e o processo principal leva segundos para perceber e subir
+    os substitutos, deixando a porta sem ninguém. Aqui ``recycling`` (compartilhado entre
+    os processos) guarda quando um worker começou a reciclar: quem atingir o limite
+    enquanto isso continua atendendo até o substituto começar a aceitar conexões (ou
+    até RECYCLE_CLAIM_TIMEOUT, se o substituto nunca subir).
+
+    Ao sair, fecha também os canais de eventos (Ctrl+C/SIGTERM já fecham pelo
+    events_service.install_shutdown_hook), senão o worker esperaria
+    GRACEFUL_SHUTDOWN_TIMEOUT pelos clientes de /api/events.
+    """
+
+    def __init__(self, config: uvicorn.Config, max_requests: int, recycling):
+        super().__init__(config)
+        self.max_requests = max_requests
+        self.recycling = recycling
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        # Este worker já aceita conexões: outro pode reciclar
+        with self.recycling.get_lock():
+            self.recycling.value = 0.0
+
+    def _claim_recycle(self) -> bool:
+        now = time.time()  # relógio do sistema: comparável entre processos
+        with self.recycling.get_lock():
+            if self.recycling.value and now - self.recycling.value < RECYCLE_CLAIM_TIMEOUT:
+                return False
+            self.recycling.value = now
+            return True
+
+    async def on_tick(self, counter: int) -> bool:
+        if (not self.should_exit and self.max_requests
+                and self.server_state.total_requests >= self.max_requests and self._claim_recycle()):
+            logger.info(f"Reciclando o worker após {self.server_state.total_requests} requisições")
+            self.should_exit = True
+        should_exit = await super().on_tick(counter)
+        if should_exit:
+            from services import events_service
+            events_service.close_all()
+        return should_exit
+
+
+def worker_count() -> int:
+    """Número de workers configurado (WORKERS=0: um por núcleo, até MAX_AUTO_WORKERS)."""
+    if settings.WORKERS > 0:
+        return settings.WORKERS
+    return max(1, min(os.cpu_count() or 1, MAX_AUTO_WORKERS))
+
+
+def prepare_database() -> None:
+    """Cria/migra as tabelas e remove marcas de exclusão antigas (uma vez por inicialização)."""
+    from database.database import init_db, SessionLocal
+    from database import crud
+
+    init_db()
+    db = SessionLocal()
+    try:
+        pruned = crud.prune_tombstones(db, settings.TOMBSTONE_RETENTION_DAYS)
+        if pruned:
+            print(f"✓ {pruned} marca(s) de exclusão antiga(s) removida(s)")
+    except Exception as e:
+        print(f"⚠ Aviso ao limpar marcas de exclusão: {e}")
+    finally:
+        db.close()
+
+
+def serve(host: Optional[str] = None, port: Optional[int] = None, reload: bool = False) -> None:
+    """Sobe a API (main:app) e só retorna quando o servidor for encerrado."""
+    host, port = host or settings.HOST, port or settings.PORT
+    workers = 1 if reload else worker_count()
+    if workers == 1:
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            reload=reload,
+            timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_TIMEOUT,
+        )
+        return
+
+    from database.database import engine, checkpoint_wal
+
+    prepare_database()
+    engine.dispose()  # os workers abrem as próprias conexões
+    os.environ[DATABASE_READY_ENV] = "1"
+    # Mesmo fluxo de uvicorn.run com workers, com o Server acima
+    config = uvicorn.Config(
+        "main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
+    # Os workers são criados com "spawn" e herdam o valor compartilhado
+    recycling = multiprocessing.get_context("spawn").Value("d", 0.0)
+    server = _WorkerServer(config, settings.WORKER_MAX_REQUESTS, recycling)
+    print(f"✓ Servidor com {workers} workers")
+    try:
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        checkpoint_wal()
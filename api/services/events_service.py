@@ -0,0 +1,214 @@
+"""Canal de eventos (Server-Sent Events) com as alterações de participantes.
+
+O crud avisa cada escrita confirmada (``crud.add_change_listener``) e ``publish``
+repassa o evento para a fila de cada cliente conectado em /api/events, sem
+consultar o banco por cliente. O evento leva só a ação, os ids e a versão: o
+cliente busca os dados em /api/participants/changes?since=<versão anterior>.
+
+Os assinantes ficam na memória do processo; com vários workers (server.py), as
+escritas feitas em outro worker são percebidas por ``watch_versions``: cada escrita
+soma 1 à versão, então se a versão do banco andou mais que as escritas publicadas
+aqui desde a leitura anterior, outro processo escreveu e os clientes deste recebem
+``reset``.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import signal
+import threading
+from typing import AsyncIterator, Callable, List, Optional, Set
+
+from services import metrics_service
+
+# Eventos pendentes por cliente; se a fila encher (cliente lento), ele recebe "reset"
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Intervalo do comentário de keep-alive (segundos) e espera sugerida para reconectar (ms)
+HEARTBEAT_INTERVAL = 15.0
+RETRY_MS = 3000
+
+
+class Subscriber:
+    """Fila de eventos de um cliente conectado, ligada ao event loop que a consome."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+        self.closed = False
+
+    def _close(self) -> None:
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    def _put(self, message: str) -> None:
+        # Executado no event loop do assinante
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+_lock = threading.Lock()
+_subscribers: Set[Subscriber] = set()
+# Checagem de versão (watch_versions): última versão lida do banco e as versões
+# publicadas neste processo depois dela (None: ainda sem leitura)
+_polled_version: Optional[int] = None
+_local_versions: Set[int] = set()
+
+
+def _set_polled_version(version: int) -> None:
+    """Nova base da checagem (chamar com _lock)."""
+    global _polled_version, _local_versions
+    _polled_version = version
+    _local_versions = {v for v in _local_versions if v > version}
+
+
+def _check_remote_writes(version: int) -> bool:
+    """Registra a versão lida do banco; True se outro processo escreveu desde a leitura anterior.
+
+    Cada escrita gera uma versão nova, então houve escrita de fora quando a versão andou
+    mais que as publicadas aqui no intervalo. Uma escrita local lida antes do seu publish
+    conta como de fora (um ``reset`` a mais, nunca a menos).
+    """
+    with _lock:
+        if _polled_version is None or version <= _polled_version:
+            if _polled_version is None:
+                _set_polled_version(version)
+            return False
+        local = sum(1 for v in _local_versions if v <= version)
+        remote = version - _polled_version > local
+        _set_polled_version(version)
+        return remote
+
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """Monta uma mensagem no formato text/event-stream."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def subscriber_count() -> int:
+    return len(_subscribers)
+
+
+_subscribers_gauge = metrics_service.gauge("sse_subscribers", "Clientes conectados em /api/events")
+metrics_service.add_collector(lambda: _subscribers_gauge.set(subscriber_count()))
+
+
+def subscribe(version: int = 0) -> Subscriber:
+    """Registra um cliente (chamar dentro do event loop); ``version`` é a versão enviada no hello."""
+    subscriber = Subscriber(asyncio.get_running_loop())
+    with _lock:
+        if not _subscribers:
+            # Sem clientes a checagem fica parada: recomeça da versão enviada no hello
+            _set_polled_version(version)
+        _subscribers.add(subscriber)
+    return subscriber
+
+
+def unsubscribe(subscriber: Subscriber) -> None:
+    with _lock:
+        _subscribers.discard(subscriber)
+
+
+def publish(action: str, ids: List[int], version: int) -> None:
+    """Envia o evento a todos os clientes. Pode ser chamada de qualquer thread (ex: rotas síncronas)."""
+    with _lock:
+        if _polled_version is not None and version > _polled_version:
+            _local_versions.add(version)
+        subscribers = list(_subscribers)
+    if not subscribers:
+        return
+    message = format_event(action, {"type": action, "ids": ids, "version": version}, event_id=version)
+    for subscriber in subscribers:
+        try:
+            subscriber.loop.call_soon_threadsafe(subscriber._put, message)
+        except RuntimeError:
+            # Event loop já encerrado
+            unsubscribe(subscriber)
+
+
+def close_all() -> None:
+    """Encerra todos os streams (desligamento do servidor). Pode ser chamada de qualquer thread."""
+    with _lock:
+        subscribers = list(_subscribers)
+    for subscriber in subscribers:
+        try:
+            subscriber.loop.call_soon_threadsafe(subscriber._close)
+        except RuntimeError:
+            unsubscribe(subscriber)
+
+
+def install_shutdown_hook() -> None:
+    """Encadeia close_all aos handlers de SIGINT/SIGTERM instalados pelo uvicorn.
+
+    Sem isso o uvicorn espera os streams abertos terminarem antes de desligar.
+    Chamar no startup (só tem efeito na thread principal).
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(sig)
+        if not callable(previous):
+            continue
+
+        def handler(signum, frame, previous=previous):
+            close_all()
+            previous(signum, frame)
+
+        signal.signal(sig, handler)
+
+
+async def watch_versions(read_version: Callable[[], int], on_change: Callable[[int], None],
+                         interval: float) -> None:
+    """Verifica a versão do banco a cada ``interval`` s enquanto houver clientes conectados.
+
+    Se ela andou mais que as escritas publicadas aqui, houve escrita de outro processo
+    (outro worker ou outra instância no mesmo banco): chama ``on_change(versão)``. Roda
+    até ser cancelada.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if not _subscribers:
+            continue
+        try:
+            version = await asyncio.to_thread(read_version)
+        except Exception:
+            continue  # banco ocupado/indisponível: tenta de novo no próximo intervalo
+        if _check_remote_writes(version):
+            on_change(version)
+
+
+async def stream(subscriber: Subscriber, version: int, is_disconnected=None) -> AsyncIterator[str]:
+    """Gera as mensagens de um cliente: ``hello`` com a versão atual, os eventos e keep-alives."""
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        yield format_event("hello", {"type": "hello", "version": version}, event_id=version)
+        while True:
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                if is_disconnected is not None and await is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+            if subscriber.closed:
+                break
+            yield message
+            if subscriber.overflowed and subscriber.queue.empty():
+                # Eventos foram perdidos: o cliente deve recarregar tudo
+                subscriber.overflowed = False
+                yield format_event("reset", {"type": "reset"})
+    finally:
+        unsubscribe(subscriber)
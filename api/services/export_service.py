@@ -0,0 +1,167 @@
+"""Exportação de participantes em CSV, XLSX ou NDJSON, em streaming.
+
+Os participantes são lidos com cursor no servidor (crud.iter_participants) e
+escritos em blocos, então a memória não cresce com o tamanho da tabela.
+CSV e NDJSON começam a ser enviados imediatamente; o XLSX (formato zip) é
+montado em modo write_only num arquivo temporário e depois enviado.
+"""
+import csv
+import io
+import tempfile
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from database import crud
+from models.participant import ParticipantFilters
+from utils.responses import dumps, participant_to_dict
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # openpyxl é opcional: sem ele não há exportação XLSX
+    Workbook = None
+
+# Linhas por bloco enviado ao cliente
+EXPORT_CHUNK_ROWS = 500
+
+# (campo, cabeçalho) - os cabeçalhos são reconhecidos pela importação (services.import_service)
+EXPORT_COLUMNS = [
+    ("id", "ID"),
+    ("name", "Nome Completo"),
+    ("common_name", "Nome Usual"),
+    ("birth_date", "Data de Nascimento"),
+    ("instagram", "Instagram"),
+    ("address", "Endereço"),
+    ("neighborhood", "Bairro"),
+    ("email", "Email"),
+    ("phone", "Celular"),
+    ("sacraments", "Sacramentos"),
+    ("church_movement", "Movimento da Igreja"),
+    ("church_movement_info", "Informações do Movimento"),
+    ("father_name", "Nome do Pai"),
+    ("father_contact", "Contato do Pai"),
+    ("mother_name", "Nome da Mãe"),
+    ("mother_contact", "Contato da Mãe"),
+    ("ecc_participant", "ECC"),
+    ("ecc_info", "Informações ECC"),
+    ("has_restrictions", "Possui Restrições"),
+    ("restrictions_info", "Quais Restrições"),
+    ("observations", "Observações"),
+    ("photo_path", "Foto"),
+]
+
+# Relatório da cozinha (crud.get_restrictions_report)
+RESTRICTIONS_COLUMNS = [
+    ("id", "ID"),
+    ("name", "Nome Completo"),
+    ("common_name", "Nome Usual"),
+    ("restrictions_info", "Quais Restrições"),
+]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _cell(value):
+    if isinstance(value, bool):
+        return "Sim" if value else "Não"
+    return "" if value is None else value
+
+
+def _row(participant) -> list:
+    return [_cell(getattr(participant, field, None)) for field, _ in EXPORT_COLUMNS]
+
+
+def iter_csv(session_factory: Callable[[], Session], filters: Optional[ParticipantFilters] = None) -> Iterator[bytes]:
+    """Gera o CSV em blocos. Separador ';' e BOM UTF-8 para abrir direto no Excel em português."""
+    db = session_factory()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=";")
+        writer.writerow([label for _, label in EXPORT_COLUMNS])
+        yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        count = 0
+        for participant in crud.iter_participants(db, batch_size=EXPORT_CHUNK_ROWS, filters=filters):
+            writer.writerow(_row(participant))
+            count += 1
+            if count % EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+    finally:
+        db.close()
+
+
+def iter_ndjson(session_factory: Callable[[], Session], filters: Optional[ParticipantFilters] = None) -> Iterator[bytes]:
+    """Gera um objeto JSON (ParticipantResponse) por linha."""
+    db = session_factory()
+    try:
+        chunk = []
+        for participant in crud.iter_participants(db, batch_size=EXPORT_CHUNK_ROWS, filters=filters):
+            chunk.append(dumps(participant_to_dict(participant)))
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+    finally:
+        db.close()
+
+
+def iter_xlsx(session_factory: Callable[[], Session], filters: Optional[ParticipantFilters] = None) -> Iterator[bytes]:
+    """Monta o XLSX em modo write_only (memória constante) e envia o arquivo em blocos."""
+    with tempfile.TemporaryFile() as tmp:
+        db = session_factory()
+        try:
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet("Participantes")
+            sheet.append([label for _, label in EXPORT_COLUMNS])
+            for participant in crud.iter_participants(db, batch_size=EXPORT_CHUNK_ROWS, filters=filters):
+                sheet.append(_row(participant))
+            workbook.save(tmp)
+        finally:
+            db.close()
+        tmp.seek(0)
+        while True:
+            data = tmp.read(64 * 1024)
+            if not data:
+                break
+            yield data
+
+
+def iter_restrictions_csv(session_factory: Callable[[], Session], filters: Optional[ParticipantFilters] = None) -> Iterator[bytes]:
+    """Gera o CSV do relatório de restrições/alergias (mesmo formato do iter_csv)."""
+    db = session_factory()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=";")
+        writer.writerow([label for _, label in RESTRICTIONS_COLUMNS])
+        for row in crud.get_restrictions_report(db, filters=filters):
+            writer.writerow([_cell(getattr(row, field)) for field, _ in RESTRICTIONS_COLUMNS])
+        yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+    finally:
+        db.close()
+
+
+EXPORTERS = {
+    "csv": iter_csv,
+    "ndjson": iter_ndjson,
+    "xlsx": iter_xlsx,
+}
+
+
+def get_exporter(export_format: str) -> Callable[..., Iterator[bytes]]:
+    """Retorna o gerador do formato pedido (ValueError se inválido ou indisponível)."""
+    exporter = EXPORTERS.get(export_format)
+    if exporter is None:
+        raise ValueError("Formato inválido: use csv, xlsx ou ndjson")
+    if export_format == "xlsx" and Workbook is None:
+        raise ValueError("Exportação em XLSX requer o pacote 'openpyxl'")
+    return exporter
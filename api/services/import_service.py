@@ -0,0 +1,239 @@
+"""Importação em lote de participantes a partir de planilhas (CSV ou XLSX).
+
+As linhas são lidas de forma incremental, validadas com ParticipantCreate e
+inseridas em lotes: e-mail e telefone duplicados são checados em memória (dentro
+do arquivo) e contra o banco com consultas IN por lote, sem varrer a tabela.
+"""
+import codecs
+import csv
+import io
+import re
+import unicodedata
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from database import crud
+from models.participant import ParticipantCreate
+
+# Linhas validadas por transação
+IMPORT_BATCH_SIZE = 500
+
+# Cabeçalhos aceitos (normalizados: minúsculas, sem acento/pontuação) → campo do modelo
+HEADER_ALIASES = {
+    "name": "name", "nome": "name", "nomecompleto": "name",
+    "commonname": "common_name", "nomeusual": "common_name", "apelido": "common_name",
+    "comogostadesserchamado": "common_name", "comogostadesserchamadoa": "common_name",
+    "birthdate": "birth_date", "datadenascimento": "birth_date", "nascimento": "birth_date",
+    "instagram": "instagram",
+    "address": "address", "endereco": "address",
+    "neighborhood": "neighborhood", "bairro": "neighborhood", "bairrocomunidade": "neighborhood",
+    "email": "email", "enderecodeemail": "email",
+    "phone": "phone", "telefone": "phone", "celular": "phone", "whatsapp": "phone",
+    "sacraments": "sacraments", "sacramentos": "sacraments",
+    "churchmovement": "church_movement", "movimento": "church_movement",
+    "movimentodaigreja": "church_movement", "qualmovimento": "church_movement",
+    "churchmovementinfo": "church_movement_info", "informacoesdomovimento": "church_movement_info",
+    "fathername": "father_name", "nomedopai": "father_name", "pai": "father_name",
+    "fathercontact": "father_contact", "contatodopai": "father_contact", "telefonedopai": "father_contact",
+    "mothername": "mother_name", "nomedamae": "mother_name", "mae": "mother_name",
+    "mothercontact": "mother_contact", "contatodamae": "mother_contact", "telefonedamae": "mother_contact",
+    "eccparticipant": "ecc_participant", "ecc": "ecc_participant",
+    "seuspaissaoencontristasdoecc": "ecc_participant",
+    "eccinfo": "ecc_info", "informacoesecc": "ecc_info",
+    "hasrestrictions": "has_restrictions", "possuirestricoes": "has_restrictions",
+    "possuialgumarestricaoalimentaroualergia": "has_restrictions",
+    "restrictionsinfo": "restrictions_info", "restricoes": "restrictions_info",
+    "quaisrestricoes": "restrictions_info", "alergias": "restrictions_info",
+    "observations": "observations", "observacoes": "observations",
+    "photopath": "photo_path", "foto": "photo_path",
+}
+
+BOOLEAN_FIELDS = {"ecc_participant", "has_restrictions"}
+_TRUE_VALUES = {"sim", "s", "yes", "y", "true", "1", "x"}
+
+
+def _normalize_header(header: Any) -> str:
+    text = unicodedata.normalize("NFKD", str(header or "")).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def map_headers(headers: List[Any]) -> List[Optional[str]]:
+    """Converte os cabeçalhos da planilha em nomes de campo (None = coluna ignorada)."""
+    return [HEADER_ALIASES.get(_normalize_header(h)) for h in headers]
+
+
+def _parse_date(value: Any) -> Optional[str]:
+    """Aceita date/datetime, YYYY-MM-DD ou DD/MM/YYYY; devolve YYYY-MM-DD (ou o texto original)."""
+    if value is None or value == "":
+        return None
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    text = str(value).strip()
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return text
+
+
+def _row_to_data(fields: List[Optional[str]], values: Tuple) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
+    for field, value in zip(fields, values):
+        if field is None or field in data:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if field in BOOLEAN_FIELDS:
+            value = str(value).strip().lower() in _TRUE_VALUES if value not in (None, "") else False
+        elif field == "birth_date":
+            value = _parse_date(value)
+        elif value is not None and not isinstance(value, str):
+            value = str(value)
+        data[field] = value
+    return data
+
+
+def _iter_csv(file: BinaryIO) -> Iterator[Tuple]:
+    sample = file.read(64 * 1024)
+    file.seek(0)
+    try:
+        # final=False: um caractere multibyte cortado no fim da amostra não conta como erro
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError:
+        # Excel em português costuma salvar CSV em Windows-1252
+        encoding = "cp1252"
+    sample_text = sample.decode(encoding, errors="ignore")
+    try:
+        dialect = csv.Sniffer().sniff(sample_text, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(codecs.getreader(encoding)(file), dialect)
+    for row in reader:
+        yield tuple(row)
+
+
+def _iter_xlsx(file: BinaryIO) -> Iterator[Tuple]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Importação de XLSX requer o pacote 'openpyxl'")
+    # read_only: lê as linhas sob demanda, sem carregar a planilha inteira
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield row
+    finally:
+        workbook.close()
+
+
+def iter_spreadsheet_rows(file: BinaryIO, filename: str) -> Iterator[Tuple]:
+    """Itera as linhas (incluindo o cabeçalho) de um CSV ou XLSX."""
+    name = (filename or "").lower()
+    if name.endswith((".xlsx", ".xlsm")):
+        return _iter_xlsx(file)
+    if name.endswith((".csv", ".txt")) or not name:
+        return _iter_csv(file)
+    raise ValueError("Formato não suportado: envie um arquivo .csv ou .xlsx")
+
+
+def _format_validation_error(exc: ValidationError) -> List[str]:
+    messages = []
+    for err in exc.errors():
+        loc = ".".join(str(part) for part in err.get("loc", ()) if part != "__root__")
+        msg = str(err.get("msg", "")).replace("Value error, ", "")
+        messages.append(f"{loc}: {msg}" if loc else msg)
+    return messages
+
+
+def import_participants(db: Session, file: BinaryIO, filename: str, dry_run: bool = False) -> Dict[str, Any]:
+    """Importa participantes de uma planilha e retorna o relatório por linha.
+
+    ``row`` no relatório é o número da linha na planilha (o cabeçalho é a linha 1).
+    Com ``dry_run`` nada é gravado, mas todas as validações (inclusive duplicados) são feitas.
+    """
+    rows = iter_spreadsheet_rows(file, filename)
+    try:
+        headers = next(rows)
+    except StopIteration:
+        raise ValueError("Planilha vazia")
+    fields = map_headers(list(headers))
+    if "name" not in fields:
+        raise ValueError("Coluna de nome não encontrada (ex: 'Nome' ou 'Nome Completo')")
+
+    report: Dict[str, Any] = {
+        "total_rows": 0,
+        "imported": 0,
+        "duplicates": 0,
+        "invalid": 0,
+        "dry_run": dry_run,
+        "ignored_columns": [str(h) for h, f in zip(headers, fields) if f is None and h not in (None, "")],
+        "errors": [],
+    }
+    seen_emails: set = set()
+    seen_phones: set = set()
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    def flush():
+        if not batch:
+            return
+        taken_emails = crud.existing_emails(db, [d.get("email") for _, d in batch])
+        taken_phones = crud.existing_phones(db, [d.get("phone") for _, d in batch])
+        to_insert = []
+        for row_number, data in batch:
+            reasons = []
+            email = (data.get("email") or "").lower()
+            if email and email in taken_emails:
+                reasons.append("email: já existe um participante cadastrado com este e-mail")
+            phone = crud._normalize_phone(data.get("phone"))
+            if phone and phone in taken_phones:
+                reasons.append("phone: já existe um participante cadastrado com este telefone")
+            if reasons:
+                report["duplicates"] += 1
+                report["errors"].append({"row": row_number, "errors": reasons})
+            else:
+                to_insert.append(data)
+        if not dry_run:
+            crud.bulk_create_participants(db, to_insert)
+        report["imported"] += len(to_insert)
+        batch.clear()
+
+    for row_number, values in enumerate(rows, start=2):
+        if not values or all(v is None or str(v).strip() == "" for v in values):
+            continue
+        report["total_rows"] += 1
+        try:
+            participant = ParticipantCreate.model_validate(_row_to_data(fields, values))
+        except ValidationError as exc:
+            report["invalid"] += 1
+            report["errors"].append({"row": row_number, "errors": _format_validation_error(exc)})
+            continue
+        data = participant.model_dump()
+
+        # Duplicados dentro da própria planilha
+        reasons = []
+        email = (data.get("email") or "").lower()
+        phone = crud._normalize_phone(data.get("phone"))
+        if email and email in seen_emails:
+            reasons.append("email: e-mail repetido na planilha")
+        if phone and phone in seen_phones:
+            reasons.append("phone: telefone repetido na planilha")
+        if reasons:
+            report["duplicates"] += 1
+            report["errors"].append({"row": row_number, "errors": reasons})
+            continue
+        if email:
+            seen_emails.add(email)
+        if phone:
+            seen_phones.add(phone)
+
+        batch.append((row_number, data))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            flush()
+    flush()
+    report["errors"].sort(key=lambda e: e["row"])
+    return report
@@ -0,0 +1,167 @@
+"""Registro em memória da logo do evento.
+
+Evita listar o diretório da logo (ou consultar o banco e assinar URL no Supabase)
+a cada requisição: a logo atual fica guardada no processo e só é recarregada
+depois de upload ou remoção (``invalidate_logo_cache``) ou quando a versão das
+configurações (services.settings_service) muda em outro processo.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+from services.metrics_service import record_cache
+
+# Extensões aceitas para a logo e respectivo Content-Type
+LOGO_MEDIA_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".svg": "image/svg+xml",
+}
+
+# Logos até este tamanho ficam com os bytes em memória (servidas sem tocar no disco)
+MAX_INLINE_LOGO_BYTES = 512 * 1024
+
+# Margem antes de expirar a signed URL para gerar uma nova (segundos)
+SIGNED_URL_RENEW_MARGIN = 300
+
+
+@dataclass
+class LogoEntry:
+    """Logo atual: arquivo local e/ou path no Storage, tipo MIME, ETag e bytes (se pequena)."""
+    media_type: str
+    etag: str
+    path: Optional[Path] = None
+    content: Optional[bytes] = None
+    storage_path: Optional[str] = None
+    signed_url: Optional[str] = None
+    signed_url_expires_at: float = 0.0
+
+
+_lock = threading.Lock()
+_entry: Optional[LogoEntry] = None
+_loaded = False
+_settings_version: Optional[int] = None
+
+
+def media_type_for(filename: str) -> Optional[str]:
+    """Retorna o Content-Type da logo pela extensão, ou None se não for imagem suportada."""
+    return LOGO_MEDIA_TYPES.get(Path(filename).suffix.lower())
+
+
+def invalidate_logo_cache() -> None:
+    """Descarta a logo em memória (chamar após upload ou remoção)."""
+    global _entry, _loaded
+    with _lock:
+        _entry = None
+        _loaded = False
+
+
+def _load_local_logo() -> Optional[LogoEntry]:
+    """Procura a logo no diretório local (feito só quando o cache está vazio)."""
+    logo_dir = settings.LOGO_DIR
+    if not logo_dir.exists():
+        return None
+    for logo_file in sorted(logo_dir.glob("*")):
+        media_type = media_type_for(logo_file.name)
+        if not media_type or not logo_file.is_file():
+            continue
+        stat = logo_file.stat()
+        if stat.st_size <= MAX_INLINE_LOGO_BYTES:
+            content = logo_file.read_bytes()
+            etag = f'"{hashlib.sha1(content).hexdigest()}"'
+            return LogoEntry(media_type=media_type, etag=etag, path=logo_file, content=content)
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        return LogoEntry(media_type=media_type, etag=etag, path=logo_file)
+    return None
+
+
+def _load_storage_logo(db) -> Optional[LogoEntry]:
+    """Lê o path da logo no banco (Supabase); a signed URL é gerada sob demanda."""
+    from services.storage_service import get_logo_path_from_db
+
+    storage_path = get_logo_path_from_db(db)
+    if not storage_path:
+        return None
+    media_type = media_type_for(storage_path) or "image/png"
+    etag = f'"{hashlib.sha1(storage_path.encode()).hexdigest()}"'
+    return LogoEntry(media_type=media_type, etag=etag, storage_path=storage_path)
+
+
+def get_logo(db=None) -> Optional[LogoEntry]:
+    """Retorna a logo atual a partir do cache, carregando-a na primeira chamada."""
+    global _entry, _loaded, _settings_version
+    version = None
+    if db is not None:
+        from services.settings_service import settings_version
+        try:
+            version = settings_version(db)
+        except Exception as e:
+            print(f"⚠ Erro ao ler versão das configurações: {e}")
+    if _loaded and (version is None or version == _settings_version):
+        record_cache("logo", hit=True)
+        return _entry
+    record_cache("logo", hit=False)
+    from services.storage_service import use_supabase_storage
+
+    with _lock:
+        if not _loaded or (version is not None and version != _settings_version):
+            entry = None
+            if use_supabase_storage() and db is not None:
+                try:
+                    entry = _load_storage_logo(db)
+                except Exception as e:
+                    print(f"⚠ Erro ao obter logo do banco: {e}")
+            if entry is None:
+                entry = _load_local_logo()
+            _entry = entry
+            _loaded = True
+            _settings_version = version
+        return _entry
+
+
+def get_logo_signed_url(entry: LogoEntry) -> Optional[str]:
+    """Retorna a signed URL da logo no Storage, reaproveitando-a até perto de expirar."""
+    if not entry.storage_path:
+        return None
+    now = time.time()
+    if entry.signed_url and now < entry.signed_url_expires_at:
+        record_cache("logo_signed_url", hit=True)
+        return entry.signed_url
+    record_cache("logo_signed_url", hit=False)
+    from services.storage_service import get_signed_url, BUCKET_LOGO, SIGNED_URL_EXPIRES_IN
+
+    signed_url = get_signed_url(BUCKET_LOGO, entry.storage_path)
+    if signed_url:
+        entry.signed_url = signed_url
+        entry.signed_url_expires_at = now + SIGNED_URL_EXPIRES_IN - SIGNED_URL_RENEW_MARGIN
+    return signed_url
+
+
+def get_logo_file(db=None, download=None) -> Optional[Path]:
+    """Retorna um arquivo local com a logo (usado pelo PDF).
+
+    Para logo no Storage, ``download`` recebe a signed URL e devolve o Path baixado;
+    o arquivo fica guardado no cache e é reaproveitado nas próximas páginas/PDFs.
+    """
+    entry = get_logo(db)
+    if entry is None:
+        return None
+    if entry.path is not None and entry.path.exists():
+        return entry.path
+    if entry.storage_path and download is not None:
+        signed_url = get_logo_signed_url(entry)
+        if signed_url:
+            path = download(signed_url)
+            if path:
+                entry.path = path
+            return path
+    return None
@@ -0,0 +1,235 @@
+"""Métricas em memória do processo, expostas em /api/metrics no formato texto do Prometheus.
+
+Contadores, gauges e histogramas simples (sem dependência externa), seguros entre
+threads. Cada subsistema registra os seus na importação; ``render`` monta o
+texto. Com vários workers cada processo tem as próprias métricas.
+
+Métricas alimentadas aqui:
+    http_*            middleware.timing (latência por rota, requisições em andamento, status)
+    db_*              eventos do engine do SQLAlchemy (consultas e tempo, total e por requisição)
+    pdf_*             services.pdf_service (páginas e tempo por tipo de PDF)
+    storage_*         services.storage_service (chamadas ao Supabase Storage)
+    cache_requests_*  acertos/erros dos caches (signed URL, logo, miniaturas, estatísticas)
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Limites (segundos) dos histogramas de latência
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+_lock = threading.Lock()
+_metrics: Dict[str, "_Metric"] = {}
+_collectors: List[Callable[[], None]] = []
+_started_at = time.time()
+
+
+def _label_key(labelnames: Tuple[str, ...], labels: dict) -> Tuple[str, ...]:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # por conjunto de labels: [contagem por faixa..., soma, total]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(self.labelnames, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                data[index] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(data)) for key, data in self._values.items())
+        lines = []
+        for key, data in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {int(data[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(data[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {int(data[-1])}")
+        return lines
+
+
+def _register(metric):
+    with _lock:
+        existing = _metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        _metrics[metric.name] = metric
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    return _register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+    return _register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, documentation, labelnames, buckets))
+
+
+def add_collector(collector: Callable[[], None]) -> None:
+    """Função chamada antes de montar /api/metrics (para gauges lidos sob demanda)."""
+    _collectors.append(collector)
+
+
+def render() -> str:
+    """Todas as métricas no formato texto do Prometheus (text/plain; version=0.0.4)."""
+    uptime.set(time.time() - _started_at)
+    for collector in list(_collectors):
+        try:
+            collector()
+        except Exception:
+            pass
+    lines: List[str] = []
+    with _lock:
+        metrics = sorted(_metrics.values(), key=lambda m: m.name)
+    for metric in metrics:
+        lines.extend(metric.header())
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+uptime = gauge("process_uptime_seconds", "Tempo desde o início do processo")
+
+cache_requests = counter(
+    "cache_requests_total", "Consultas a caches em memória por resultado (hit/miss)", ("cache", "result")
+)
+
+
+def record_cache(cache: str, hit: bool, count: int = 1) -> None:
+    if count:
+        cache_requests.inc(count, cache=cache, result="hit" if hit else "miss")
+
+
+# Consultas ao banco da requisição atual: [quantidade, segundos] (definido pelo middleware)
+_request_db: ContextVar[Optional[List[float]]] = ContextVar("request_db", default=None)
+
+db_queries = counter("db_queries_total", "Comandos SQL executados")
+db_query_seconds = histogram("db_query_duration_seconds", "Duração dos comandos SQL")
+
+
+def start_request_db_stats() -> Tuple[List[float], object]:
+    """Começa a contar as consultas da requisição (o contexto é herdado pelo threadpool)."""
+    stats = [0, 0.0]
+    return stats, _request_db.set(stats)
+
+
+def end_request_db_stats(token) -> None:
+    _request_db.reset(token)
+
+
+def record_db_query(seconds: float) -> None:
+    db_queries.inc()
+    db_query_seconds.observe(seconds)
+    stats = _request_db.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += seconds
+
+
+def instrument_engine(engine) -> None:
+    """Mede cada comando SQL do engine (eventos before/after_cursor_execute)."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("_metrics_started")
+        if started:
+            record_db_query(time.perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("_metrics_started") if context.connection is not None else None
+        if started:
+            started.pop()
@@ -0,0 +1,131 @@
+"""Profiler opcional da geração de PDFs (services.pdf_service).
+
+Ligado por requisição (``?profile=1`` nas rotas de PDF) ou para todas (PDF_PROFILE=1).
+Registra o tempo de cada etapa (resolver, validar e desenhar imagens, wrapOn/drawOn
+das tabelas, seções da ficha, save do canvas), o tempo de cada participante e os
+bytes das imagens embutidas. O resumo vai no cabeçalho X-PDF-Profile e o detalhe
+num JSON ao lado do PDF (``<pdf>.profile.json``). Com PDF_PROFILE_PSTATS=1 o PDF
+completo também grava um dump do cProfile (``<pdf>.pstats``; abrir com
+``python -m pstats`` ou snakeviz).
+
+As etapas podem se aninhar (uma seção inclui o wrapOn das suas tabelas), então a
+soma das etapas passa do total. Desligado, o PDFService não cria perfil nenhum.
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Participantes mais lentos listados no JSON
+SLOWEST_PARTICIPANTS = 20
+
+
+class RenderProfile:
+    """Tempos por etapa e por participante de um PDF, e bytes das imagens embutidas."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.pages = 0
+        self.pdf_bytes = 0
+        self.phases: Dict[str, List[float]] = {}  # etapa -> [chamadas, segundos]
+        self.participants: List[Tuple[int, float]] = []
+        self.images: Dict[str, int] = {}  # imagem -> bytes (cada imagem conta uma vez)
+        self.images_drawn = 0
+        self._lock = threading.Lock()  # miniaturas são geradas em paralelo
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            data = self.phases.setdefault(name, [0, 0.0])
+            data[0] += 1
+            data[1] += seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - started)
+
+    @contextmanager
+    def participant(self, participant_id: int) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.participants.append((participant_id, time.perf_counter() - started))
+
+    def add_image(self, key: str, size: int, drawn: bool = True) -> None:
+        """Registra uma imagem embutida (``size`` em bytes) e, se ``drawn``, mais um desenho dela."""
+        with self._lock:
+            self.images.setdefault(key, size)
+            if drawn:
+                self.images_drawn += 1
+
+    def finish(self, pages: int, pdf_path: Optional[Path] = None) -> None:
+        self.seconds = time.perf_counter() - self.started
+        self.pages = pages
+        if pdf_path is not None and pdf_path.exists():
+            self.pdf_bytes = pdf_path.stat().st_size
+
+    def summary(self) -> dict:
+        """Resumo curto (cabeçalho X-PDF-Profile): total, páginas, imagens e as etapas mais lentas."""
+        slowest = sorted(self.phases.items(), key=lambda item: item[1][1], reverse=True)[:6]
+        return {
+            "kind": self.kind,
+            "ms": round(self.seconds * 1000, 1),
+            "pages": self.pages,
+            "participants": len(self.participants),
+            "images": len(self.images),
+            "image_bytes": sum(self.images.values()),
+            "pdf_bytes": self.pdf_bytes,
+            "phases_ms": {name: round(data[1] * 1000, 1) for name, data in slowest},
+        }
+
+    def to_dict(self) -> dict:
+        participants = sorted(self.participants, key=lambda item: item[1], reverse=True)
+        total = sum(seconds for _, seconds in self.participants)
+        return {
+            **self.summary(),
+            "phases": {
+                name: {"calls": int(calls), "ms": round(seconds * 1000, 2)}
+                for name, (calls, seconds) in sorted(self.phases.items())
+            },
+            "images_drawn": self.images_drawn,
+            "participant_ms": {
+                "mean": round(total / len(participants) * 1000, 2) if participants else 0,
+                "max": round(participants[0][1] * 1000, 2) if participants else 0,
+                "slowest": [
+                    {"id": participant_id, "ms": round(seconds * 1000, 2)}
+                    for participant_id, seconds in participants[:SLOWEST_PARTICIPANTS]
+                ],
+            },
+        }
+
+    def header_value(self) -> str:
+        return json.dumps(self.summary(), separators=(",", ":"), ensure_ascii=True)
+
+    def save(self, pdf_path: Path) -> Path:
+        """Grava o detalhamento em ``<pdf>.profile.json``."""
+        sidecar = pdf_path.with_name(pdf_path.name + ".profile.json")
+        sidecar.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        return sidecar
+
+
+@contextmanager
+def pstats_dump(pdf_path: Path) -> Iterator[None]:
+    """Roda o bloco sob o cProfile e grava o resultado em ``<pdf>.pstats``."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(pdf_path.with_name(pdf_path.name + ".pstats")))
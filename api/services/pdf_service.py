@@ -1,24 +1,70 @@
 """Serviço para geração de PDFs"""
 import datetime
+import io
+import logging
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import urllib.request
+from contextlib import nullcontext
 from pathlib import Path
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import Table, TableStyle, Paragraph
+from reportlab.platypus import Table, TableStyle, Paragraph, SimpleDocTemplate, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.colors import HexColor, black, white
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from config import settings
 from database import crud
+from models.participant import ParticipantFilters, SACRAMENT_COLUMNS
+from services import metrics_service
+from services.pdf_profiler import RenderProfile, pstats_dump
+
+logger = logging.getLogger(__name__)
+
+_pdf_pages = metrics_service.counter("pdf_pages_total", "Páginas de PDF geradas", ("kind",))
+_pdf_seconds = metrics_service.counter("pdf_render_seconds_total", "Tempo gasto gerando PDFs (s)", ("kind",))
+_pdf_seconds_per_page = metrics_service.histogram(
+    "pdf_seconds_per_page", "Tempo de geração por página de PDF (s)", ("kind",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# Crachás: grade por página A4 e tamanho de cada crachá (padrão 90 x 55 mm)
+BADGE_COLUMNS = 2
+BADGE_ROWS = 5
+BADGE_WIDTH = 90 * mm
+BADGE_HEIGHT = 55 * mm
+BADGE_BATCH_SIZE = 200  # participantes lidos do banco por vez
+# Miniatura da foto (px): ~150 dpi no tamanho impresso, mantém o PDF pequeno
+THUMBNAIL_SIZE = (150, 180)
+# Limite (px) da logo embutida em crachás e listas (impressa com ~40 mm de largura)
+LOGO_MAX_PIXELS = (600, 600)
+# Fotos baixadas/reduzidas em paralelo (Storage remoto é limitado pela rede)
+PHOTO_FETCH_WORKERS = 8
+# Lista de fotos da equipe: grade por página A4
+ROSTER_COLUMNS = 4
+ROSTER_ROWS = 5
+
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 class PDFService:
     """Classe responsável pela geração de PDFs"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, profile: bool = False):
         self.db = db
+        # Profiler de renderização (services.pdf_profiler): ?profile=1 nas rotas ou PDF_PROFILE
+        self.profiling = profile or settings.PDF_PROFILE
+        self.profile: Optional[RenderProfile] = None
         # Criar estilo de parágrafo para quebra de texto
         self.paragraph_style = ParagraphStyle(
             'Custom',
@@ -29,21 +75,61 @@ class PDFService:
             alignment=0,  # LEFT
         )
     
+    def _start_profile(self, kind: str) -> None:
+        self.profile = RenderProfile(kind) if self.profiling else None
+    
+    def _phase(self, name: str):
+        """Mede uma etapa da renderização (sem custo com o profiler desligado)."""
+        return self.profile.phase(name) if self.profile is not None else nullcontext()
+    
+    def _participant(self, participant_id: int):
+        return self.profile.participant(participant_id) if self.profile is not None else nullcontext()
+    
+    def _add_image(self, key, size: int, drawn: bool = True) -> None:
+        if self.profile is not None:
+            self.profile.add_image(str(key), size, drawn)
+    
+    def profile_headers(self) -> Dict[str, str]:
+        """Cabeçalhos com o resumo do profiler para a resposta (vazio se desligado)."""
+        if self.profile is None:
+            return {}
+        return {"X-PDF-Profile": self.profile.header_value()}
+    
+    def _record_render(self, kind: str, started: float, pages: int, pdf_path: Optional[Path] = None) -> None:
+        """Registra páginas e tempo do PDF gerado (métricas de /api/metrics) e fecha o perfil, se houver."""
+        elapsed = time.perf_counter() - started
+        _pdf_pages.inc(pages, kind=kind)
+        _pdf_seconds.inc(elapsed, kind=kind)
+        if pages:
+            _pdf_seconds_per_page.observe(elapsed / pages, kind=kind)
+        logger.debug("PDF %s: %s página(s) em %.3fs", kind, pages, elapsed)
+        if self.profile is not None and pdf_path is not None:
+            self.profile.finish(pages, pdf_path)
+            try:
+                sidecar = self.profile.save(pdf_path)
+                logger.info("Perfil do PDF %s: %s", kind, sidecar.name, extra=self.profile.summary())
+            except OSError as e:
+                logger.warning("Erro ao gravar perfil do PDF: %s", e)
+    
     def _resolve_image_to_path(self, path_or_url: Optional[str]) -> Optional[Path]:
         """Converte path ou URL em Path local. URL = baixa para temp; path Supabase = signed URL depois baixa."""
+        return self._resolve_image(path_or_url)[0]
+
+    def _resolve_image(self, path_or_url: Optional[str]) -> Tuple[Optional[Path], bool]:
+        """Como _resolve_image_to_path, indicando também se o arquivo foi baixado para temp (apagar depois)."""
         if not path_or_url or not str(path_or_url).strip():
-            return None
+            return None, False
         s = str(path_or_url).strip()
         if s.startswith("http://") or s.startswith("https://"):
-            return self._download_url_to_temp(s)
+            return self._download_url_to_temp(s), True
         try:
             from services.storage_service import use_supabase_storage, get_signed_url, BUCKET_PHOTOS
             if use_supabase_storage():
                 signed_url = get_signed_url(BUCKET_PHOTOS, s)
                 if signed_url:
-                    return self._download_url_to_temp(signed_url)
+                    return self._download_url_to_temp(signed_url), True
         except Exception as e:
-            print(f"⚠ Erro ao obter signed URL para foto ({s}): {e}")
+            logger.warning("Erro ao obter signed URL para foto (%s): %s", s, e)
         if Path(s).is_absolute():
             p = Path(s)
         else:
@@ -54,13 +140,14 @@ class PDFService:
                 p = settings.LOGO_DIR / s
             if not p.exists():
                 p = settings.LOGO_DIR / Path(s).name
-        return p if p.exists() else None
+        return (p if p.exists() else None), False
 
     def _download_url_to_temp(self, url: str) -> Optional[Path]:
         """Baixa uma URL para arquivo temporário e retorna o Path."""
         try:
+            from services.storage_service import measure_storage_call
             req = urllib.request.Request(url, headers={"User-Agent": "EJC-API/1.0"})
-            with urllib.request.urlopen(req, timeout=15) as resp:
+            with measure_storage_call("download"), urllib.request.urlopen(req, timeout=15) as resp:
                 data = resp.read()
             suffix = Path(url).suffix or ".png"
             if suffix not in (".png", ".jpg", ".jpeg", ".gif", ".webp"):
@@ -70,34 +157,17 @@ class PDFService:
             tmp.close()
             return Path(tmp.name)
         except Exception as e:
-            print(f"⚠ Erro ao baixar imagem de URL: {e}")
+            logger.warning("Erro ao baixar imagem de URL: %s", e)
             return None
 
     def _get_logo_path(self) -> Optional[Path]:
-        """Busca a logo: Supabase = path no banco → signed URL → download; senão diretório local."""
+        """Busca a logo no cache em memória (services.logo_cache); Supabase baixa uma única vez."""
         try:
-            from services.storage_service import (
-                use_supabase_storage,
-                get_logo_path_from_db,
-                get_signed_url,
-                BUCKET_LOGO,
-            )
-            if use_supabase_storage():
-                logo_path = get_logo_path_from_db(self.db)
-                if logo_path:
-                    signed_url = get_signed_url(BUCKET_LOGO, logo_path)
-                    if signed_url:
-                        return self._resolve_image_to_path(signed_url)
+            from services.logo_cache import get_logo_file
+            return get_logo_file(self.db, download=self._download_url_to_temp)
         except Exception as e:
-            print(f"⚠ Erro ao obter logo do banco: {e}")
-        logo_dir = settings.DATA_DIR / "logo"
-        if not logo_dir.exists():
+            logger.warning("Erro ao obter logo: %s", e)
             return None
-        image_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg']
-        for logo_file in logo_dir.glob("*"):
-            if logo_file.suffix.lower() in image_extensions and logo_file.exists():
-                return logo_file
-        return None
     
     def _wrap_text(self, text, max_width):
         """Envolve texto longo usando Paragraph para quebra automática"""
@@ -108,6 +178,15 @@ class PDFService:
         para = Paragraph(text, self.paragraph_style)
         return para
     
+    def _place_table(self, c, table, width, y_position):
+        """Desenha a tabela de uma seção logo abaixo de y_position e retorna a nova posição"""
+        with self._phase("tabela_wrapOn"):
+            table.wrapOn(c, width - 60, 400)
+        y_position -= table._height
+        with self._phase("tabela_drawOn"):
+            table.drawOn(c, 30, y_position)
+        return y_position
+    
     def _draw_table_with_height(self, c, table, x, y, width):
         """Desenha uma tabela e retorna sua altura real após wrapOn"""
         table.wrapOn(c, width, 400)
@@ -121,66 +200,72 @@ class PDFService:
             return A4[1] - 50
         return y_position
     
+    def _draw_form(self, c, participant):
+        """Desenha a ficha de inscrição de um participante na página atual do canvas."""
+        width, height = A4
+        
+        # Adicionar cabeçalho
+        with self._phase("cabecalho"):
+            self._add_header(c, width, height, participant.photo_path)
+        
+        # Posição inicial após o cabeçalho
+        y_position = height - 100
+        
+        # Seções do formulário (observações só se houver)
+        sections = [
+            ("secao_pessoais", self._add_personal_info_section),
+            ("secao_sacramentos", self._add_sacraments_section),
+            ("secao_movimentos", self._add_church_movements_section),
+            ("secao_familia", self._add_family_info_section),
+            ("secao_ecc", self._add_ecc_section),
+            ("secao_restricoes", self._add_restrictions_section),
+        ]
+        if participant.observations:
+            sections.append(("secao_observacoes", self._add_observations_section))
+        for name, add_section in sections:
+            with self._phase(name):
+                y_position = add_section(c, participant, width, y_position)
+        
+        # Adicionar área de assinatura
+        with self._phase("assinatura"):
+            self._add_signature_area(c, width, y_position)
+    
     def generate_individual_pdf(self, participant_id: int) -> Optional[Path]:
         """Gera um PDF individual para um participante específico"""
         participant = crud.get_participant(self.db, participant_id)
         if not participant:
             return None
         
-        # Log para debug - verificar dados do participante
-        print(f"🔍 Debug - Dados do Participante ID {participant_id}:")
-        print(f"   Nome: {participant.name}")
-        print(f"   Data Nascimento: {participant.birth_date} (tipo: {type(participant.birth_date)})")
-        print(f"   Email: {participant.email} (tipo: {type(participant.email)})")
-        print(f"   Telefone: {participant.phone} (tipo: {type(participant.phone)})")
-        print(f"   Contato Pai: {participant.father_contact} (tipo: {type(participant.father_contact)})")
-        print(f"   Contato Mãe: {participant.mother_contact} (tipo: {type(participant.mother_contact)})")
+        logger.debug("Gerando ficha do participante %s", participant_id)
         
         # Criar nome do arquivo
         filename = f"ficha_{participant.id}_{participant.name.replace(' ', '_')}.pdf"
         pdf_path = settings.PDFS_DIR / filename
         
+        started = time.perf_counter()
+        self._start_profile("ficha")
         try:
             # Criar o PDF
             c = canvas.Canvas(str(pdf_path), pagesize=A4)
-            width, height = A4
             
             # Configurações iniciais
             c.setTitle(f"Ficha de Inscrição - {participant.name}")
             
-            # Adicionar cabeçalho
-            self._add_header(c, width, height, participant.photo_path)
-            
-            # Posição inicial após o cabeçalho
-            y_position = height - 100
-            
-            # Seções do formulário
-            y_position = self._add_personal_info_section(c, participant, width, y_position)
-            y_position = self._add_sacraments_section(c, participant, width, y_position)
-            y_position = self._add_church_movements_section(c, participant, width, y_position)
-            y_position = self._add_family_info_section(c, participant, width, y_position)
-            y_position = self._add_ecc_section(c, participant, width, y_position)
-            y_position = self._add_restrictions_section(c, participant, width, y_position)
+            with self._participant(participant.id):
+                self._draw_form(c, participant)
             
-            # Adicionar seção de observações se houver
-            if participant.observations:
-                y_position = self._add_observations_section(c, participant, width, y_position)
-            
-            # Adicionar área de assinatura
-            self._add_signature_area(c, width, y_position)
-            
-            c.save()
+            with self._phase("canvas_save"):
+                c.save()
+            self._record_render("ficha", started, c.getPageNumber() - 1, pdf_path)
             return pdf_path
             
         except Exception as e:
-            print(f"Erro ao gerar PDF: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Erro ao gerar PDF do participante %s", participant_id)
             return None
     
-    def generate_complete_pdf(self) -> Optional[Path]:
-        """Gera um PDF com todos os participantes"""
-        participants = crud.get_participants(self.db, skip=0, limit=1000)
+    def generate_complete_pdf(self, filters: Optional[ParticipantFilters] = None) -> Optional[Path]:
+        """Gera um PDF com todos os participantes (ou só os que atendem aos filtros)"""
+        participants = crud.get_participants(self.db, skip=0, limit=1000, filters=filters)
         
         if not participants:
             return None
@@ -188,44 +273,335 @@ class PDFService:
         # Criar nome do arquivo
         pdf_path = settings.PDFS_DIR / f"fichas_completas_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         
+        started = time.perf_counter()
+        self._start_profile("fichas")
         try:
-            # Criar o PDF
-            c = canvas.Canvas(str(pdf_path), pagesize=A4)
-            
-            for i, participant in enumerate(participants):
-                if i > 0:
-                    c.showPage()
-                
-                width, height = A4
+            # Com o profiler e PDF_PROFILE_PSTATS, grava também o cProfile da geração
+            with pstats_dump(pdf_path) if self.profile is not None and settings.PDF_PROFILE_PSTATS else nullcontext():
+                # Criar o PDF
+                c = canvas.Canvas(str(pdf_path), pagesize=A4)
                 
-                # Adicionar cabeçalho
-                self._add_header(c, width, height, participant.photo_path)
+                for i, participant in enumerate(participants):
+                    if i > 0:
+                        c.showPage()
+                    with self._participant(participant.id):
+                        self._draw_form(c, participant)
                 
-                # Posição inicial após o cabeçalho
-                y_position = height - 100
-                
-                # Seções do formulário
-                y_position = self._add_personal_info_section(c, participant, width, y_position)
-                y_position = self._add_sacraments_section(c, participant, width, y_position)
-                y_position = self._add_church_movements_section(c, participant, width, y_position)
-                y_position = self._add_family_info_section(c, participant, width, y_position)
-                y_position = self._add_ecc_section(c, participant, width, y_position)
-                y_position = self._add_restrictions_section(c, participant, width, y_position)
-                
-                # Adicionar seção de observações se houver
-                if participant.observations:
-                    y_position = self._add_observations_section(c, participant, width, y_position)
-                
-                # Adicionar área de assinatura
-                self._add_signature_area(c, width, y_position)
-            
-            c.save()
+                with self._phase("canvas_save"):
+                    c.save()
+            self._record_render("fichas", started, c.getPageNumber() - 1, pdf_path)
             return pdf_path
             
         except Exception as e:
-            print(f"Erro ao gerar PDF completo: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Erro ao gerar PDF completo")
+            return None
+    
+    def generate_restrictions_pdf(self, filters: Optional[ParticipantFilters] = None) -> Optional[Path]:
+        """Gera o relatório da cozinha: tabela com todos os participantes com restrições/alergias.
+        Usa SimpleDocTemplate (a tabela quebra entre páginas), com várias pessoas por folha.
+        """
+        rows = crud.get_restrictions_report(self.db, filters=filters)
+        pdf_path = settings.PDFS_DIR / f"restricoes_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        
+        started = time.perf_counter()
+        self._start_profile("restricoes")
+        try:
+            styles = getSampleStyleSheet()
+            widths = [25, 170, 110, A4[0] - 60 - 305]
+            
+            def lines(text, width):
+                # Quebra com simpleSplit (texto simples): bem mais rápido que um Paragraph por célula
+                return "\n".join(simpleSplit(text, "Helvetica", 9, width - 8))
+            
+            data = [["#", "Nome", "Como é chamado(a)", "Restrições / alergias"]]
+            for index, row in enumerate(rows, start=1):
+                data.append([
+                    str(index),
+                    lines(row.name or "", widths[1]),
+                    lines(row.common_name or "", widths[2]),
+                    "\n".join(lines(part, widths[3]) for part in (row.restrictions_info or "Não informado").splitlines()),
+                ])
+            
+            doc = SimpleDocTemplate(
+                str(pdf_path), pagesize=A4,
+                leftMargin=30, rightMargin=30, topMargin=30, bottomMargin=30,
+                title="Restrições alimentares e alergias",
+            )
+            table = Table(data, colWidths=widths, repeatRows=1)
+            table.setStyle(TableStyle([
+                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('LEADING', (0, 0), (-1, -1), 11),
+                ('TEXTCOLOR', (0, 0), (-1, 0), white),
+                ('BACKGROUND', (0, 0), (-1, 0), HexColor("#374151")),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('GRID', (0, 0), (-1, -1), 0.5, black),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [white, HexColor("#F3F4F6")]),
+                ('LEFTPADDING', (0, 0), (-1, -1), 4),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+                ('TOPPADDING', (0, 0), (-1, -1), 3),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+            ]))
+            generated_at = datetime.datetime.now().strftime("%d/%m/%Y %H:%M")
+            story = [
+                Paragraph("Restrições alimentares e alergias", styles["Title"]),
+                Paragraph(f"{len(rows)} participante(s) - gerado em {generated_at}", styles["Normal"]),
+                Spacer(1, 10),
+                table,
+            ]
+            with self._phase("doc_build"):
+                doc.build(story)
+            self._record_render("restricoes", started, doc.page, pdf_path)
+            return pdf_path
+        
+        except Exception as e:
+            logger.exception("Erro ao gerar relatório de restrições")
+            return None
+    
+    def _photo_thumbnail(self, photo_path: Optional[str], size=THUMBNAIL_SIZE) -> Optional[ImageReader]:
+        """Reduz a foto a uma miniatura JPEG (recorte central) para embutir no PDF."""
+        path, is_temp = self._resolve_image(photo_path)
+        if not path:
+            return None
+        try:
+            from PIL import Image, ImageOps
+            with Image.open(path) as img:
+                # draft: o JPEG já é decodificado em escala reduzida (1/2 a 1/8), bem mais rápido
+                img.draft("RGB", (size[0] * 2, size[1] * 2))
+                img = ImageOps.exif_transpose(img).convert("RGB")
+                thumb = ImageOps.fit(img, size, method=Image.Resampling.BILINEAR)
+            buffer = io.BytesIO()
+            thumb.save(buffer, format="JPEG", quality=80, optimize=True)
+            self._add_image(photo_path, buffer.tell(), drawn=False)
+            buffer.seek(0)
+            return ImageReader(buffer)
+        except Exception as e:
+            logger.warning("Foto inválida para miniatura (%s): %s", path, e)
+            return None
+        finally:
+            # Fotos baixadas (URL/Supabase) vão para arquivos temporários: apagar depois de usar
+            if is_temp:
+                path.unlink(missing_ok=True)
+    
+    def _prefetch_thumbnails(self, photo_paths: Iterable[Optional[str]], thumbnails: Dict) -> None:
+        """Busca e reduz em paralelo as fotos ainda não vistas; cada foto é processada uma vez só."""
+        photo_paths = [p for p in photo_paths if p]
+        missing = list(dict.fromkeys(p for p in photo_paths if p not in thumbnails))
+        metrics_service.record_cache("thumbnail", hit=True, count=len(photo_paths) - len(missing))
+        metrics_service.record_cache("thumbnail", hit=False, count=len(missing))
+        if not missing:
+            return
+        with self._phase("miniaturas"), ThreadPoolExecutor(max_workers=min(PHOTO_FETCH_WORKERS, len(missing))) as pool:
+            for photo_path, thumbnail in zip(missing, pool.map(self._photo_thumbnail, missing)):
+                thumbnails[photo_path] = thumbnail
+    
+    def _define_logo_form(self, c, max_width, max_height, name="logo") -> Optional[str]:
+        """Desenha a logo uma única vez como Form XObject; cada uso só referencia o form."""
+        with self._phase("imagem_resolver"):
+            logo_path = self._get_logo_path()
+        if not logo_path:
+            return None
+        try:
+            from PIL import Image
+            with Image.open(logo_path) as img:
+                img.thumbnail(LOGO_MAX_PIXELS)  # logo grande reduzida para o tamanho impresso
+                buffer = io.BytesIO()
+                img.save(buffer, format="PNG")
+            self._add_image(logo_path, buffer.tell())
+            buffer.seek(0)
+            logo = ImageReader(buffer)
+            logo_width, logo_height = logo.getSize()
+            scale = min(max_width / logo_width, max_height / logo_height)
+            c.beginForm(name, lowerx=0, lowery=0, upperx=max_width, uppery=max_height)
+            c.drawImage(logo, 0, max_height - logo_height * scale, width=logo_width * scale,
+                        height=logo_height * scale, mask='auto')
+            c.endForm()
+            return name
+        except Exception as e:
+            logger.warning("Erro ao preparar logo dos crachás: %s", e)
+            return None
+    
+    def _fit_font_size(self, text, font, max_width, start, minimum):
+        size = start
+        while size > minimum and stringWidth(text, font, size) > max_width:
+            size -= 1
+        return size
+    
+    def _draw_badge(self, c, participant, x, y, logo_form, thumbnails):
+        """Desenha um crachá com canto inferior esquerdo em (x, y)."""
+        padding = 4 * mm
+        c.setStrokeColor(HexColor("#9CA3AF"))
+        c.setDash(3, 3)  # linha de corte
+        c.rect(x, y, BADGE_WIDTH, BADGE_HEIGHT)
+        c.setDash()
+        
+        photo_width, photo_height = 25 * mm, 30 * mm
+        photo_y = y + (BADGE_HEIGHT - photo_height) / 2
+        thumbnail = thumbnails.get(participant.photo_path)
+        if thumbnail is not None:
+            with self._phase("imagem_drawImage"):
+                c.drawImage(thumbnail, x + padding, photo_y, width=photo_width, height=photo_height)
+            self._add_image(participant.photo_path, 0)
+        else:
+            c.setStrokeColor(HexColor("#D1D5DB"))
+            c.rect(x + padding, photo_y, photo_width, photo_height)
+        
+        text_x = x + padding + photo_width + padding
+        text_width = BADGE_WIDTH - (text_x - x) - padding
+        if logo_form:
+            c.saveState()
+            c.translate(text_x, y + BADGE_HEIGHT - padding - 12 * mm)
+            c.doForm(logo_form)
+            c.restoreState()
+        
+        display_name = (participant.common_name or participant.name.split(" ")[0]).strip()
+        size = self._fit_font_size(display_name, "Helvetica-Bold", text_width, 22, 10)
+        c.setFillColor(black)
+        c.setFont("Helvetica-Bold", size)
+        c.drawString(text_x, y + BADGE_HEIGHT / 2 - 4 * mm, display_name)
+        
+        full_name = participant.name
+        size = self._fit_font_size(full_name, "Helvetica", text_width, 9, 6)
+        lines = simpleSplit(full_name, "Helvetica", size, text_width)[:2]
+        c.setFont("Helvetica", size)
+        for i, line in enumerate(lines):
+            c.drawString(text_x, y + BADGE_HEIGHT / 2 - 10 * mm - i * (size + 2), line)
+    
+    def generate_badges_pdf(self, filters: Optional[ParticipantFilters] = None) -> Optional[Path]:
+        """Gera os crachás (nome usual, foto e logo), BADGE_COLUMNS x BADGE_ROWS por página A4.
+        Os participantes são lidos em lotes e cada foto vira uma miniatura; a logo é embutida uma vez.
+        """
+        pdf_path = settings.PDFS_DIR / f"crachas_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        per_page = BADGE_COLUMNS * BADGE_ROWS
+        page_width, page_height = A4
+        margin_x = (page_width - BADGE_COLUMNS * BADGE_WIDTH) / 2
+        margin_y = (page_height - BADGE_ROWS * BADGE_HEIGHT) / 2
+        
+        started = time.perf_counter()
+        self._start_profile("crachas")
+        try:
+            c = canvas.Canvas(str(pdf_path), pagesize=A4)
+            c.setTitle("Crachás")
+            logo_form = self._define_logo_form(c, 40 * mm, 12 * mm)
+            thumbnails = {}
+            count = 0
+            participants = crud.iter_participants(self.db, batch_size=BADGE_BATCH_SIZE, filters=filters)
+            for batch in _batched(participants, BADGE_BATCH_SIZE):
+                self._prefetch_thumbnails((p.photo_path for p in batch), thumbnails)
+                for participant in batch:
+                    slot = count % per_page
+                    if slot == 0 and count > 0:
+                        c.showPage()
+                    column, row = slot % BADGE_COLUMNS, slot // BADGE_COLUMNS
+                    x = margin_x + column * BADGE_WIDTH
+                    y = page_height - margin_y - (row + 1) * BADGE_HEIGHT
+                    with self._participant(participant.id):
+                        self._draw_badge(c, participant, x, y, logo_form, thumbnails)
+                    count += 1
+            if count == 0:
+                return None
+            with self._phase("canvas_save"):
+                c.save()
+            self._record_render("crachas", started, c.getPageNumber() - 1, pdf_path)
+            return pdf_path
+        
+        except Exception as e:
+            logger.exception("Erro ao gerar crachás")
+            return None
+    
+    def _define_placeholder_form(self, c, width, height) -> str:
+        """Silhueta para quem não tem foto, desenhada uma vez como Form XObject (vetorial)."""
+        c.beginForm("photo_placeholder", lowerx=0, lowery=0, upperx=width, uppery=height)
+        c.setFillColor(HexColor("#E5E7EB"))
+        c.rect(0, 0, width, height, stroke=False, fill=True)
+        c.setFillColor(HexColor("#9CA3AF"))
+        c.circle(width / 2, height * 0.62, width * 0.22, stroke=False, fill=True)
+        c.ellipse(width * 0.15, -height * 0.2, width * 0.85, height * 0.42, stroke=False, fill=True)
+        c.endForm()
+        return "photo_placeholder"
+    
+    def generate_roster_pdf(self, filters: Optional[ParticipantFilters] = None, title: Optional[str] = None) -> Optional[Path]:
+        """Gera a lista de fotos (grade ROSTER_COLUMNS x ROSTER_ROWS com foto e nome) de um grupo.
+        As miniaturas são buscadas em paralelo por lote; imagens repetidas (mesma foto, logo e
+        silhueta de quem não tem foto) entram no arquivo uma única vez.
+        """
+        pdf_path = settings.PDFS_DIR / f"lista_fotos_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        page_width, page_height = A4
+        margin = 15 * mm
+        header_height = 20 * mm
+        cell_width = (page_width - 2 * margin) / ROSTER_COLUMNS
+        cell_height = (page_height - 2 * margin - header_height) / ROSTER_ROWS
+        photo_width, photo_height = 30 * mm, 36 * mm
+        per_page = ROSTER_COLUMNS * ROSTER_ROWS
+        title = (title or "").strip() or "Participantes"
+        
+        def draw_page_header(page):
+            if logo_form:
+                c.saveState()
+                c.translate(margin, page_height - margin - 12 * mm)
+                c.doForm(logo_form)
+                c.restoreState()
+            c.setFillColor(black)
+            c.setFont("Helvetica-Bold", 16)
+            c.drawRightString(page_width - margin, page_height - margin - 8 * mm, title)
+            c.setFont("Helvetica", 8)
+            c.drawRightString(page_width - margin, page_height - margin - 13 * mm, f"Página {page}")
+        
+        started = time.perf_counter()
+        self._start_profile("lista_fotos")
+        try:
+            c = canvas.Canvas(str(pdf_path), pagesize=A4)
+            c.setTitle(title)
+            logo_form = self._define_logo_form(c, 40 * mm, 12 * mm)
+            placeholder_form = self._define_placeholder_form(c, photo_width, photo_height)
+            thumbnails = {}
+            count = 0
+            participants = crud.iter_participants(self.db, batch_size=per_page * 5, filters=filters)
+            for batch in _batched(participants, per_page * 5):
+                self._prefetch_thumbnails((p.photo_path for p in batch), thumbnails)
+                for participant in batch:
+                    slot = count % per_page
+                    if slot == 0:
+                        if count > 0:
+                            c.showPage()
+                        draw_page_header(count // per_page + 1)
+                    column, row = slot % ROSTER_COLUMNS, slot // ROSTER_COLUMNS
+                    x = margin + column * cell_width
+                    top = page_height - margin - header_height - row * cell_height
+                    photo_x = x + (cell_width - photo_width) / 2
+                    photo_y = top - 2 * mm - photo_height
+                    
+                    thumbnail = thumbnails.get(participant.photo_path)
+                    if thumbnail is not None:
+                        with self._phase("imagem_drawImage"):
+                            c.drawImage(thumbnail, photo_x, photo_y, width=photo_width, height=photo_height)
+                        self._add_image(participant.photo_path, 0)
+                    else:
+                        c.saveState()
+                        c.translate(photo_x, photo_y)
+                        c.doForm(placeholder_form)
+                        c.restoreState()
+                    
+                    text_width = cell_width - 4 * mm
+                    display_name = (participant.common_name or participant.name.split(" ")[0]).strip()
+                    size = self._fit_font_size(display_name, "Helvetica-Bold", text_width, 11, 7)
+                    c.setFillColor(black)
+                    c.setFont("Helvetica-Bold", size)
+                    c.drawCentredString(x + cell_width / 2, photo_y - 5 * mm, display_name)
+                    c.setFont("Helvetica", 7)
+                    for i, line in enumerate(simpleSplit(participant.name, "Helvetica", 7, text_width)[:2]):
+                        c.drawCentredString(x + cell_width / 2, photo_y - 9 * mm - i * 9, line)
+                    count += 1
+            if count == 0:
+                return None
+            with self._phase("canvas_save"):
+                c.save()
+            self._record_render("lista_fotos", started, c.getPageNumber() - 1, pdf_path)
+            return pdf_path
+        
+        except Exception as e:
+            logger.exception("Erro ao gerar lista de fotos")
             return None
     
     def _add_header(self, c, width, height, participant_photo_path=None):
@@ -245,40 +621,40 @@ class PDFService:
         photo_exists = False
         
         if participant_photo_path:
-            photo_full_path = self._resolve_image_to_path(participant_photo_path)
+            with self._phase("imagem_resolver"):
+                photo_full_path = self._resolve_image_to_path(participant_photo_path)
             if photo_full_path and photo_full_path.exists():
                 try:
                     from PIL import Image
                     img_valid = True
                     try:
-                        img = Image.open(photo_full_path)
-                        img.verify()
-                        img.close()
+                        with self._phase("imagem_verify"):
+                            img = Image.open(photo_full_path)
+                            img.verify()
+                            img.close()
                     except Exception as img_error:
-                        print(f"⚠ Foto inválida ou corrompida: {photo_full_path} - {img_error}")
+                        logger.warning("Foto inválida ou corrompida: %s - %s", photo_full_path, img_error)
                         img_valid = False
                     
                     if img_valid:
                         try:
-                            c.drawImage(
-                                str(photo_full_path),
-                                photo_x_position,
-                                height - 75,
-                                width=photo_width,
-                                height=photo_height,
-                                preserveAspectRatio=True,
-                                mask='auto'
-                            )
+                            with self._phase("imagem_drawImage"):
+                                c.drawImage(
+                                    str(photo_full_path),
+                                    photo_x_position,
+                                    height - 75,
+                                    width=photo_width,
+                                    height=photo_height,
+                                    preserveAspectRatio=True,
+                                    mask='auto'
+                                )
                             photo_exists = True
-                            print(f"✓ Foto adicionada ao PDF: {photo_full_path}")
-                        except Exception as draw_error:
-                            print(f"✗ Erro ao desenhar foto no PDF ({photo_full_path}): {draw_error}")
-                            import traceback
-                            traceback.print_exc()
-                except Exception as e:
-                    print(f"✗ Erro ao processar foto do participante ({photo_full_path}): {e}")
-                    import traceback
-                    traceback.print_exc()
+                            self._add_image(participant_photo_path, photo_full_path.stat().st_size)
+                            logger.debug("Foto adicionada ao PDF: %s", photo_full_path)
+                        except Exception:
+                            logger.exception("Erro ao desenhar foto no PDF (%s)", photo_full_path)
+                except Exception:
+                    logger.exception("Erro ao processar foto do participante (%s)", photo_full_path)
         
         # Título centralizado em branco
         title_x = width / 2
@@ -289,40 +665,40 @@ class PDFService:
         c.drawCentredString(title_x, height - 45, "Ficha de Inscrição EJC")
         
         # Adicionar logo se disponível (à direita)
-        logo_path = self._get_logo_path()
+        with self._phase("imagem_resolver"):
+            logo_path = self._get_logo_path()
         if logo_path and logo_path.exists():
-            print(f"🔍 Logo encontrada: {logo_path}")
+            logger.debug("Logo encontrada: %s", logo_path)
             try:
                 from PIL import Image
                 img_valid = True
                 try:
-                    img = Image.open(logo_path)
-                    img.verify()
-                    img.close()
+                    with self._phase("imagem_verify"):
+                        img = Image.open(logo_path)
+                        img.verify()
+                        img.close()
                 except Exception as img_error:
-                    print(f"⚠ Logo inválida ou corrompida: {logo_path} - {img_error}")
+                    logger.warning("Logo inválida ou corrompida: %s - %s", logo_path, img_error)
                     img_valid = False
                 
                 if img_valid:
                     try:
-                        c.drawImage(
-                            str(logo_path),
-                            width - 90,
-                            height - 75,
-                            width=70,
-                            height=70,
-                            preserveAspectRatio=True,
-                            mask='auto'
-                        )
-                        print(f"✓ Logo adicionada ao PDF: {logo_path}")
-                    except Exception as draw_error:
-                        print(f"✗ Erro ao desenhar logo no PDF ({logo_path}): {draw_error}")
-                        import traceback
-                        traceback.print_exc()
-            except Exception as e:
-                print(f"✗ Erro ao processar logo: {e}")
-                import traceback
-                traceback.print_exc()
+                        with self._phase("imagem_drawImage"):
+                            c.drawImage(
+                                str(logo_path),
+                                width - 90,
+                                height - 75,
+                                width=70,
+                                height=70,
+                                preserveAspectRatio=True,
+                                mask='auto'
+                            )
+                        self._add_image(logo_path, logo_path.stat().st_size)
+                        logger.debug("Logo adicionada ao PDF: %s", logo_path)
+                    except Exception:
+                        logger.exception("Erro ao desenhar logo no PDF (%s)", logo_path)
+            except Exception:
+                logger.exception("Erro ao processar logo")
         
         # Resetar cor de preenchimento
         c.setFillColor(black)
@@ -345,24 +721,14 @@ class PDFService:
         
         # Converter valores para string e garantir que não sejam None
         birth_date_raw = getattr(participant, 'birth_date', None)
-        email_raw = getattr(participant, 'email', None)
-        phone_raw = getattr(participant, 'phone', None)
-        
-        birth_date_str = safe_str(birth_date_raw)
-        email_str = safe_str(email_raw)
-        phone_str = safe_str(phone_raw)
-        
-        # Log para debug
-        print(f"🔍 Debug - Informações Pessoais (processando):")
-        print(f"   birth_date raw: {repr(birth_date_raw)} -> formatted: {repr(self._format_date(birth_date_str))}")
-        print(f"   email raw: {repr(email_raw)} -> final: {repr(email_str)}")
-        print(f"   phone raw: {repr(phone_raw)} -> final: {repr(phone_str)}")
+        email_str = safe_str(getattr(participant, 'email', None))
+        phone_str = safe_str(getattr(participant, 'phone', None))
         
         # Usar Paragraph para campos que podem ser longos
         data = [
             ["Nome Completo", safe_str(getattr(participant, 'name', None))],
             ["Nome Usual", safe_str(getattr(participant, 'common_name', None))],
-            ["Data de Nascimento", self._format_date(birth_date_str)],
+            ["Data de Nascimento", self._format_date(birth_date_raw)],
             ["Instagram", safe_str(getattr(participant, 'instagram', None))],
             ["Endereço", self._wrap_text(safe_str(getattr(participant, 'address', None)), width - 160)],
             ["Bairro/Comunidade", safe_str(getattr(participant, 'neighborhood', None))],
@@ -370,18 +736,10 @@ class PDFService:
             ["Celular", phone_str]
         ]
         
-        # Log final dos dados que serão exibidos
-        print(f"🔍 Debug - Dados finais da tabela:")
-        for row in data:
-            print(f"   {row[0]}: {repr(row[1])}")
-        
         y_position -= 10
         table = Table(data, colWidths=[120, width - 160])
         table.setStyle(self._get_table_style())
-        table.wrapOn(c, width - 60, 400)
-        table_height = table._height
-        y_position -= table_height
-        table.drawOn(c, 30, y_position)
+        y_position = self._place_table(c, table, width, y_position)
         
         return y_position - 20
     
@@ -391,24 +749,15 @@ class PDFService:
         c.setFont("Helvetica-Bold", 12)
         c.drawString(30, y_position, "Sacramentos")
         
-        sacraments = participant.sacraments.split(',') if participant.sacraments else []
-        sacrament_data = []
-        
-        for sacrament_name in ["Batismo", "Primeira Eucaristia", "Crisma"]:
-            status = "Não Informado"
-            for s in sacraments:
-                if s.startswith(f"{sacrament_name}:"):
-                    status = s.split(':')[1].strip()
-                    break
-            sacrament_data.append([sacrament_name, status])
+        sacrament_data = [
+            [name, getattr(participant, column, None) or "Não Informado"]
+            for name, column in SACRAMENT_COLUMNS.items()
+        ]
         
         y_position -= 10
         table = Table(sacrament_data, colWidths=[120, width - 160])
         table.setStyle(self._get_table_style())
-        table.wrapOn(c, width - 60, 400)
-        table_height = table._height
-        y_position -= table_height
-        table.drawOn(c, 30, y_position)
+        y_position = self._place_table(c, table, width, y_position)
         
         return y_position - 20
     
@@ -452,10 +801,7 @@ class PDFService:
                 style.add('SPAN', (0, 3), (2, 3))  # Mesclar todas as colunas na linha de informações
         
         table.setStyle(style)
-        table.wrapOn(c, width - 60, 400)
-        table_height = table._height
-        y_position -= table_height
-        table.drawOn(c, 30, y_position)
+        y_position = self._place_table(c, table, width, y_position)
         
         return y_position - 20
     
@@ -475,22 +821,10 @@ class PDFService:
             return value_str
         
         # Converter valores para string e garantir que não sejam None
-        father_name_raw = getattr(participant, 'father_name', None)
-        father_contact_raw = getattr(participant, 'father_contact', None)
-        mother_name_raw = getattr(participant, 'mother_name', None)
-        mother_contact_raw = getattr(participant, 'mother_contact', None)
-        
-        father_name_str = safe_str(father_name_raw)
-        father_contact_str = safe_str(father_contact_raw)
-        mother_name_str = safe_str(mother_name_raw)
-        mother_contact_str = safe_str(mother_contact_raw)
-        
-        # Log para debug
-        print(f"🔍 Debug - Informações Familiares (processando):")
-        print(f"   father_name raw: {repr(father_name_raw)} -> final: {repr(father_name_str)}")
-        print(f"   father_contact raw: {repr(father_contact_raw)} -> final: {repr(father_contact_str)}")
-        print(f"   mother_name raw: {repr(mother_name_raw)} -> final: {repr(mother_name_str)}")
-        print(f"   mother_contact raw: {repr(mother_contact_raw)} -> final: {repr(mother_contact_str)}")
+        father_name_str = safe_str(getattr(participant, 'father_name', None))
+        father_contact_str = safe_str(getattr(participant, 'father_contact', None))
+        mother_name_str = safe_str(getattr(participant, 'mother_name', None))
+        mother_contact_str = safe_str(getattr(participant, 'mother_contact', None))
         
         data = [
             ["Nome do Pai", "Contato"],
@@ -499,11 +833,6 @@ class PDFService:
             [mother_name_str, mother_contact_str]
         ]
         
-        # Log final dos dados que serão exibidos
-        print(f"🔍 Debug - Dados finais da tabela familiar:")
-        for row in data:
-            print(f"   {row}")
-        
         y_position -= 10
         table = Table(data, colWidths=[(width - 60) * 0.7, (width - 60) * 0.3])
         
@@ -514,10 +843,7 @@ class PDFService:
         style.add('FONTNAME', (0, 2), (1, 2), 'Helvetica-Bold')
         
         table.setStyle(style)
-        table.wrapOn(c, width - 60, 400)
-        table_height = table._height
-        y_position -= table_height
-        table.drawOn(c, 30, y_position)
+        y_position = self._place_table(c, table, width, y_position)
         
         return y_position - 20
     
@@ -550,10 +876,7 @@ class PDFService:
             style.add('SPAN', (0, 2), (2, 2))  # Mesclar todas as colunas na linha de informações
         
         table.setStyle(style)
-        table.wrapOn(c, width - 60, 400)
-        table_height = table._height
-        y_position -= table_height
-        table.drawOn(c, 30, y_position)
+        y_position = self._place_table(c, table, width, y_position)
         
         return y_position - 20
     
@@ -586,10 +909,7 @@ class PDFService:
             style.add('SPAN', (0, 2), (2, 2))  # Mesclar todas as colunas na linha de informações
         
         table.setStyle(style)
-        table.wrapOn(c, width - 60, 400)
-        table_height = table._height
-        y_position -= table_height
-        table.drawOn(c, 30, y_position)
+        y_position = self._place_table(c, table, width, y_position)
         
         return y_position - 20
     
@@ -605,10 +925,7 @@ class PDFService:
         y_position -= 10
         table = Table(data, colWidths=[width - 60])
         table.setStyle(self._get_table_style())
-        table.wrapOn(c, width - 60, 400)
-        table_height = table._height
-        y_position -= table_height
-        table.drawOn(c, 30, y_position)
+        y_position = self._place_table(c, table, width, y_position)
         
         return y_position - 20
     
@@ -631,31 +948,9 @@ class PDFService:
         c.drawString(signature_x, y_position - line_height - 15, "Assinatura")
         c.drawString(date_x, y_position - line_height - 15, "Data")
     
-    def _format_date(self, date_str):
-        """Formata a data do formato ISO para o formato brasileiro"""
-        if not date_str or date_str == "None" or date_str == "":
-            return ""
-        
-        # Converter para string se não for
-        date_str = str(date_str).strip()
-        
-        if not date_str:
-            return ""
-        
-        try:
-            # Tentar formato ISO primeiro (YYYY-MM-DD)
-            date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-            return date_obj.strftime("%d/%m/%Y")
-        except ValueError:
-            # Se não for formato ISO, tentar outros formatos comuns
-            try:
-                # Tentar formato brasileiro (DD/MM/YYYY)
-                date_obj = datetime.datetime.strptime(date_str, "%d/%m/%Y")
-                return date_str  # Já está no formato correto
-            except ValueError:
-                # Se não conseguir parsear, retornar como está
-                print(f"⚠ Aviso: Não foi possível formatar a data: {date_str}")
-                return date_str
+    def _format_date(self, value):
+        """Formata a data de nascimento (date) no formato brasileiro"""
+        return value.strftime("%d/%m/%Y") if value else ""
     
     def _get_table_style(self):
         """Retorna o estilo padrão para tabelas"""
@@ -0,0 +1,177 @@
+"""Configurações do evento (chave/valor em event_settings) com cache em memória.
+
+As leituras vêm de um dicionário no processo; as escritas gravam no banco,
+incrementam a linha de versão (SETTINGS_VERSION_KEY) e descartam o cache.
+Com vários processos (workers), cada um confere a versão no banco no máximo a
+cada ``settings.SETTINGS_SYNC_INTERVAL`` segundos e recarrega se ela mudou.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from config import settings
+
+# Linha de event_settings usada como contador de versão (sinal entre processos)
+SETTINGS_VERSION_KEY = "settings_version"
+
+_TRUE_VALUES = {"1", "true", "sim", "yes", "on"}
+
+_lock = threading.Lock()
+_values: Optional[Dict[str, Optional[str]]] = None
+_version = 0
+_last_sync = 0.0
+
+
+def _read_version(db) -> int:
+    row = db.execute(
+        text("SELECT value FROM event_settings WHERE key = :key"), {"key": SETTINGS_VERSION_KEY}
+    ).first()
+    try:
+        return int(row[0]) if row and row[0] is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def _load(db) -> None:
+    """Carrega todas as configurações do banco para o cache."""
+    global _values, _version, _last_sync
+    from models.event_setting import EventSetting
+
+    rows = db.query(EventSetting.key, EventSetting.value).all()
+    values = {key: value for key, value in rows}
+    try:
+        version = int(values.pop(SETTINGS_VERSION_KEY, None) or 0)
+    except ValueError:
+        version = 0
+    _values = values
+    _version = version
+    _last_sync = time.monotonic()
+
+
+def _ensure_loaded(db) -> Dict[str, Optional[str]]:
+    """Garante o cache carregado e, se habilitado, sincronizado com a versão no banco."""
+    global _last_sync
+    values = _values
+    interval = settings.SETTINGS_SYNC_INTERVAL
+    if values is not None and (interval <= 0 or time.monotonic() - _last_sync < interval):
+        return values
+    with _lock:
+        if _values is None:
+            _load(db)
+        elif interval > 0 and time.monotonic() - _last_sync >= interval:
+            if _read_version(db) != _version:
+                _load(db)
+            else:
+                _last_sync = time.monotonic()
+        return _values
+
+
+def invalidate_settings_cache() -> None:
+    """Descarta o cache local (a próxima leitura recarrega do banco)."""
+    global _values
+    with _lock:
+        _values = None
+
+
+def settings_version(db) -> int:
+    """Versão atual das configurações (muda a cada escrita, em qualquer processo)."""
+    _ensure_loaded(db)
+    return _version
+
+
+def bump_settings_version(db) -> None:
+    """Incrementa a linha de versão (sem commit) para avisar outros processos."""
+    from models.event_setting import EventSetting
+
+    result = db.execute(
+        text(
+            "UPDATE event_settings SET value = CAST(CAST(value AS INTEGER) + 1 AS VARCHAR(20)) "
+            "WHERE key = :key"
+        ),
+        {"key": SETTINGS_VERSION_KEY},
+    )
+    if result.rowcount == 0:
+        try:
+            with db.begin_nested():
+                db.add(EventSetting(key=SETTINGS_VERSION_KEY, value="1"))
+        except IntegrityError:
+            # Outro processo criou a linha ao mesmo tempo
+            bump_settings_version(db)
+
+
+def touch_settings(db) -> None:
+    """Sinaliza mudança relacionada às configurações (ex: logo local trocada) para todos os processos."""
+    bump_settings_version(db)
+    db.commit()
+    invalidate_settings_cache()
+
+
+def _encode(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def get_setting(db, key: str, default: Optional[str] = None) -> Optional[str]:
+    """Lê uma configuração como texto (do cache)."""
+    value = _ensure_loaded(db).get(key)
+    return default if value is None else value
+
+
+def get_bool_setting(db, key: str, default: bool = False) -> bool:
+    value = get_setting(db, key)
+    return default if value is None else value.strip().lower() in _TRUE_VALUES
+
+
+def get_int_setting(db, key: str, default: int = 0) -> int:
+    value = get_setting(db, key)
+    try:
+        return default if value is None else int(value)
+    except ValueError:
+        return default
+
+
+def get_json_setting(db, key: str, default: Any = None) -> Any:
+    value = get_setting(db, key)
+    if value is None:
+        return default
+    try:
+        return json.loads(value)
+    except ValueError:
+        return default
+
+
+def get_all_settings(db) -> Dict[str, Optional[str]]:
+    """Retorna uma cópia de todas as configurações."""
+    return dict(_ensure_loaded(db))
+
+
+def set_setting(db, key: str, value: Any) -> None:
+    """Grava (ou remove, se value for None) uma configuração e invalida o cache."""
+    from models.event_setting import EventSetting
+
+    if key == SETTINGS_VERSION_KEY:
+        raise ValueError(f"Chave reservada: {SETTINGS_VERSION_KEY}")
+    encoded = _encode(value)
+    row = db.query(EventSetting).filter(EventSetting.key == key).first()
+    if encoded is not None:
+        if row:
+            row.value = encoded
+        else:
+            db.add(EventSetting(key=key, value=encoded))
+    elif row:
+        db.delete(row)
+    db.flush()
+    bump_settings_version(db)
+    db.commit()
+    invalidate_settings_cache()
@@ -0,0 +1,136 @@
+"""Estatísticas agregadas dos participantes (painel de inscrições).
+
+Todos os agrupamentos saem de uma única consulta (GROUP BY de cada dimensão
+unidos com UNION ALL), sem trazer as linhas para a aplicação. O resultado fica
+em memória até a próxima escrita de participantes (``invalidate_stats_cache``)
+ou até ``settings.STATS_CACHE_TTL`` segundos, o que limita o atraso quando
+outro processo (worker) grava.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import String, case, cast, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from config import settings
+from database.crud import _years_ago
+from models.participant import Participant, SACRAMENT_COLUMNS
+from services.metrics_service import record_cache
+
+# Faixas etárias (idade mínima, idade máxima, rótulo); None = sem limite
+AGE_BRACKETS: List[Tuple[Optional[int], Optional[int], str]] = [
+    (None, 14, "Até 14"),
+    (15, 17, "15 a 17"),
+    (18, 20, "18 a 20"),
+    (21, 25, "21 a 25"),
+    (26, None, "26 ou mais"),
+]
+UNKNOWN_LABEL = "Não informado"
+
+_lock = threading.Lock()
+_cached: Optional[Dict[str, Any]] = None
+_cached_at = 0.0
+
+
+def invalidate_stats_cache() -> None:
+    """Descarta as estatísticas em memória (chamar após gravar participantes)."""
+    global _cached
+    with _lock:
+        _cached = None
+
+
+def _flag(column):
+    return case((column.is_(True), "true"), else_="false")
+
+
+def _age_bracket(today: date):
+    """CASE que classifica birth_date nas faixas de AGE_BRACKETS (comparações de data, sem calcular idade por linha)."""
+    whens = []
+    for _, max_age, label in AGE_BRACKETS:
+        if max_age is None:
+            whens.append((Participant.birth_date.isnot(None), label))
+        else:
+            # idade <= max_age ⇔ nasceu depois de hoje - (max_age + 1) anos
+            whens.append((Participant.birth_date > _years_ago(today, max_age + 1), label))
+    return case((Participant.birth_date.is_(None), UNKNOWN_LABEL), *whens, else_=UNKNOWN_LABEL)
+
+
+def _dimension(name: str, key, group_by=None, grouped: bool = True):
+    query = select(
+        literal(name, String).label("dimension"), cast(key, String).label("key"), func.count().label("total")
+    ).select_from(Participant)
+    return query.group_by(group_by if group_by is not None else key) if grouped else query
+
+
+def _query(today: date):
+    neighborhood = func.lower(func.trim(Participant.neighborhood))
+    movement = func.lower(func.trim(Participant.church_movement))
+    parts = [
+        _dimension("total", literal("total", String), grouped=False),
+        _dimension("neighborhood", func.min(Participant.neighborhood), neighborhood),
+        _dimension("church_movement", func.min(Participant.church_movement), movement),
+        _dimension("ecc_participant", _flag(Participant.ecc_participant)),
+        _dimension("has_restrictions", _flag(Participant.has_restrictions)),
+        _dimension("age", _age_bracket(today)),
+    ]
+    for sacrament, column in SACRAMENT_COLUMNS.items():
+        parts.append(_dimension(sacrament, getattr(Participant, column)))
+    return union_all(*parts)
+
+
+def _ranked(counts: Dict[Optional[str], int]) -> List[Dict[str, Any]]:
+    items = [{"name": key or UNKNOWN_LABEL, "count": total} for key, total in counts.items()]
+    return sorted(items, key=lambda item: (-item["count"], item["name"].lower()))
+
+
+def compute_stats(db: Session) -> Dict[str, Any]:
+    """Calcula as estatísticas no banco (uma ida ao banco)."""
+    groups: Dict[str, Dict[Optional[str], int]] = {}
+    for dimension, key, total in db.execute(_query(date.today())):
+        counts = groups.setdefault(dimension, {})
+        counts[key or None] = counts.get(key or None, 0) + total
+
+    neighborhoods = groups.get("neighborhood", {})
+    movements = groups.get("church_movement", {})
+    ages = groups.get("age", {})
+    return {
+        "total": groups.get("total", {}).get("total", 0),
+        "ecc_participant": groups.get("ecc_participant", {}).get("true", 0),
+        "has_restrictions": groups.get("has_restrictions", {}).get("true", 0),
+        "with_church_movement": sum(total for key, total in movements.items() if key),
+        "by_neighborhood": _ranked(neighborhoods),
+        "by_church_movement": _ranked({k: v for k, v in movements.items() if k}),
+        "age_brackets": [
+            {"label": label, "count": ages.get(label, 0)}
+            for label in [label for _, _, label in AGE_BRACKETS] + [UNKNOWN_LABEL]
+        ],
+        "sacraments": {
+            sacrament: {
+                status: groups.get(sacrament, {}).get(None if status == "Não Informado" else status, 0)
+                for status in ("Concluído", "Em Processo", "Não Concluído", "Não Informado")
+            }
+            for sacrament in SACRAMENT_COLUMNS
+        },
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def get_stats(db: Session) -> Dict[str, Any]:
+    """Retorna as estatísticas do cache, recalculando se foram invalidadas ou expiraram."""
+    global _cached, _cached_at
+    ttl = settings.STATS_CACHE_TTL
+    cached = _cached
+    if cached is not None and (ttl <= 0 or time.monotonic() - _cached_at < ttl):
+        record_cache("stats", hit=True)
+        return cached
+    with _lock:
+        hit = not (_cached is None or (ttl > 0 and time.monotonic() - _cached_at >= ttl))
+        if not hit:
+            _cached = compute_stats(db)
+            _cached_at = time.monotonic()
+        record_cache("stats", hit=hit)
+        return _cached
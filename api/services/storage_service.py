@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import tempfile
+import time
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from config import settings
+from services import metrics_service
 
 # Buckets no Supabase Storage (privados; acesso via signed URL)
 BUCKET_PHOTOS = "photos"
@@ -18,6 +21,26 @@ SIGNED_URL_EXPIRES_IN = 3600
 # Chave na tabela event_settings para o path da logo no bucket
 LOGO_URL_KEY = "logo_url"
 
+_storage_calls = metrics_service.counter(
+    "storage_calls_total", "Chamadas ao Supabase Storage por operação e resultado", ("operation", "outcome")
+)
+_storage_seconds = metrics_service.histogram(
+    "storage_call_duration_seconds", "Duração das chamadas ao Supabase Storage", ("operation",)
+)
+
+
+@contextmanager
+def measure_storage_call(operation: str) -> Iterator[None]:
+    """Conta e cronometra uma chamada ao Storage (outcome=error se levantar exceção)."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        _storage_calls.inc(operation=operation, outcome=outcome)
+        _storage_seconds.observe(time.perf_counter() - started, operation=operation)
+
 
 def _get_client():
     """Retorna o cliente Supabase (lazy import)."""
@@ -48,7 +71,8 @@ def get_signed_url(bucket: str, path: str, expires_in: int = SIGNED_URL_EXPIRES_
         return None
     try:
         storage = client.storage.from_(bucket)
-        result = storage.create_signed_url(path, expires_in)
+        with measure_storage_call("create_signed_url"):
+            result = storage.create_signed_url(path, expires_in)
         if result is None:
             return None
         if isinstance(result, dict):
@@ -80,7 +104,7 @@ def _upload_bytes_to_storage(bucket: str, path: str, file_content: bytes, conten
             tmp_path = tmp.name
         try:
             storage = client.storage.from_(bucket)
-            with open(tmp_path, "rb") as f:
+            with open(tmp_path, "rb") as f, measure_storage_call("upload"):
                 storage.upload(path, f.read(), file_options={"content-type": content_type})
             return path
         finally:
@@ -115,11 +139,13 @@ def upload_logo(file_content: bytes, content_type: str, file_extension: str) ->
     try:
         storage = client.storage.from_(BUCKET_LOGO)
         try:
-            existing = storage.list()
+            with measure_storage_call("list"):
+                existing = storage.list()
             for item in (existing or []):
                 name = item.get("name") if isinstance(item, dict) else getattr(item, "name", None)
                 if name:
-                    storage.remove([name])
+                    with measure_storage_call("remove"):
+                        storage.remove([name])
         except Exception:
             pass
         return _upload_bytes_to_storage(BUCKET_LOGO, filename, file_content, content_type)
@@ -137,11 +163,13 @@ def delete_logo_storage() -> bool:
         return False
     try:
         storage = client.storage.from_(BUCKET_LOGO)
-        files = storage.list()
+        with measure_storage_call("list"):
+            files = storage.list()
         for item in (files or []):
             name = item.get("name")
             if name:
-                storage.remove([name])
+                with measure_storage_call("remove"):
+                    storage.remove([name])
         return True
     except Exception as e:
         print(f"⚠ Erro ao remover logo do Supabase: {e}")
@@ -149,22 +177,12 @@ def delete_logo_storage() -> bool:
 
 
 def get_logo_path_from_db(db) -> Optional[str]:
-    """Lê o path da logo no bucket (event_settings)."""
-    from models.event_setting import EventSetting
-    row = db.query(EventSetting).filter(EventSetting.key == LOGO_URL_KEY).first()
-    return row.value if row else None
+    """Lê o path da logo no bucket (event_settings, via cache de configurações)."""
+    from services.settings_service import get_setting
+    return get_setting(db, LOGO_URL_KEY)
 
 
 def set_logo_path_in_db(db, path: Optional[str]) -> None:
     """Grava ou remove o path da logo na tabela event_settings."""
-    from models.event_setting import EventSetting
-    row = db.query(EventSetting).filter(EventSetting.key == LOGO_URL_KEY).first()
-    if path:
-        if row:
-            row.value = path
-        else:
-            db.add(EventSetting(key=LOGO_URL_KEY, value=path))
-    else:
-        if row:
-            db.delete(row)
-    db.commit()
+    from services.settings_service import set_setting
+    set_setting(db, LOGO_URL_KEY, path or None)
@@ -1,5 +1,5 @@
 """Utilitários para manutenção do banco de dados"""
-import shutil
+import sqlite3
 from pathlib import Path
 from datetime import datetime
 from config import settings
@@ -27,18 +27,16 @@ def backup_database():
     backup_path = settings.BACKUPS_DIR / backup_filename
     
     try:
-        # Copiar arquivo do banco de dados
-        shutil.copy2(db_path, backup_path)
-        
-        # Copiar também o arquivo WAL se existir
-        wal_path = Path(str(db_path) + "-wal")
-        if wal_path.exists():
-            shutil.copy2(wal_path, Path(str(backup_path) + "-wal"))
-        
-        # Copiar arquivo SHM se existir
-        shm_path = Path(str(db_path) + "-shm")
-        if shm_path.exists():
-            shutil.copy2(shm_path, Path(str(backup_path) + "-shm"))
+        # Backup online do SQLite: cópia consistente (banco + WAL) mesmo com outros
+        # workers escrevendo, ao contrário de copiar os arquivos .db/-wal/-shm
+        source = sqlite3.connect(str(db_path), timeout=20)
+        target = sqlite3.connect(str(backup_path))
+        try:
+            with target:
+                source.backup(target)
+        finally:
+            target.close()
+            source.close()
         
         print(f"✓ Backup criado: {backup_path}")
         return str(backup_path)
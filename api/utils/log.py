@@ -0,0 +1,126 @@
+"""Configuração de logging da API (níveis, saída em texto ou JSON, por módulo).
+
+Os módulos usam ``logging.getLogger(__name__)``. ``setup_logging`` liga ao logger
+raiz um QueueHandler: quem registra a mensagem só a coloca numa fila, e a
+formatação/escrita no terminal acontece numa thread separada (QueueListener).
+Mensagens abaixo do nível configurado são descartadas antes disso, então
+``logger.debug`` em caminhos quentes não custa nada com o debug desligado.
+
+Configuração (config.Settings / .env):
+    LOG_LEVEL=INFO                                   nível padrão
+    LOG_FORMAT=json                                  "text" (padrão) ou "json"
+    LOG_LEVELS='{"database.crud": "DEBUG"}'          nível por módulo
+
+Dados pessoais não devem ir para o log (registrar ids e nomes de campos, não
+valores); como proteção extra, e-mails e números de telefone que escaparem são
+mascarados na saída.
+"""
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import settings
+
+# Atributos padrão de LogRecord (o resto veio de extra={...} e vai para o JSON)
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_RE = re.compile(r"(?:\+?55\s?)?(?:\(\d{2}\)|\b\d{2})\s?9?\d{4}[-\s]?\d{4}\b")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def redact(text: str) -> str:
+    """Mascara e-mails e telefones num texto de log."""
+    text = _EMAIL_RE.sub("<email>", text)
+    return _PHONE_RE.sub("<telefone>", text)
+
+
+class RedactingFilter(logging.Filter):
+    """Aplica ``redact`` à mensagem já montada (roda na thread do listener, fora da requisição)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = redact(record.getMessage())
+        record.msg, record.args = message, None
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Monta a mensagem na thread de quem registrou (os args podem mudar depois), mas deixa a
+    formatação para o listener e guarda a exceção em exc_text (o padrão a junta à mensagem).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por mensagem: ts, level, logger, msg, campos de ``extra`` e exceção."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = redact(record.exc_text)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _level(name: str) -> int:
+    level = logging.getLevelName(str(name).upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Nível de log inválido: {name}")
+    return level
+
+
+def setup_logging() -> None:
+    """Configura o logging da aplicação (chamadas repetidas não duplicam handlers)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT.lower() == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s", "%H:%M:%S"))
+    stream.addFilter(RedactingFilter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(_QueueHandler(log_queue))
+    root.setLevel(_level(settings.LOG_LEVEL))
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(_level(level))
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e para a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
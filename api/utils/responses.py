@@ -0,0 +1,58 @@
+"""Respostas JSON rápidas (orjson) para os endpoints de participantes"""
+import json
+from typing import Any, Dict, Iterable, List, Set
+
+from fastapi.responses import JSONResponse
+
+from models.participant import ParticipantResponse
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: cai para json da biblioteca padrão
+    orjson = None
+
+# Campos expostos na API (mesma ordem de ParticipantResponse)
+PARTICIPANT_FIELDS = tuple(ParticipantResponse.model_fields.keys())
+
+
+def dumps(content: Any) -> bytes:
+    """Serializa para JSON (bytes) com orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse serializada com orjson (sem passar por jsonable_encoder)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def participant_to_dict(participant) -> Dict[str, Any]:
+    """Converte um Participant (ORM) no dicionário de ParticipantResponse, sem revalidar."""
+    return {field: getattr(participant, field, None) for field in PARTICIPANT_FIELDS}
+
+
+def participants_to_list(participants: Iterable) -> List[Dict[str, Any]]:
+    return [participant_to_dict(p) for p in participants]
+
+
+def participant_etag(participant) -> str:
+    """ETag do participante: a versão da linha (row_version muda a cada alteração)."""
+    return f'"{participant.row_version}"'
+
+
+def etag_versions(header: str) -> Set[int]:
+    """Versões listadas em If-Match/If-None-Match (aceita W/ e várias separadas por vírgula).
+    ETags que não são versões de participante são ignoradas; ``*`` é tratado por quem chama.
+    """
+    versions: Set[int] = set()
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag.isdigit():
+            versions.add(int(tag))
+    return versions
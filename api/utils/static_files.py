@@ -0,0 +1,85 @@
+"""Arquivos estáticos do frontend (dist) com variantes pré-comprimidas e cache HTTP.
+
+- Serve ``arquivo.br`` / ``arquivo.gz`` (gerados por compress-dist.py) quando o cliente aceita.
+- Assets com hash no nome (``assets/index-AbC123xy.js``) recebem cache ``immutable`` de 1 ano.
+- Os demais (index.html etc.) são sempre revalidados (``no-cache`` + ETag).
+"""
+import mimetypes
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Vite: assets/[name]-[hash].[ext] (hash de 8+ caracteres base64url)
+FINGERPRINTED_ASSET_RE = re.compile(r"(^|/)assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Ordem de preferência das variantes pré-comprimidas
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Cache de existência das variantes (o dist não muda com o servidor rodando)
+_variant_cache: Dict[str, Optional[os.stat_result]] = {}
+
+
+def _accepted_encodings(scope: Scope) -> set:
+    accept = Headers(scope=scope).get("accept-encoding", "")
+    return {part.split(";")[0].strip().lower() for part in accept.split(",")}
+
+
+def _variant_stat(path: str) -> Optional[os.stat_result]:
+    if path not in _variant_cache:
+        try:
+            _variant_cache[path] = os.stat(path)
+        except OSError:
+            _variant_cache[path] = None
+    return _variant_cache[path]
+
+
+def _cache_control_for(full_path: str) -> str:
+    normalized = str(full_path).replace(os.sep, "/")
+    if FINGERPRINTED_ASSET_RE.search(normalized):
+        return IMMUTABLE_CACHE_CONTROL
+    return REVALIDATE_CACHE_CONTROL
+
+
+def _select_variant(full_path: str, scope: Scope) -> Tuple[str, Optional[os.stat_result], Optional[str], bool]:
+    """Retorna (path, stat, content-encoding, tem_variantes) para o arquivo pedido."""
+    accepted = _accepted_encodings(scope)
+    has_variants = False
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        variant_stat = _variant_stat(full_path + suffix)
+        if variant_stat is None:
+            continue
+        has_variants = True
+        if encoding in accepted:
+            return full_path + suffix, variant_stat, encoding, True
+    return full_path, None, None, has_variants
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles que prefere variantes .br/.gz e define cabeçalhos de cache."""
+
+    def file_response(self, full_path, stat_result: Optional[os.stat_result], scope: Scope,
+                      status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+        path, variant_stat, encoding, has_variants = _select_variant(full_path, scope)
+
+        headers = {"Cache-Control": _cache_control_for(full_path)}
+        if has_variants:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            stat_result = variant_stat
+
+        response = FileResponse(path, status_code=status_code, media_type=media_type,
+                                headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -67,7 +67,10 @@ $essentialDeps = @(
     "reportlab==4.2.5",
     "Pillow==11.0.0",
     "python-jose[cryptography]==3.3.0",
-    "python-dotenv==1.0.1"
+    "python-dotenv==1.0.1",
+    "orjson==3.10.12",
+    "Brotli==1.1.0",
+    "openpyxl==3.1.5"
 )
 foreach ($dep in $essentialDeps) {
     # Instalar ignorando avisos de conflitos (são apenas avisos, não erros fatais)
@@ -81,6 +84,11 @@ Write-Host ">> Dependencias opcionais (PostgreSQL/Supabase) puladas" -Foreground
 Write-Host "   O .exe usa SQLite por padrao e nao precisa dessas bibliotecas." -ForegroundColor Gray
 Write-Host "   Se precisar PostgreSQL/Supabase, instale manualmente depois." -ForegroundColor Gray
 
+# Variantes pré-comprimidas (.br/.gz) do frontend, servidas direto pela API
+Write-Host ">> Pre-comprimindo frontend (compress-dist.py)..." -ForegroundColor Yellow
+Install-PackageSafe -package "Brotli==1.1.0" | Out-Null
+& $py (Join-Path $Root "compress-dist.py") $distPath
+
 # 3) Rodar PyInstaller
 Write-Host ">> Gerando .exe com PyInstaller (pode demorar)..." -ForegroundColor Yellow
 Set-Location $Root
@@ -17,6 +17,16 @@ if ($LASTEXITCODE -ne 0) {
 }
 Write-Host "   OK." -ForegroundColor Green
 
+# 1b) Variantes pré-comprimidas (.br/.gz) do dist, servidas direto pela API
+Write-Host ">> Pre-comprimindo frontend (compress-dist.py)..." -ForegroundColor Yellow
+$pyCmd = Get-Command py -ErrorAction SilentlyContinue
+if (-not $pyCmd) { $pyCmd = Get-Command python -ErrorAction SilentlyContinue }
+if ($pyCmd) {
+    & $pyCmd.Source (Join-Path $Root "compress-dist.py") (Join-Path $Root "dist")
+} else {
+    Write-Host "   Python nao encontrado - dist sera servido sem pre-compressao." -ForegroundColor Gray
+}
+
 # 2) Limpar e criar pasta de release
 if (Test-Path $ReleaseDir) { Remove-Item $ReleaseDir -Recurse -Force }
 New-Item -ItemType Directory -Path $ReleaseDir | Out-Null
@@ -0,0 +1,62 @@
+"""
+Gera variantes pré-comprimidas (.br e .gz) dos arquivos do frontend buildado (dist/).
+A API serve essas variantes diretamente (sem comprimir a cada requisição).
+
+Uso (na raiz, depois de npm run build):
+    python compress-dist.py            # comprime dist/
+    python compress-dist.py caminho/dist
+Brotli é opcional: sem o pacote 'brotli' só os .gz são gerados.
+"""
+import gzip
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tipos de texto que compensam comprimir (imagens e fontes woff2 já são comprimidas)
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".map", ".xml", ".ico", ".webmanifest"}
+MIN_SIZE_BYTES = 1024
+
+
+def _write_if_smaller(target: Path, original_size: int, data: bytes) -> bool:
+    if len(data) >= original_size:
+        target.unlink(missing_ok=True)
+        return False
+    target.write_bytes(data)
+    return True
+
+
+def compress_dist(dist_dir: Path) -> int:
+    """Cria arquivo.gz e arquivo.br ao lado de cada arquivo compressível. Retorna quantos foram gerados."""
+    generated = 0
+    for path in sorted(dist_dir.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+            continue
+        content = path.read_bytes()
+        if len(content) < MIN_SIZE_BYTES:
+            continue
+        # mtime=0 deixa o .gz reprodutível entre builds
+        gz = gzip.compress(content, compresslevel=9, mtime=0)
+        generated += _write_if_smaller(path.with_name(path.name + ".gz"), len(content), gz)
+        if brotli is not None:
+            br = brotli.compress(content, quality=11)
+            generated += _write_if_smaller(path.with_name(path.name + ".br"), len(content), br)
+    return generated
+
+
+def main():
+    dist_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).resolve().parent / "dist"
+    if not dist_dir.is_dir():
+        print(f"✗ Pasta dist não encontrada: {dist_dir}")
+        sys.exit(1)
+    count = compress_dist(dist_dir)
+    if brotli is None:
+        print("⚠ Pacote 'brotli' não instalado - gerando apenas .gz")
+    print(f"✓ {count} arquivo(s) pré-comprimido(s) em {dist_dir}")
+
+
+if __name__ == "__main__":
+    main()
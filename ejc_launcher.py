@@ -2,6 +2,7 @@
 Ponto de entrada para o .exe (PyInstaller).
 Configura paths e diretório de trabalho, depois inicia a API e abre o navegador.
 """
+import multiprocessing
 import os
 import sys
 import time
@@ -167,7 +168,6 @@ def main():
         loading.start()
         time.sleep(0.5)
         
-        import uvicorn
         # Importar main faz o PyInstaller incluir a API e dependências
         # O path é configurado dinamicamente em _setup_paths()
         # O módulo main está em api/main.py e é adicionado ao path em _setup_paths()
@@ -197,7 +197,9 @@ def main():
         print(" " * 15 + "Pressione Ctrl+C para encerrar")
         print("=" * 60 + "\n")
         
-        uvicorn.run("main:app", host="0.0.0.0", port=8000)
+        # Um ou vários workers conforme WORKERS (api/server.py)
+        from server import serve  # type: ignore
+        serve(host="0.0.0.0", port=8000)
     except KeyboardInterrupt:
         print("\nServidor encerrado pelo usuário.")
     except Exception as e:
@@ -222,4 +224,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Workers do servidor são processos novos do próprio .exe: precisa vir antes de tudo
+    multiprocessing.freeze_support()
     main()
@@ -98,12 +98,12 @@ $url = "http://localhost:8000"
 Start-Process powershell -ArgumentList "-NoProfile -WindowStyle Hidden -Command", "Start-Sleep 2; Start-Process '$url'" -WindowStyle Hidden
 Write-Ok "Navegador sera aberto em: $url"
 
-# 7) Rodar API (servindo API + frontend estático); sem reload para estabilidade
+# 7) Rodar API (servindo API + frontend estático); sem reload, com WORKERS processos (api/server.py)
 Write-Step "Iniciando servidor (Ctrl+C para encerrar)..."
 $env:DEBUG = "0"
 Set-Location $apiPath
 try {
-    & (Join-Path $Root ".venv\Scripts\python.exe") -m uvicorn main:app --host 0.0.0.0 --port 8000
+    & (Join-Path $Root ".venv\Scripts\python.exe") run.py
 } finally {
     Set-Location $Root
 }
@@ -1,4 +1,175 @@
-export default function FiltersPanel() {
-  // Implementação futura de filtros avançados
-  return null
+import type { ParticipantFilters, SacramentStatus } from '@/types/participant'
+
+interface FiltersPanelProps {
+  value: ParticipantFilters
+  onChange: (value: ParticipantFilters) => void
+}
+
+const sacraments: SacramentStatus['sacrament'][] = ['Batismo', 'Primeira Eucaristia', 'Crisma']
+const statuses: SacramentStatus['status'][] = ['Concluído', 'Não Concluído', 'Em Processo', 'Não Informado']
+
+const inputClass =
+  'w-full px-3 py-2 bg-gray-800 border border-gray-700 rounded-lg text-white placeholder-gray-400 focus:outline-none focus:ring-2 focus:ring-primary-500'
+
+/** Converte o valor de um select Todos/Sim/Não em boolean opcional. */
+const toBool = (v: string): boolean | undefined => (v === '' ? undefined : v === 'true')
+const fromBool = (v: boolean | undefined): string => (v === undefined ? '' : String(v))
+const toNumber = (v: string): number | undefined => (v === '' ? undefined : Number(v))
+
+export default function FiltersPanel({ value, onChange }: FiltersPanelProps) {
+  const update = (patch: Partial<ParticipantFilters>) => onChange({ ...value, ...patch })
+  const hasFilters = Object.values(value).some((v) => v !== undefined && !(Array.isArray(v) && v.length === 0))
+
+  return (
+    <details className="bg-gray-800 rounded-xl border border-gray-700 p-4">
+      <summary className="cursor-pointer text-gray-300 font-medium">Filtros avançados</summary>
+      <div className="grid md:grid-cols-2 lg:grid-cols-4 gap-4 mt-4">
+        <label className="block text-sm text-gray-300">
+          Bairro/Comunidade
+          <input
+            type="text"
+            className={inputClass}
+            placeholder="Ex: Centro, Vila Nova"
+            value={(value.neighborhood ?? []).join(', ')}
+            onChange={(e) =>
+              update({
+                neighborhood: e.target.value
+                  .split(',')
+                  .map((n) => n.trim())
+                  .filter(Boolean),
+              })
+            }
+          />
+        </label>
+        <label className="block text-sm text-gray-300">
+          Idade mínima
+          <input
+            type="number"
+            min={0}
+            max={120}
+            className={inputClass}
+            value={value.min_age ?? ''}
+            onChange={(e) => update({ min_age: toNumber(e.target.value) })}
+          />
+        </label>
+        <label className="block text-sm text-gray-300">
+          Idade máxima
+          <input
+            type="number"
+            min={0}
+            max={120}
+            className={inputClass}
+            value={value.max_age ?? ''}
+            onChange={(e) => update({ max_age: toNumber(e.target.value) })}
+          />
+        </label>
+        <label className="block text-sm text-gray-300">
+          Idade na data
+          <input
+            type="date"
+            className={inputClass}
+            value={value.age_on ?? ''}
+            onChange={(e) => update({ age_on: e.target.value || undefined })}
+          />
+        </label>
+        <label className="block text-sm text-gray-300">
+          Aniversário de
+          <input
+            type="date"
+            className={inputClass}
+            value={value.birthday_from ?? ''}
+            onChange={(e) => update({ birthday_from: e.target.value || undefined })}
+          />
+        </label>
+        <label className="block text-sm text-gray-300">
+          Aniversário até
+          <input
+            type="date"
+            className={inputClass}
+            value={value.birthday_to ?? ''}
+            onChange={(e) => update({ birthday_to: e.target.value || undefined })}
+          />
+        </label>
+        <label className="block text-sm text-gray-300">
+          Movimento da igreja
+          <input
+            type="text"
+            className={inputClass}
+            value={value.church_movement ?? ''}
+            onChange={(e) => update({ church_movement: e.target.value || undefined })}
+          />
+        </label>
+        <label className="block text-sm text-gray-300">
+          Pais no ECC
+          <select
+            className={inputClass}
+            value={fromBool(value.ecc_participant)}
+            onChange={(e) => update({ ecc_participant: toBool(e.target.value) })}
+          >
+            <option value="">Todos</option>
+            <option value="true">Sim</option>
+            <option value="false">Não</option>
+          </select>
+        </label>
+        <label className="block text-sm text-gray-300">
+          Restrições/alergias
+          <select
+            className={inputClass}
+            value={fromBool(value.has_restrictions)}
+            onChange={(e) => update({ has_restrictions: toBool(e.target.value) })}
+          >
+            <option value="">Todos</option>
+            <option value="true">Sim</option>
+            <option value="false">Não</option>
+          </select>
+        </label>
+        <label className="block text-sm text-gray-300">
+          Sacramento
+          <select
+            className={inputClass}
+            value={value.sacrament ?? ''}
+            onChange={(e) =>
+              update({ sacrament: (e.target.value || undefined) as ParticipantFilters['sacrament'] })
+            }
+          >
+            <option value="">Todos</option>
+            {sacraments.map((s) => (
+              <option key={s} value={s}>
+                {s}
+              </option>
+            ))}
+          </select>
+        </label>
+        <label className="block text-sm text-gray-300">
+          Situação do sacramento
+          <select
+            className={inputClass}
+            value={value.sacrament_status ?? ''}
+            disabled={!value.sacrament}
+            onChange={(e) =>
+              update({
+                sacrament_status: (e.target.value || undefined) as ParticipantFilters['sacrament_status'],
+              })
+            }
+          >
+            <option value="">Concluído (padrão)</option>
+            {statuses.map((s) => (
+              <option key={s} value={s}>
+                {s}
+              </option>
+            ))}
+          </select>
+        </label>
+      </div>
+      {hasFilters && (
+        <button
+          type="button"
+          onClick={() => onChange({})}
+          className="mt-4 px-4 py-2 bg-gray-700 text-white rounded-lg hover:bg-gray-600"
+        >
+          Limpar filtros
+        </button>
+      )}
+    </details>
+  )
 }
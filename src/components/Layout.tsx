@@ -1,5 +1,6 @@
 import { Link, useLocation } from 'react-router-dom'
 import { ReactNode } from 'react'
+import { useParticipantEvents } from '@/lib/events'
 
 interface LayoutProps {
   children: ReactNode
@@ -7,6 +8,7 @@ interface LayoutProps {
 
 export default function Layout({ children }: LayoutProps) {
   const location = useLocation()
+  useParticipantEvents()
 
   const navItems = [
     { path: '/', label: 'Início' },
@@ -67,7 +67,7 @@ export default function ParticipantEditForm({ participant }: ParticipantEditForm
   }, [participant, reset])
 
   const mutation = useMutation({
-    mutationFn: (data: ParticipantFormData) => participantsApi.update(participant.id, data),
+    mutationFn: (data: ParticipantFormData) => participantsApi.update(participant.id, data, participant.row_version),
     onSuccess: () => {
       toast.success('Participante atualizado com sucesso!')
       queryClient.invalidateQueries({ queryKey: ['participants'] })
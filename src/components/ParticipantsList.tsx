@@ -5,19 +5,22 @@ import { participantsApi } from '@/lib/api'
 import ParticipantCard from './ParticipantCard'
 import SearchBar from './SearchBar'
 import FiltersPanel from './FiltersPanel'
+import type { ParticipantFilters } from '@/types/participant'
 
 export default function ParticipantsList() {
   const [search, setSearch] = useState('')
+  const [filters, setFilters] = useState<ParticipantFilters>({})
   const [page, setPage] = useState(1)
   const itemsPerPage = 10
 
   const { data, isLoading } = useQuery({
-    queryKey: ['participants', search, page],
+    queryKey: ['participants', search, filters, page],
     queryFn: () =>
       participantsApi.getAll({
         skip: (page - 1) * itemsPerPage,
         limit: itemsPerPage,
         search: search || undefined,
+        ...filters,
       }),
   })
 
@@ -51,7 +54,13 @@ export default function ParticipantsList() {
   return (
     <div className="space-y-6">
       <SearchBar value={search} onChange={setSearch} />
-      <FiltersPanel />
+      <FiltersPanel
+        value={filters}
+        onChange={(value) => {
+          setFilters(value)
+          setPage(1)
+        }}
+      />
 
       {total > 0 && (
         <p className="text-gray-400 text-sm">
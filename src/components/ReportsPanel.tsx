@@ -6,6 +6,8 @@ import { downloadBlob } from '@/lib/utils'
 
 export default function ReportsPanel() {
   const [selectedParticipantId, setSelectedParticipantId] = useState<number | null>(null)
+  const [rosterTitle, setRosterTitle] = useState('')
+  const [rosterNeighborhood, setRosterNeighborhood] = useState('')
 
   const { data: listData } = useQuery({
     queryKey: ['participants', 'reports'],
@@ -49,6 +51,40 @@ export default function ReportsPanel() {
     }
   }
 
+  const handleGenerateBadges = async () => {
+    try {
+      const blob = await pdfApi.generateBadges()
+      downloadBlob(blob, 'crachas.pdf')
+      toast.success('Crachás gerados com sucesso!')
+    } catch (error) {
+      toast.error('Erro ao gerar crachás')
+    }
+  }
+
+  const handleGenerateRoster = async () => {
+    try {
+      const neighborhood = rosterNeighborhood
+        .split(',')
+        .map((n) => n.trim())
+        .filter(Boolean)
+      const blob = await pdfApi.generateRoster(rosterTitle, { neighborhood })
+      downloadBlob(blob, 'lista_fotos.pdf')
+      toast.success('Lista de fotos gerada com sucesso!')
+    } catch (error) {
+      toast.error('Erro ao gerar lista de fotos')
+    }
+  }
+
+  const handleGenerateRestrictions = async (format: 'pdf' | 'csv') => {
+    try {
+      const blob = await pdfApi.generateRestrictions(format)
+      downloadBlob(blob, `restricoes.${format}`)
+      toast.success('Relatório de restrições gerado com sucesso!')
+    } catch (error) {
+      toast.error('Erro ao gerar relatório de restrições')
+    }
+  }
+
   return (
     <div className="bg-gray-800 rounded-xl p-6 border border-gray-700 space-y-6">
       <div>
@@ -86,6 +122,63 @@ export default function ReportsPanel() {
           Gerar PDF Completo ({participants.length} participantes)
         </button>
       </div>
+
+      <div className="border-t border-gray-700 pt-6">
+        <h3 className="text-xl font-semibold text-white mb-4">Crachás</h3>
+        <button
+          onClick={handleGenerateBadges}
+          disabled={participants.length === 0}
+          className="w-full px-4 py-2 bg-primary-600 text-white rounded-lg hover:bg-primary-700 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
+        >
+          Gerar Crachás (10 por página)
+        </button>
+      </div>
+
+      <div className="border-t border-gray-700 pt-6">
+        <h3 className="text-xl font-semibold text-white mb-4">Lista de Fotos</h3>
+        <div className="space-y-4">
+          <input
+            type="text"
+            value={rosterTitle}
+            onChange={(e) => setRosterTitle(e.target.value)}
+            placeholder="Título (ex: Equipe Azul)"
+            maxLength={100}
+            className="w-full px-4 py-2 bg-gray-700 border border-gray-600 rounded-lg text-white placeholder-gray-400 focus:outline-none focus:ring-2 focus:ring-primary-500"
+          />
+          <input
+            type="text"
+            value={rosterNeighborhood}
+            onChange={(e) => setRosterNeighborhood(e.target.value)}
+            placeholder="Bairros (opcional, separados por vírgula)"
+            className="w-full px-4 py-2 bg-gray-700 border border-gray-600 rounded-lg text-white placeholder-gray-400 focus:outline-none focus:ring-2 focus:ring-primary-500"
+          />
+          <button
+            onClick={handleGenerateRoster}
+            disabled={participants.length === 0}
+            className="w-full px-4 py-2 bg-primary-600 text-white rounded-lg hover:bg-primary-700 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
+          >
+            Gerar Lista de Fotos
+          </button>
+        </div>
+      </div>
+
+      <div className="border-t border-gray-700 pt-6">
+        <h3 className="text-xl font-semibold text-white mb-4">Restrições Alimentares (Cozinha)</h3>
+        <div className="grid grid-cols-2 gap-4">
+          <button
+            onClick={() => handleGenerateRestrictions('pdf')}
+            className="px-4 py-2 bg-primary-600 text-white rounded-lg hover:bg-primary-700 transition-colors"
+          >
+            Baixar PDF
+          </button>
+          <button
+            onClick={() => handleGenerateRestrictions('csv')}
+            className="px-4 py-2 bg-gray-700 text-white rounded-lg hover:bg-gray-600 transition-colors"
+          >
+            Baixar CSV
+          </button>
+        </div>
+      </div>
     </div>
   )
 }
@@ -0,0 +1,79 @@
+import { useQuery } from '@tanstack/react-query'
+import { statsApi } from '@/lib/api'
+
+// Atualizado pelos eventos de /api/events (useParticipantEvents); o intervalo só cobre
+// escritas feitas em outro processo do servidor
+const REFRESH_INTERVAL_MS = 120000
+
+function Bar({ label, count, total }: { label: string; count: number; total: number }) {
+  const percent = total > 0 ? Math.round((count / total) * 100) : 0
+  return (
+    <div>
+      <div className="flex justify-between text-sm text-gray-300">
+        <span className="truncate">{label}</span>
+        <span>
+          {count} ({percent}%)
+        </span>
+      </div>
+      <div className="h-2 bg-gray-700 rounded">
+        <div className="h-2 bg-primary-500 rounded" style={{ width: `${percent}%` }} />
+      </div>
+    </div>
+  )
+}
+
+export default function StatsPanel() {
+  const { data: stats, isLoading } = useQuery({
+    queryKey: ['stats'],
+    queryFn: statsApi.get,
+    refetchInterval: REFRESH_INTERVAL_MS,
+  })
+
+  if (isLoading || !stats) {
+    return <div className="text-gray-400">Carregando estatísticas...</div>
+  }
+
+  const cards = [
+    { label: 'Inscritos', value: stats.total },
+    { label: 'Pais no ECC', value: stats.ecc_participant },
+    { label: 'Com restrições', value: stats.has_restrictions },
+    { label: 'Em movimentos', value: stats.with_church_movement },
+  ]
+
+  return (
+    <div className="bg-gray-800 rounded-xl p-6 border border-gray-700 space-y-6">
+      <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
+        {cards.map((card) => (
+          <div key={card.label} className="bg-gray-700 rounded-lg p-4 text-center">
+            <div className="text-3xl font-bold text-white">{card.value}</div>
+            <div className="text-sm text-gray-400">{card.label}</div>
+          </div>
+        ))}
+      </div>
+
+      <div className="grid md:grid-cols-2 gap-6">
+        <div className="space-y-3">
+          <h3 className="text-lg font-semibold text-white">Faixa etária</h3>
+          {stats.age_brackets.map((item) => (
+            <Bar key={item.label} label={item.label} count={item.count} total={stats.total} />
+          ))}
+        </div>
+        <div className="space-y-3">
+          <h3 className="text-lg font-semibold text-white">Bairros</h3>
+          {stats.by_neighborhood.slice(0, 8).map((item) => (
+            <Bar key={item.name} label={item.name} count={item.count} total={stats.total} />
+          ))}
+        </div>
+      </div>
+
+      <div>
+        <h3 className="text-lg font-semibold text-white mb-3">Sacramentos concluídos</h3>
+        <div className="grid md:grid-cols-3 gap-4">
+          {Object.entries(stats.sacraments).map(([sacrament, statuses]) => (
+            <Bar key={sacrament} label={sacrament} count={statuses['Concluído'] ?? 0} total={stats.total} />
+          ))}
+        </div>
+      </div>
+    </div>
+  )
+}
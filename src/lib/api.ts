@@ -1,5 +1,5 @@
 import axios from 'axios'
-import type { Participant, ParticipantCreate, ParticipantUpdate } from '@/types/participant'
+import type { Participant, ParticipantCreate, ParticipantFilters, ParticipantUpdate } from '@/types/participant'
 
 /** Base URL da API: use VITE_API_BASE_URL para Supabase Edge Functions ou outro host; senão /api (proxy local/Vercel). */
 const getApiBaseUrl = () => (import.meta.env.VITE_API_BASE_URL as string) ?? '/api'
@@ -16,9 +16,66 @@ export interface ParticipantsListResponse {
   total: number
 }
 
+export interface ParticipantChangesResponse {
+  version: number
+  participants: Participant[]
+  deleted: number[]
+  has_more: boolean
+  reset: boolean
+}
+
+export interface StatsItem {
+  name: string
+  count: number
+}
+
+export interface ParticipantsStats {
+  total: number
+  ecc_participant: number
+  has_restrictions: number
+  with_church_movement: number
+  by_neighborhood: StatsItem[]
+  by_church_movement: StatsItem[]
+  age_brackets: { label: string; count: number }[]
+  sacraments: Record<string, Record<string, number>>
+  generated_at: string
+}
+
+export interface ParticipantChangeEvent {
+  type: 'hello' | 'created' | 'updated' | 'deleted' | 'reset'
+  ids?: number[]
+  version?: number
+}
+
+export const eventsApi = {
+  /** URL do canal Server-Sent Events (/api/events) com as alterações de participantes */
+  getUrl: (): string => `${getApiBaseUrl()}/events`,
+}
+
+export const statsApi = {
+  get: async (): Promise<ParticipantsStats> => {
+    const response = await api.get<ParticipantsStats>('/stats')
+    return response.data
+  },
+}
+
 export const participantsApi = {
-  getAll: async (params?: { skip?: number; limit?: number; search?: string }): Promise<ParticipantsListResponse> => {
-    const response = await api.get<ParticipantsListResponse>('/participants', { params })
+  getAll: async (
+    params?: { skip?: number; limit?: number; search?: string } & ParticipantFilters
+  ): Promise<ParticipantsListResponse> => {
+    // indexes: null → listas como neighborhood=a&neighborhood=b (formato esperado pelo FastAPI)
+    const response = await api.get<ParticipantsListResponse>('/participants', {
+      params,
+      paramsSerializer: { indexes: null },
+    })
+    return response.data
+  },
+
+  /** Alterações desde a versão `since` (sincronização incremental dos clientes de check-in). */
+  getChanges: async (since: number, limit?: number): Promise<ParticipantChangesResponse> => {
+    const response = await api.get<ParticipantChangesResponse>('/participants/changes', {
+      params: { since, limit },
+    })
     return response.data
   },
 
@@ -32,14 +89,38 @@ export const participantsApi = {
     return response.data
   },
 
-  update: async (id: number, data: ParticipantUpdate) => {
-    const response = await api.put<Participant>(`/participants/${id}`, data)
+  /** Com rowVersion envia If-Match: a API responde 412 se outra pessoa alterou o participante antes */
+  update: async (id: number, data: ParticipantUpdate, rowVersion?: number) => {
+    const headers = rowVersion !== undefined ? { 'If-Match': `"${rowVersion}"` } : undefined
+    const response = await api.put<Participant>(`/participants/${id}`, data, { headers })
     return response.data
   },
 
   delete: async (id: number) => {
     await api.delete(`/participants/${id}`)
   },
+
+  bulkUpdate: async (ids: number[], changes: ParticipantUpdate): Promise<{ updated: number; requested: number }> => {
+    const response = await api.patch<{ updated: number; requested: number }>('/participants/bulk', { ids, changes })
+    return response.data
+  },
+
+  bulkDelete: async (ids: number[]): Promise<{ deleted: number; requested: number }> => {
+    const response = await api.post<{ deleted: number; requested: number }>('/participants/bulk-delete', { ids })
+    return response.data
+  },
+
+  /** URL de exportação em streaming (CSV/XLSX/NDJSON) com o mesmo filtro de busca da listagem. */
+  getExportUrl: (format: 'csv' | 'xlsx' | 'ndjson', search?: string, filters?: ParticipantFilters): string => {
+    const params = new URLSearchParams({ format })
+    if (search) params.set('search', search)
+    Object.entries(filters ?? {}).forEach(([key, value]) => {
+      if (value === undefined) return
+      const values = Array.isArray(value) ? value : [value]
+      values.forEach((v) => params.append(key, String(v)))
+    })
+    return `${getApiBaseUrl()}/participants/export?${params.toString()}`
+  },
 }
 
 export const pdfApi = {
@@ -56,6 +137,33 @@ export const pdfApi = {
     })
     return response.data
   },
+
+  /** Crachás (várias por página A4) com nome usual, foto e logo. */
+  generateBadges: async () => {
+    const response = await api.get('/pdf/badges', {
+      responseType: 'blob',
+    })
+    return response.data
+  },
+
+  /** Lista de fotos (grade com foto e nome) para os líderes de equipe. */
+  generateRoster: async (title?: string, filters?: ParticipantFilters) => {
+    const response = await api.get('/pdf/roster', {
+      params: { title: title || undefined, ...filters },
+      paramsSerializer: { indexes: null },
+      responseType: 'blob',
+    })
+    return response.data
+  },
+
+  /** Relatório da cozinha (restrições/alergias) em tabela: PDF ou CSV. */
+  generateRestrictions: async (format: 'pdf' | 'csv' = 'pdf') => {
+    const response = await api.get('/reports/restrictions', {
+      params: { format },
+      responseType: 'blob',
+    })
+    return response.data
+  },
 }
 
 export const photosApi = {
@@ -0,0 +1,46 @@
+import { useEffect } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
+import { eventsApi, type ParticipantChangeEvent } from './api'
+
+const CHANGE_EVENTS = ['created', 'updated', 'deleted', 'reset'] as const
+
+/**
+ * Escuta /api/events e invalida as consultas de participantes e estatísticas a cada alteração,
+ * em vez de cada tela fazer polling. O EventSource reconecta sozinho; ao reconectar, se a
+ * versão mudou enquanto estava desconectado, tudo é recarregado.
+ */
+export function useParticipantEvents() {
+  const queryClient = useQueryClient()
+
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return
+    const source = new EventSource(eventsApi.getUrl())
+    let lastVersion: number | undefined
+
+    const refreshAll = () => {
+      queryClient.invalidateQueries({ queryKey: ['participants'] })
+      queryClient.invalidateQueries({ queryKey: ['stats'] })
+    }
+
+    source.addEventListener('hello', (message) => {
+      const event: ParticipantChangeEvent = JSON.parse((message as MessageEvent).data)
+      if (lastVersion !== undefined && event.version !== lastVersion) refreshAll()
+      lastVersion = event.version
+    })
+
+    const onChange = (message: Event) => {
+      const event: ParticipantChangeEvent = JSON.parse((message as MessageEvent).data)
+      if (event.version !== undefined) lastVersion = event.version
+      refreshAll()
+      if (event.type === 'reset') {
+        // Alteração feita em outro worker do servidor (sem ids): recarrega as fichas abertas também
+        queryClient.invalidateQueries({ queryKey: ['participant'] })
+      } else if (event.type === 'updated' || event.type === 'deleted') {
+        event.ids?.forEach((id) => queryClient.invalidateQueries({ queryKey: ['participant', id] }))
+      }
+    }
+    CHANGE_EVENTS.forEach((type) => source.addEventListener(type, onChange))
+
+    return () => source.close()
+  }, [queryClient])
+}
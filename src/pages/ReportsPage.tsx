@@ -1,10 +1,17 @@
 import ReportsPanel from '@/components/ReportsPanel'
+import StatsPanel from '@/components/StatsPanel'
 
 export default function ReportsPage() {
   return (
-    <div className="max-w-4xl mx-auto">
-      <h2 className="text-3xl font-bold text-white mb-8">Geração de Relatórios</h2>
-      <ReportsPanel />
+    <div className="max-w-4xl mx-auto space-y-8">
+      <div>
+        <h2 className="text-3xl font-bold text-white mb-8">Painel de Inscrições</h2>
+        <StatsPanel />
+      </div>
+      <div>
+        <h2 className="text-3xl font-bold text-white mb-8">Geração de Relatórios</h2>
+        <ReportsPanel />
+      </div>
     </div>
   )
 }
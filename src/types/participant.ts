@@ -21,6 +21,8 @@ export interface Participant {
   restrictions_info?: string | null
   observations?: string | null
   photo_path?: string | null
+  updated_at?: string | null
+  row_version?: number | null
 }
 
 export interface ParticipantCreate {
@@ -53,3 +55,18 @@ export interface SacramentStatus {
   sacrament: 'Batismo' | 'Primeira Eucaristia' | 'Crisma'
   status: 'Concluído' | 'Não Concluído' | 'Em Processo' | 'Não Informado'
 }
+
+export interface ParticipantFilters {
+  neighborhood?: string[]
+  min_age?: number
+  max_age?: number
+  age_on?: string
+  birthday_from?: string
+  birthday_to?: string
+  ecc_participant?: boolean
+  has_restrictions?: boolean
+  church_movement?: string
+  has_church_movement?: boolean
+  sacrament?: SacramentStatus['sacrament']
+  sacrament_status?: SacramentStatus['status']
+}